@@ -0,0 +1,216 @@
+# Classes of Unicode characters used for recognizing romanizations and
+# superscripts.
+#
+# Deciding these from unicodedata.name() requires building the name of each
+# character and matching regular expressions against it.  Instead, the class
+# of every codepoint is precomputed into data/unicode/char_classes.json by
+# tools/generate_char_classes.py, and looking up a character is just an
+# index into a table.  Regenerate the file after changing the lists below.
+
+import functools
+import json
+import re
+import unicodedata
+from importlib.resources import files
+from typing import Dict, List, Union
+
+# Script classes, in the low bits of the class of a character
+OTHER = 0
+LATIN = 1  # Name starts with LATIN
+GREEK = 2  # Name starts with GREEK
+COMBINING = 3  # Combining diacritic
+NON_LATIN = 4  # Not acceptable in romanizations, or has no name
+ROMANIZATION_OK = 5  # Punctuation acceptable in romanizations
+SCRIPT_MASK = 7
+# Set in the class of superscript characters
+SUPERSCRIPT = 8
+
+# First words of unicodedata.name() that indicate scripts that cannot be
+# accepted in romanizations or english (i.e., should be considered "other"
+# in classify_desc()).
+non_latin_scripts = [
+    "ADLAM",
+    "ARABIC",
+    "ARABIC-INDIC",
+    "ARMENIAN",
+    "BALINESE",
+    "BENGALI",
+    "BRAHMI",
+    "BRAILLE",
+    "CANADIAN",
+    "CHAKMA",
+    "CHAM",
+    "CHEROKEE",
+    "CJK",
+    "COPTIC",
+    "COUNTING ROD",
+    "CUNEIFORM",
+    "CYRILLIC",
+    "DOUBLE-STRUCK",
+    "EGYPTIAN",
+    "ETHIOPIC",
+    "EXTENDED ARABIC-INDIC",
+    "GEORGIAN",
+    "GLAGOLITIC",
+    "GOTHIC",
+    "GREEK",
+    "GUJARATI",
+    "GURMUKHI",
+    "HANGUL",
+    "HANIFI ROHINGYA",
+    "HEBREW",
+    "HIRAGANA",
+    "JAVANESE",
+    "KANNADA",
+    "KATAKANA",
+    "KAYAH LI",
+    "KHMER",
+    "KHUDAWADI",
+    "LAO",
+    "LEPCHA",
+    "LIMBU",
+    "MALAYALAM",
+    "MEETEI",
+    "MYANMAR",
+    "NEW TAI LUE",
+    "NKO",
+    "OL CHIKI",
+    "OLD PERSIAN",
+    "OLD SOUTH ARABIAN",
+    "ORIYA",
+    "OSMANYA",
+    "PHOENICIAN",
+    "SAURASHTRA",
+    "SHARADA",
+    "SINHALA",
+    "SUNDANESE",
+    "SYLOTI",
+    "TAI THAM",
+    "TAKRI",
+    "TAMIL",
+    "TELUGU",
+    "THAANA",
+    "THAI",
+    "TIBETAN",
+    "TIFINAGH",
+    "TIRHUTA",
+    "UGARITIC",
+    "WARANG CITI",
+    "YI",
+]
+non_latin_scripts_re = re.compile(
+    r"(" +
+    r"|".join(re.escape(x) for x in non_latin_scripts) +
+    r")\b")
+
+# Punctuation and other characters that are accepted in romanizations
+# regardless of their Unicode category
+romanization_ok_chars = frozenset([
+    "-",
+    ",",
+    "'",  # ' in Arabic, / in IPA-like parenthesized forms
+    ".",  # e.g., "..." in translations
+    ";",
+    ":",
+    "!",
+    "‘",
+    "’",
+    '"',
+    '“',
+    '”',
+    "/",
+    "?",
+    "…",  # alternative to "..."
+    "⁉",  # 見る/Japanese automatic transcriptions...
+    "？",
+    "！",
+    "⁻",  # superscript -, used in some Cantonese roman, e.g. "we"
+    "ʔ",
+    "ʼ",
+    "ʾ",
+    "ʹ",  # ʹ e.g. in understand/English/verb Russian transl
+])
+
+# Names of superscript characters start with these
+superscript_re = re.compile(r"SUPERSCRIPT |"
+                            r"MODIFIER LETTER SMALL |"
+                            r"MODIFIER LETTER CAPITAL ")
+
+NUM_CODEPOINTS = 0x110000
+
+
+def compute_char_class(ch: str) -> int:
+    """Computes the class of a character from its Unicode name."""
+    try:
+        name = unicodedata.name(ch)
+    except ValueError:
+        return NON_LATIN
+    first = name.split()[0]
+    if ch in romanization_ok_chars:
+        cls = ROMANIZATION_OK
+    elif first == "LATIN":
+        cls = LATIN
+    elif first == "GREEK":
+        cls = GREEK
+    elif first == "COMBINING":
+        cls = COMBINING
+    elif re.match(non_latin_scripts_re, name):
+        cls = NON_LATIN
+    else:
+        cls = OTHER
+    if re.match(superscript_re, name):
+        cls |= SUPERSCRIPT
+    return cls
+
+
+def compute_char_classes() -> Dict[str, Union[str, List[List[int]]]]:
+    """Computes the classes of all codepoints.  Returns the data saved in
+    data/unicode/char_classes.json: the Unicode version and runs of
+    codepoints with the same class as [first codepoint, class] pairs."""
+    runs = []
+    prev = None
+    for cp in range(NUM_CODEPOINTS):
+        cls = compute_char_class(chr(cp))
+        if cls != prev:
+            runs.append([cp, cls])
+            prev = cls
+    return {"unidata_version": unicodedata.unidata_version, "runs": runs}
+
+
+class ComputedCharClasses(dict):
+    """Classes of codepoints computed with compute_char_class() when they
+    are first looked up, indexed by codepoint like char_class_table()."""
+
+    def __missing__(self, cp: int) -> int:
+        cls = compute_char_class(chr(cp))
+        self[cp] = cls
+        return cls
+
+
+@functools.lru_cache(maxsize=None)
+def char_class_table() -> Union[bytes, ComputedCharClasses]:
+    """Returns the classes of all codepoints, indexed by codepoint.  The
+    table is loaded from data/unicode/char_classes.json on first use.  If
+    the table was generated for another Unicode version than the one in
+    this Python, the classes are computed from the Unicode names instead,
+    as names of characters differ between the versions."""
+    path = files("wiktextract") / "data" / "unicode" / "char_classes.json"
+    with path.open(encoding="utf-8") as f:
+        data = json.load(f)
+    if data["unidata_version"] != unicodedata.unidata_version:
+        return ComputedCharClasses()
+    runs = data["runs"]
+    table = bytearray(NUM_CODEPOINTS)
+    for (start, cls), (end, _) in zip(runs, runs[1:] + [[NUM_CODEPOINTS, 0]]):
+        table[start:end] = bytes([cls]) * (end - start)
+    return bytes(table)
+
+
+def char_class(ch: str) -> int:
+    return char_class_table()[ord(ch)]
+
+
+def is_superscript(ch: str) -> bool:
+    """Returns True if the argument is a superscript character."""
+    assert isinstance(ch, str) and len(ch) == 1
+    return char_class_table()[ord(ch)] & SUPERSCRIPT != 0
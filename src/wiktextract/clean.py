@@ -1300,6 +1300,64 @@ def remove_italic_and_bold(text):
     new_text_parts = new_text_parts[:-1] # remove last \n
     return "".join(new_text_parts)
 
+# Regular expressions used by clean_value(), in the order they are applied
+tables_re = re.compile(r"(?s)\{\|.*?\|\}")
+ref_name_re = re.compile(r"<ref\s+name=\"[^\"]+\"\s*/>")
+ref_re = re.compile(r"(?is)<ref\b\s*[^>/]*?>\s*.*?</ref\s*>")
+span_re = re.compile(r"(?is)<span\b\s*[^>]*?>(.*?)\s*</span\s*>")
+whitespace_re = re.compile(r"\s+")
+br_re = re.compile(r"(?si)\s*<br\s*/?>\n*")
+floatright_div_re = re.compile(
+    r'(?si)<div\b[^>]*?\bclass="[^"]*?\bfloatright\b[^>]*?>'
+    r'((<div\b(<div\b.*?</div\s*>|.)*?</div>)|.)*?'
+    r'</div\s*>')
+float_div_re = re.compile(
+    r'(?si)<div\b[^>]*?\bstyle="[^"]*?\bfloat:[^>]*?>'
+    r'((<div\b(<div\b.*?</div\s*>|.)*?</div>)|.)*?'
+    r'</div\s*>')
+previewonly_sup_re = re.compile(
+    r'(?si)<sup\b[^>]*?\bclass="[^"<>]*?'
+    r'\bpreviewonly\b[^>]*?>'
+    r'((<[^<>]>[^<>]*</[^<>]*>)|.)*?</sup\s*>')
+error_strong_re = re.compile(
+    r'(?si)<strong\b[^>]*?\bclass="[^"]*?\berror\b[^>]*?>'
+    r'((<.*?</.[^>]>)|.)*?</strong\s*>')
+block_tags_re = re.compile(r"(?si)</?(div|tr|li|table|dl|ul|ol)\b[^>]*>")
+dd_dt_re = re.compile(r"(?i)</?d[dt]\s*>")
+cell_tags_re = re.compile(r"(?si)</?(td|th)\b[^>]*>")
+empty_sup_re = re.compile(r"(?si)<sup\b[^>]*>\s*</sup\s*>")
+sup_re = re.compile(r"(?si)<sup\b[^>]*>(.*?)</sup\s*>")
+empty_sub_re = re.compile(r"(?si)<sub\b[^>]*>\s*</sup\s*>")
+sub_re = re.compile(r"(?si)<sub\b[^>]*>(.*?)</sub\s*>")
+chem_re = re.compile(r"(?si)<chem\b[^>]*>(.*?)</chem\s*>")
+math_re = re.compile(r"(?si)<math\b[^>]*>(.*?)</math\s*>")
+syntaxhighlight_re = re.compile(
+    r"(?si)<syntaxhighlight\b[^>]*>(.*?)</syntaxhighlight\s*>")
+html_start_tag_re = re.compile(r"(?s)<[/!a-zA-Z][^>]*>")
+html_end_tag_re = re.compile(r"(?s)</[^>]+>")
+noinclude_re = re.compile(r"(?si)<noinclude\s*/\s*>")
+bracketed_ellipsis_re = re.compile(r"(?s)\[\s*\.\.\.\s*\]")
+sup_url_re = re.compile(r"\^\(\[?(https?:)?//[^]()]+\]?\)")
+edit_link_re = re.compile(r"\[//[^]\s]+\s+edit\s*\]")
+simple_link_re = re.compile(r"(?s)\[\[\s*:?([^]|#<>]+?)\s*(#[^][|<>]*?)?\]\]")
+prefixed_link_re = re.compile(r"(?s)\[\[\s*(([a-zA-z0-9]+)\s*:)?\s*"
+                              r"([^][#|<>]+?)\s*(#[^][|]*?)?\|?\]\]")
+link_bars_re = re.compile(r"(?s)\[\[\s*([^][|<>]+?)\s*\|"
+                          r"\s*(([^][|]|\[[^]]*\])+?)"
+                          r"(\s*\|\s*(([^]|]|\[[^]]*\])+?))*\s*\]\]")
+exturl_re = re.compile(r"\[\s*((https?:|mailto:)?//([^][]+?))\s*\]")
+exturl_prefix_re = re.compile(r"(https?|mailto)://")
+file_link_re = re.compile(r"(?si)(File|Image)\s*:")
+invisible_chars_re = re.compile(r"[\u200e\u200f\u200b\u200d\u200c\ufeff]")
+spaces_re = re.compile(r"[ \t\r]+")
+newlines_re = re.compile(r" *\n+")
+ellipsis_re = re.compile(r"\[\s*…\s*\]")
+
+# If a value contains none of these characters, clean_value() only needs
+# to normalize whitespace and characters
+MARKUP_CHARS_RE = re.compile(r"[<\[&'{^]")
+
+
 def clean_value(wxr, title, no_strip=False, no_html_strip=False):
     """Cleans a title or value into a normal string.  This should basically
     remove any Wikimedia formatting from it: HTML tags, templates, links,
@@ -1308,13 +1366,50 @@ def clean_value(wxr, title, no_strip=False, no_html_strip=False):
     assert isinstance(wxr, WiktextractContext)
     assert isinstance(title, str)
 
+    if MARKUP_CHARS_RE.search(title) is not None:
+        title = clean_markup(wxr, title, no_html_strip)
+
+    title = title.replace("\xa0", " ")  # nbsp
+    # Remove left-to-right and right-to-left, zero-with characters
+    title = invisible_chars_re.sub("", title)
+    # Replace whitespace sequences by a single space.
+    title = spaces_re.sub(" ", title)
+    title = newlines_re.sub("\n", title)
+    # Eliminate spaces around ellipsis in brackets
+    if "[" in title:
+        title = ellipsis_re.sub("[…]", title)
+
+    # This unicode quote seems to be used instead of apostrophe quite randomly
+    # (about 4% of apostrophes in English entries, some in Finnish entries).
+    # title = re.sub("\u2019", "'", title)  # Note: no r"..." here!
+    # Replace strange unicode quotes with normal quotes
+    # title = re.sub(r"”", '"', title)
+    # Replace unicode long dash by normal dash
+    # title = re.sub(r"–", "-", title)
+
+    # Remove whitespace before periods and commas etc
+    # XXX we might re-enable this, now trying without as it is removing some
+    # instances where we would want to leave the space
+    # title = re.sub(r" ([.,;:!?)])", repl_1, title)
+    # Strip surrounding whitespace.
+    if not no_strip:
+        title = title.strip()
+    # Normalize different ways of writing accents into the NFC canonical form
+    title = unicodedata.normalize("NFC", title)
+    return title
+
+
+def clean_markup(wxr, title, no_html_strip):
+    """Removes HTML, links, emphasis and HTML entities for clean_value().
+    Each step is skipped when the characters it needs are not in the
+    value."""
     def repl_1(m):
         return clean_value(wxr, m.group(1), no_strip=True)
     def repl_exturl(m):
-        args = re.split(r"\s+", m.group(1))
+        args = whitespace_re.split(m.group(1))
         i = 0
         while i < len(args) - 1:
-            if not re.match(r"(https?|mailto)://", args[i]):
+            if not exturl_prefix_re.match(args[i]):
                 break
             i += 1
         return " ".join(args[i:])
@@ -1325,7 +1420,7 @@ def clean_value(wxr, title, no_strip=False, no_html_strip=False):
         return clean_value(wxr, v[0], no_strip=True)
     def repl_link_bars(m):
         lnk = m.group(1)
-        if re.match(r"(?si)(File|Image)\s*:", lnk):
+        if file_link_re.match(lnk):
             return ""
         return clean_value(wxr, m.group(4) or m.group(2) or "",
                            no_strip=True)
@@ -1351,141 +1446,94 @@ def clean_value(wxr, title, no_strip=False, no_html_strip=False):
     # Remove any remaining templates
     # title = re.sub(r"\{\{[^}]+\}\}", "", title)
     # Remove tables
-    title = re.sub(r"(?s)\{\|.*?\|\}", "\n", title)
-    # Remove second reference tags (<ref name="ref_name"/>)
-    title = re.sub(r"<ref\s+name=\"[^\"]+\"\s*/>", "", title)
-    # Remove references (<ref>...</ref>).
-    title = re.sub(r"(?is)<ref\b\s*[^>/]*?>\s*.*?</ref\s*>", "", title)
-    # Replace <span>...</span> by stripped content without newlines
-    title = re.sub(r"(?is)<span\b\s*[^>]*?>(.*?)\s*</span\s*>",
-                   lambda m: re.sub(r"\s+", " ", m.group(1)),
-                   title)
-    # Replace <br/> by comma space (it is used to express alternatives in some
-    # declensions)
-    title = re.sub(r"(?si)\s*<br\s*/?>\n*", "\n", title)
-    # Remove divs with floatright class (generated e.g. by {{ja-kanji|...}})
-    title = re.sub(r'(?si)<div\b[^>]*?\bclass="[^"]*?\bfloatright\b[^>]*?>'
-                   r'((<div\b(<div\b.*?</div\s*>|.)*?</div>)|.)*?'
-                   r'</div\s*>',
-                   "", title)
-    # Remove divs with float: attribute
-    title = re.sub(r'(?si)<div\b[^>]*?\bstyle="[^"]*?\bfloat:[^>]*?>'
-                   r'((<div\b(<div\b.*?</div\s*>|.)*?</div>)|.)*?'
-                   r'</div\s*>',
-                   "", title)
-    # Remove <sup> with previewonly class (generated e.g. by {{taxlink|...}})
-    title = re.sub(r'(?si)<sup\b[^>]*?\bclass="[^"<>]*?'
-                   r'\bpreviewonly\b[^>]*?>'
-                   r'((<[^<>]>[^<>]*</[^<>]*>)|.)*?</sup\s*>',
-                   "", title)
-    # Remove <strong class="error">...</strong>
-    title = re.sub(r'(?si)<strong\b[^>]*?\bclass="[^"]*?\berror\b[^>]*?>'
-                   r'((<.*?</.[^>]>)|.)*?</strong\s*>',
-                   "", title)
-    # Change <div> and </div> to newlines.  Ditto for tr, li, table, dl, ul, ol
-    title = re.sub(r"(?si)</?(div|tr|li|table|dl|ul|ol)\b[^>]*>",
-                   "\n", title)
-    # Change <dt>, <dd>, </dt> and </dd> into newlines;
-    # these generate new rows/lines.
-    title = re.sub(r"(?i)</?d[dt]\s*>", "\n", title)
-    # Change <td> </td> to spaces.  Ditto for th.
-    title = re.sub(r"(?si)</?(td|th)\b[^>]*>", " ", title)
-    # Change <sup> ... </sup> to ^
-    title = re.sub(r"(?si)<sup\b[^>]*>\s*</sup\s*>", "", title)
-    title = re.sub(r"(?si)<sup\b[^>]*>(.*?)</sup\s*>",
-                   repl_1_sup, title)
-    # Change <sub> ... </sub> to _
-    title = re.sub(r"(?si)<sub\b[^>]*>\s*</sup\s*>", "", title)
-    title = re.sub(r"(?si)<sub\b[^>]*>(.*?)</sub\s*>",
-                   repl_1_sub, title)
-    # Change <chem> ... </chem> using subscripts for digits
-    title = re.sub(r"(?si)<chem\b[^>]*>(.*?)</chem\s*>",
-                   repl_1_chem, title)
-    # Change <math> ... </math> using special formatting.
-    title = re.sub(r"(?si)<math\b[^>]*>(.*?)</math\s*>",
-                   repl_1_math, title)
-    # Change <syntaxhighlight> ... </syntaxhighlight> using special formatting.
-    title = re.sub(r"(?si)<syntaxhighlight\b[^>]*>(.*?)"
-                   r"</syntaxhighlight\s*>",
-                   repl_1_syntaxhighlight, title)
-    # Remove any remaining HTML tags.
-    if not no_html_strip:
-        title = re.sub(r"(?s)<[/!a-zA-Z][^>]*>", "", title)
-        title = re.sub(r"(?s)</[^>]+>", "", title)
-    else:
-        # Strip <noinclude/> anyway
-        title = re.sub(r"(?si)<noinclude\s*/\s*>", "", title)
-    # Replace [...]
-    title = re.sub(r"(?s)\[\s*\.\.\.\s*\]", "…", title)
-    # Remove http links in superscript
-    title = re.sub(r"\^\(\[?(https?:)?//[^]()]+\]?\)", "", title)
-    # Remove any edit links to local pages
-    title = re.sub(r"\[//[^]\s]+\s+edit\s*\]", "", title)
+    if "{|" in title:
+        title = tables_re.sub("\n", title)
+    if "<" in title:
+        # Remove second reference tags (<ref name="ref_name"/>)
+        title = ref_name_re.sub("", title)
+        # Remove references (<ref>...</ref>).
+        title = ref_re.sub("", title)
+        # Replace <span>...</span> by stripped content without newlines
+        title = span_re.sub(lambda m: whitespace_re.sub(" ", m.group(1)),
+                            title)
+        # Replace <br/> by comma space (it is used to express alternatives in
+        # some declensions)
+        title = br_re.sub("\n", title)
+        # Remove divs with floatright class (generated e.g. by
+        # {{ja-kanji|...}})
+        title = floatright_div_re.sub("", title)
+        # Remove divs with float: attribute
+        title = float_div_re.sub("", title)
+        # Remove <sup> with previewonly class (generated e.g. by
+        # {{taxlink|...}})
+        title = previewonly_sup_re.sub("", title)
+        # Remove <strong class="error">...</strong>
+        title = error_strong_re.sub("", title)
+        # Change <div> and </div> to newlines.  Ditto for tr, li, table, dl,
+        # ul, ol
+        title = block_tags_re.sub("\n", title)
+        # Change <dt>, <dd>, </dt> and </dd> into newlines;
+        # these generate new rows/lines.
+        title = dd_dt_re.sub("\n", title)
+        # Change <td> </td> to spaces.  Ditto for th.
+        title = cell_tags_re.sub(" ", title)
+        # Change <sup> ... </sup> to ^
+        title = empty_sup_re.sub("", title)
+        title = sup_re.sub(repl_1_sup, title)
+        # Change <sub> ... </sub> to _
+        title = empty_sub_re.sub("", title)
+        title = sub_re.sub(repl_1_sub, title)
+        # Change <chem> ... </chem> using subscripts for digits
+        title = chem_re.sub(repl_1_chem, title)
+        # Change <math> ... </math> using special formatting.
+        title = math_re.sub(repl_1_math, title)
+        # Change <syntaxhighlight> ... </syntaxhighlight> using special
+        # formatting.
+        title = syntaxhighlight_re.sub(repl_1_syntaxhighlight, title)
+        # Remove any remaining HTML tags.
+        if not no_html_strip:
+            title = html_start_tag_re.sub("", title)
+            title = html_end_tag_re.sub("", title)
+        else:
+            # Strip <noinclude/> anyway
+            title = noinclude_re.sub("", title)
+    if "[" in title:
+        # Replace [...]
+        title = bracketed_ellipsis_re.sub("…", title)
+    if "^(" in title:
+        # Remove http links in superscript
+        title = sup_url_re.sub("", title)
+    if "[" in title:
+        # Remove any edit links to local pages
+        title = edit_link_re.sub("", title)
     # Replace links by their text
-
-    category_ns_data = wxr.wtp.NAMESPACE_DATA.get("Category", {})
-    category_ns_names = {category_ns_data.get("name")} | set(
-        category_ns_data.get("aliases")
-    )
-    category_names_pattern = rf"(?:{'|'.join(category_ns_names)})"
-    while True:
-        # Links may be nested, so keep replacing until there is no more change.
-        orig = title
-        title = re.sub(
-            rf"(?si)\[\[\s*{category_names_pattern}\s*:\s*([^]]+?)\s*\]\]",
-            "",
-            title,
-        )
-        title = re.sub(r"(?s)\[\[\s*:?([^]|#<>]+?)\s*(#[^][|<>]*?)?\]\]",
-                       repl_1, title)
-        title = re.sub(r"(?s)\[\[\s*(([a-zA-z0-9]+)\s*:)?\s*([^][#|<>]+?)"
-                       r"\s*(#[^][|]*?)?\|?\]\]",
-                       repl_link, title)
-        title = re.sub(r"(?s)\[\[\s*([^][|<>]+?)\s*\|"
-                       r"\s*(([^][|]|\[[^]]*\])+?)"
-                       r"(\s*\|\s*(([^]|]|\[[^]]*\])+?))*\s*\]\]",
-                       repl_link_bars, title)
-        if title == orig:
-            break
+    if "[[" in title:
+        category_link_re = wxr.patterns.category_link_re
+        while True:
+            # Links may be nested, so keep replacing until there is no more
+            # change.
+            orig = title
+            title = category_link_re.sub("", title)
+            title = simple_link_re.sub(repl_1, title)
+            title = prefixed_link_re.sub(repl_link, title)
+            title = link_bars_re.sub(repl_link_bars, title)
+            if title == orig:
+                break
     # Replace remaining HTML links by the URL.
-    while True:
-        orig = title
-        title = re.sub(r"\[\s*((https?:|mailto:)?//([^][]+?))\s*\]",
-                       repl_exturl, title)
-        if title == orig:
-            break
+    if "[" in title:
+        while True:
+            orig = title
+            title = exturl_re.sub(repl_exturl, title)
+            if title == orig:
+                break
 
     # Remove italic and bold
-    title = remove_italic_and_bold(title)
+    if "''" in title:
+        title = remove_italic_and_bold(title)
 
     # Replace HTML entities
-    title = html.unescape(title)
-    title = title.replace("\xa0", " ")  # nbsp
-    # Remove left-to-right and right-to-left, zero-with characters
-    title = re.sub(r"[\u200e\u200f\u200b\u200d\u200c\ufeff]", "", title)
-    # Replace whitespace sequences by a single space.
-    title = re.sub(r"[ \t\r]+", " ", title)
-    title = re.sub(r" *\n+", "\n", title)
-    # Eliminate spaces around ellipsis in brackets
-    title = re.sub(r"\[\s*…\s*\]", "[…]", title)
-
-    # This unicode quote seems to be used instead of apostrophe quite randomly
-    # (about 4% of apostrophes in English entries, some in Finnish entries).
-    # title = re.sub("\u2019", "'", title)  # Note: no r"..." here!
-    # Replace strange unicode quotes with normal quotes
-    # title = re.sub(r"”", '"', title)
-    # Replace unicode long dash by normal dash
-    # title = re.sub(r"–", "-", title)
-
-    # Remove whitespace before periods and commas etc
-    # XXX we might re-enable this, now trying without as it is removing some
-    # instances where we would want to leave the space
-    # title = re.sub(r" ([.,;:!?)])", repl_1, title)
-    # Strip surrounding whitespace.
-    if not no_strip:
-        title = title.strip()
-    # Normalize different ways of writing accents into the NFC canonical form
-    title = unicodedata.normalize("NFC", title)
+    if "&" in title:
+        title = html.unescape(title)
     return title
 
 
@@ -50,6 +50,7 @@ class WiktionaryConfig:
         "language_counts",
         "pos_counts",
         "section_counts",
+        "cache_counts",
         "word",
         "errors",
         "warnings",
@@ -115,6 +116,8 @@ class WiktionaryConfig:
         self.language_counts = collections.defaultdict(int)
         self.pos_counts = collections.defaultdict(int)
         self.section_counts = collections.defaultdict(int)
+        # Hits and misses of caches, see count_cache_lookup()
+        self.cache_counts = collections.defaultdict(int)
         # Some fields related to errors
         # The word currently being processed.
         self.word = None
@@ -158,8 +161,24 @@ class WiktionaryConfig:
             "language_counts": self.language_counts,
             "pos_counts": self.pos_counts,
             "section_counts": self.section_counts,
+            "cache_counts": self.cache_counts,
         }
 
+    def reset_stats(self) -> None:
+        """Clears the statistics returned by to_return().  Worker processes
+        call this after returning their statistics, so that each return
+        value only contains the counts collected since the previous one."""
+        self.num_pages = 0
+        self.language_counts = collections.defaultdict(int)
+        self.pos_counts = collections.defaultdict(int)
+        self.section_counts = collections.defaultdict(int)
+        self.cache_counts = collections.defaultdict(int)
+
+    def count_cache_lookup(self, name: str, hit: bool) -> None:
+        """Counts a lookup in the cache ``name`` for the hit rates shown
+        with --statistics."""
+        self.cache_counts[(name, hit)] += 1
+
     def merge_return(self, ret):
         assert isinstance(ret, dict)
         if "num_pages" in ret:
@@ -170,6 +189,8 @@ class WiktionaryConfig:
                 self.pos_counts[k] += v
             for k, v in ret["section_counts"].items():
                 self.section_counts[k] += v
+            for k, v in ret.get("cache_counts", {}).items():
+                self.cache_counts[k] += v
         if "errors" in ret:
             self.errors.extend(ret.get("errors", []))
             self.warnings.extend(ret.get("warnings", []))
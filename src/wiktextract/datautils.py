@@ -1,7 +1,6 @@
 # Utilities for manipulating word data structures
 #
 # Copyright (c) 2018-2022 Tatu Ylonen.  See file LICENSE and https://ylonen.org
-import copy
 import re
 from collections import defaultdict
 from functools import lru_cache, partial
@@ -118,7 +117,7 @@ def split_slashes(wxr, text):
     split is to be interpreted, trying to prefer longer forms that can be
     found in the dictionary."""
     text = text.strip()
-    if wxr.wtp.page_exists(text):
+    if wxr.page_exists(text):
         return [text]
 
     text = text.replace("／", "/")
@@ -174,7 +173,7 @@ def split_slashes(wxr, text):
             words = []
             for ws in divs:
                 assert isinstance(ws, tuple)
-                # exists = wxr.wtp.page_exists(" ".join(ws))
+                # exists = wxr.page_exists(" ".join(ws))
                 words.extend(ws)
                 score += 100
                 score += 1 / len(ws)
@@ -212,16 +211,7 @@ def ns_title_prefix_tuple(
     wxr, namespace: str, lower: bool = False
 ) -> Tuple[str, ...]:
     """Based on given namespace name, create a tuple of aliases"""
-    if namespace in wxr.wtp.NAMESPACE_DATA:
-        return tuple(
-            map(
-                lambda x: x.lower() + ":" if lower else x + ":",
-                [wxr.wtp.NAMESPACE_DATA[namespace]["name"]]
-                + wxr.wtp.NAMESPACE_DATA[namespace]["aliases"],
-            )
-        )
-    else:
-        return ()
+    return wxr.patterns.ns_title_prefixes(namespace, lower)
 
 
 def find_similar_gloss(page_data: List[Dict], gloss: str) -> Dict:
@@ -251,6 +241,17 @@ def find_similar_gloss(page_data: List[Dict], gloss: str) -> Dict:
     return page_data[-1]
 
 
+def copy_base_data(base_data: Dict) -> Dict:
+    """Returns a copy of ``base_data`` for a new word entry.  Only the
+    lists in it are copied, so that adding to them in one entry does not
+    change the others; their items are shared and must not be modified."""
+    data = base_data.copy()
+    for k, v in data.items():
+        if isinstance(v, list):
+            data[k] = v.copy()
+    return data
+
+
 def append_base_data(
     page_data: List[Dict], field: str, value: Any, base_data: Dict
 ) -> None:
@@ -258,7 +259,7 @@ def append_base_data(
         if len(page_data[-1]["senses"]) > 0:
             # append new dictionary if the last dictionary has sense data and
             # also has the same key
-            page_data.append(copy.deepcopy(base_data))
+            page_data.append(copy_base_data(base_data))
             page_data[-1][field] = value
         elif isinstance(page_data[-1].get(field), list):
             page_data[-1][field] += value
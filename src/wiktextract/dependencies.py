@@ -0,0 +1,287 @@
+# Recording the Template, Module and other pages that a page depends on.
+#
+# Templates and Lua modules are read from the database with Wtp.get_page()
+# while a page is expanded, and some extractors read subpages of the page
+# with get_page() or read_by_title().  Wrapping these methods for the
+# duration of parsing a page tells which pages the extracted data was
+# derived from.  Lua modules are cached in the Lua environment and
+# only read once per worker process, so pages that run Lua code depend on
+# all modules, recorded as "Module:*".  The dependencies can be saved in an
+# SQLite database next to the Wtp database, and used later to find the
+# pages that need to be extracted again when the pages they depend on
+# change in a new dump.
+
+import hashlib
+import re
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from wikitextprocessor import Wtp
+
+from .wxr_context import WiktextractContext
+
+DEPENDENCY_NAMESPACES = ("Template", "Module")
+# Title (after the namespace prefix) of a dependency on all pages of a
+# namespace
+ANY_PAGE = "*"
+INVOKE_RE = re.compile(r"\{\{\s*#invoke\s*:", re.IGNORECASE)
+
+
+def dependency_namespace_ids(wtp: Wtp) -> Set[int]:
+    return {
+        wtp.NAMESPACE_DATA[ns]["id"]
+        for ns in DEPENDENCY_NAMESPACES
+        if ns in wtp.NAMESPACE_DATA
+    }
+
+
+def any_page_title(wtp: Wtp, namespace: str) -> str:
+    """Dependency title that stands for every page in the namespace."""
+    return wtp.NAMESPACE_DATA[namespace]["name"] + ":" + ANY_PAGE
+
+
+def uses_lua(text: Optional[str]) -> bool:
+    return text is not None and INVOKE_RE.search(text) is not None
+
+
+@contextmanager
+def record_dependencies(
+    wxr: WiktextractContext, page_text: Optional[str] = None
+) -> Iterator[Set[str]]:
+    """Collects the titles of the pages read while the block runs into the
+    yielded set.  These are mostly templates and modules, but extractors
+    also read other pages, like translation subpages.  Pages that don't
+    exist are recorded too, because creating them would change the
+    result.
+
+    Lua modules are loaded once per worker process and reused by later
+    pages without being read from the database again, so the modules a page
+    uses can't be observed.  A page that invokes Lua, directly in
+    ``page_text`` or through a page it reads, depends on ``Module:*``
+    instead, i.e. on every module.
+
+    The ``get_page()`` and ``read_by_title()`` methods are wrapped on
+    ``wxr.wtp`` only, not on the Wtp class, and restored when the block
+    exits."""
+    wtp = wxr.wtp
+    ns_prefixes = {
+        data["id"]: data["name"] + ":"
+        for data in wtp.NAMESPACE_DATA.values()
+        if data.get("name")
+    }
+    all_modules = (
+        any_page_title(wtp, "Module")
+        if "Module" in wtp.NAMESPACE_DATA
+        else None
+    )
+    deps = set()
+
+    def record(
+        title: str, namespace_id: Optional[int], text: Optional[str]
+    ) -> None:
+        prefix = ns_prefixes.get(namespace_id)
+        if prefix is not None and not title.startswith(prefix):
+            title = prefix + title
+        deps.add(title)
+        if all_modules is not None and (
+            title.startswith(all_modules[: -len(ANY_PAGE)]) or uses_lua(text)
+        ):
+            deps.add(all_modules)
+
+    if all_modules is not None and uses_lua(page_text):
+        deps.add(all_modules)
+    # Set when recording is nested, the outer wrappers are then restored
+    outer_methods = {
+        name: vars(wtp).get(name) for name in ("get_page", "read_by_title")
+    }
+    orig_get_page = wtp.get_page
+    orig_read_by_title = wtp.read_by_title
+
+    def get_page(
+        title: str, namespace_id: Optional[int] = None, *args, **kwargs
+    ):
+        page = orig_get_page(title, namespace_id, *args, **kwargs)
+        if page is not None:
+            record(page.title, page.namespace_id, page.body)
+        else:
+            record(title, namespace_id, None)
+        return page
+
+    def read_by_title(title: str, *args, **kwargs) -> Optional[str]:
+        text = orig_read_by_title(title, *args, **kwargs)
+        namespace_id = args[0] if args else kwargs.get("namespace_id")
+        record(title, namespace_id, text)
+        return text
+
+    wtp.get_page = get_page
+    wtp.read_by_title = read_by_title
+    try:
+        yield deps
+    finally:
+        for name, method in outer_methods.items():
+            if method is not None:
+                setattr(wtp, name, method)
+            else:
+                delattr(wtp, name)
+
+
+def dependency_db_path(wtp_db_path: Union[str, Path]) -> Path:
+    wtp_db_path = Path(wtp_db_path)
+    return wtp_db_path.with_stem(f"{wtp_db_path.stem}_dependencies")
+
+
+class DependencyDB:
+    """Template, Module and other pages used by each page, saved in an SQLite
+    database.  Titles are stored once in the ``titles`` table, and the
+    ``dependencies`` table maps page title ids to dependency title ids.
+    Each worker process has its own connection; new dependencies are
+    buffered and written when commit() is called."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.conn = None
+        self.pending = []
+        self.connect()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS titles (
+            id INTEGER PRIMARY KEY,
+            title TEXT UNIQUE
+            );
+
+            CREATE TABLE IF NOT EXISTS dependencies (
+            page_id INTEGER,
+            dependency_id INTEGER,
+            PRIMARY KEY(page_id, dependency_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS dependencies_index
+            ON dependencies(dependency_id);
+
+            PRAGMA journal_mode = WAL;
+            """)
+
+    def connect(self, check_same_thread: bool = True) -> None:
+        self.conn = sqlite3.connect(
+            self.db_path, timeout=60, check_same_thread=check_same_thread
+        )
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.commit()
+            self.conn.close()
+            self.conn = None
+
+    def add(self, title: str, dependencies: Iterable[str]) -> None:
+        self.pending.append((title, sorted(dependencies)))
+
+    def title_ids(self, titles: Iterable[str]) -> Dict[str, int]:
+        titles = set(titles)
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO titles (title) VALUES(?)",
+            ((title,) for title in titles),
+        )
+        ids = {}
+        for title in titles:
+            for (title_id,) in self.conn.execute(
+                "SELECT id FROM titles WHERE title = ?", (title,)
+            ):
+                ids[title] = title_id
+        return ids
+
+    def commit(self) -> None:
+        if not self.pending:
+            return
+        ids = self.title_ids(
+            t for title, deps in self.pending for t in [title, *deps]
+        )
+        for title, deps in self.pending:
+            page_id = ids[title]
+            self.conn.execute(
+                "DELETE FROM dependencies WHERE page_id = ?", (page_id,)
+            )
+            self.conn.executemany(
+                "INSERT INTO dependencies (page_id, dependency_id) "
+                "VALUES(?, ?)",
+                ((page_id, ids[dep]) for dep in deps),
+            )
+        self.conn.commit()
+        self.pending = []
+
+    def dependency_titles(self) -> Iterator[str]:
+        """Yields the titles of all pages that some page depends on."""
+        for (title,) in self.conn.execute(
+            "SELECT title FROM titles WHERE id IN "
+            "(SELECT DISTINCT dependency_id FROM dependencies)"
+        ):
+            yield title
+
+    def dependent_pages(self, titles: Iterable[str]) -> Iterator[str]:
+        """Yields the titles of the pages that used any of the given
+        pages, including the pages that depend on all
+        pages of their namespace."""
+        titles = set(titles)
+        titles.update(
+            title.split(":", 1)[0] + ":" + ANY_PAGE
+            for title in list(titles)
+            if ":" in title
+        )
+        for title in titles:
+            for (page_title,) in self.conn.execute(
+                "SELECT pages.title FROM titles AS deps "
+                "JOIN dependencies ON dependencies.dependency_id = deps.id "
+                "JOIN titles AS pages ON dependencies.page_id = pages.id "
+                "WHERE deps.title = ?",
+                (title,),
+            ):
+                yield page_title
+
+
+def page_hash(page) -> str:
+    return hashlib.blake2b(
+        (page.body or page.redirect_to or "").encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+
+
+def dependency_hashes(wtp: Wtp) -> Dict[str, str]:
+    return {
+        page.title: page_hash(page)
+        for page in wtp.get_all_pages(list(dependency_namespace_ids(wtp)))
+    }
+
+
+def changed_dependencies(
+    old_wtp: Wtp, new_wtp: Wtp, other_titles: Iterable[str] = ()
+) -> List[str]:
+    """Returns the titles of Template and Module pages that were added,
+    removed or changed between two databases, and of the pages in
+    ``other_titles`` that were.  ``other_titles`` are the other pages that
+    extracted pages depend on, like translation subpages."""
+    old_hashes = dependency_hashes(old_wtp)
+    new_hashes = dependency_hashes(new_wtp)
+    prefixes = tuple(
+        old_wtp.NAMESPACE_DATA[ns]["name"] + ":"
+        for ns in DEPENDENCY_NAMESPACES
+        if ns in old_wtp.NAMESPACE_DATA
+    )
+    for title in other_titles:
+        if title.startswith(prefixes):
+            continue
+        for wtp, hashes in ((old_wtp, old_hashes), (new_wtp, new_hashes)):
+            page = wtp.get_page(title)
+            if page is not None:
+                hashes[title] = page_hash(page)
+    return sorted(
+        title
+        for title in old_hashes.keys() | new_hashes.keys()
+        if old_hashes.get(title) != new_hashes.get(title)
+    )
+
+
+def pages_to_reextract(
+    dependency_db: DependencyDB, changed_titles: Iterable[str]
+) -> List[str]:
+    """Returns the titles of pages that used any of the changed pages when
+    they were extracted, and thus need to be extracted again."""
+    return sorted(set(dependency_db.dependent_pages(changed_titles)))
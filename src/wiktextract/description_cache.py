@@ -0,0 +1,151 @@
+# Persistent cache of the results of decode_tags() and classify_desc().
+#
+# The worker processes share the cache through an SQLite database, and it is
+# kept between runs.  Results are valid only for the tag tables and the
+# code that computed them, so each result is stored with a hash of those
+# source files and results with another hash are ignored.  The cache is
+# consulted after the per-process lru_cache of these functions.
+
+import collections
+import functools
+import hashlib
+import json
+import sqlite3
+from importlib.resources import files
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional, Union
+
+# Source files whose contents determine the cached results
+TABLE_FILES = (
+    "tags.py",
+    "topics.py",
+    "english_words.py",
+    "data/english/brown_words.txt",
+    "taxondata.py",
+    "english_classifier.py",
+    "form_descriptions.py",
+    "char_classes.py",
+    "data/unicode/char_classes.json",
+)
+
+# Size of the memory-mapped part of the database in each process
+MMAP_SIZE = 256 * 1024 * 1024
+
+# Cache used by the decorated functions in this process, set with
+# use_description_cache()
+active_cache: Optional["DescriptionCache"] = None
+
+
+def tables_hash(names: Iterable[str] = TABLE_FILES) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for name in names:
+        path = files("wiktextract") / name
+        # Generated data files may be missing from a source checkout
+        if path.is_file():
+            h.update(path.read_bytes())
+        else:
+            h.update(b"missing " + name.encode())
+    return h.hexdigest()
+
+
+class DescriptionCache:
+    """Results of functions in an SQLite database, keyed by function name
+    and JSON-encoded arguments.  Each worker process has its own
+    connection; new results are buffered and written when commit() is
+    called.  ``counts`` holds the number of hits and misses of each
+    function, like WiktionaryConfig.cache_counts."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = Path(db_path)
+        self.version = tables_hash()
+        self.conn = None
+        self.pending = []
+        self.counts = collections.defaultdict(int)
+        self.connect()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+            name TEXT,
+            key TEXT,
+            version TEXT,
+            value TEXT,
+            PRIMARY KEY(name, key)
+            ) WITHOUT ROWID;
+            PRAGMA journal_mode = WAL;
+            """)
+
+    def connect(self, check_same_thread: bool = True) -> None:
+        self.conn = sqlite3.connect(
+            self.db_path, timeout=60, check_same_thread=check_same_thread
+        )
+        self.conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.commit()
+            self.conn.close()
+            self.conn = None
+
+    def get(self, name: str, key: str) -> Optional[str]:
+        for (value,) in self.conn.execute(
+            "SELECT value FROM results WHERE name = ? AND key = ? "
+            "AND version = ?",
+            (name, key, self.version),
+        ):
+            self.counts[(name, True)] += 1
+            return value
+        self.counts[(name, False)] += 1
+        return None
+
+    def put(self, name: str, key: str, value: str) -> None:
+        self.pending.append((name, key, self.version, value))
+
+    def commit(self) -> None:
+        if not self.pending:
+            return
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO results (name, key, version, value) "
+            "VALUES(?, ?, ?, ?)",
+            self.pending,
+        )
+        self.conn.commit()
+        self.pending = []
+
+    def move_counts(self, counts: dict) -> None:
+        """Adds the hit and miss counts to ``counts`` and clears them."""
+        for k, v in self.counts.items():
+            counts[k] += v
+        self.counts.clear()
+
+
+def use_description_cache(cache: Optional[DescriptionCache]) -> None:
+    """Makes the functions decorated with persistent_cache() use ``cache``
+    in this process, or no cache if None."""
+    global active_cache
+    active_cache = cache
+
+
+def persistent_cache(
+    name: str, from_json: Callable[[Any], Any] = lambda x: x
+) -> Callable:
+    """Decorator that looks up the results of a function with JSON
+    serializable arguments and return value in the active
+    DescriptionCache.  ``from_json`` converts the decoded JSON value back
+    to the type returned by the function."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = active_cache
+            if cache is None or cache.conn is None:
+                return fn(*args, **kwargs)
+            key = json.dumps([args, kwargs], ensure_ascii=False)
+            value = cache.get(name, key)
+            if value is not None:
+                return from_json(json.loads(value))
+            result = fn(*args, **kwargs)
+            cache.put(name, key, json.dumps(result, ensure_ascii=False))
+            return result
+
+        return wrapper
+
+    return decorator
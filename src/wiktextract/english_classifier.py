@@ -0,0 +1,250 @@
+# Recognizing English words in descriptions for classify_desc().
+#
+# A token is considered English if it is in the vocabulary, possibly after
+# lowercasing, if it is an inflected form of a word in the vocabulary
+# (plural, -ies, -ing, -ed, -ise/-ize spellings, possessives), or if it
+# starts a known taxonomic name.  The
+# inflected forms are generated once into an expanded vocabulary, so
+# checking a token takes a set lookup instead of trying each suffix.
+
+import functools
+import html.entities
+import re
+import sys
+import unicodedata
+from typing import FrozenSet, List, Tuple
+
+from .english_words import get_english_words, not_english_words
+from .table_cache import cached_table
+
+# Splits a description into tokens like nltk's TweetTokenizer does.  URLs,
+# domain names, phone numbers, emoticons, arrows, e-mail addresses and
+# emoji sequences are kept as single tokens.  TweetTokenizer uses the
+# regex module, where \w also matches combining marks but not digits like
+# "²", and \s does not match the control characters \x1c-\x1f.  Thus \w,
+# [^\W\d_] and \s are replaced by the character classes of the regex
+# module when the pattern is compiled; they are only used in brackets.
+# The pattern is matched case-sensitively, as ignoring case makes matching
+# the large character classes slow, so a-z also stands for A-Z.
+token_pattern = r"""
+    (?:
+      (?i:https?):(?:/{1,3}|[a-z0-9%])   # URLs
+      |
+      [a-z0-9.\-]{1,255}[.][a-z]{2,13}/
+    )
+    (?:[^\s()<>{}\[\]]+|\([^\s()]{0,255}?\([^\s()]{1,255}\)[^\s()]{0,255}?\)
+       |\([^\s]{1,255}?\))+
+    (?:\([^\s()]{0,255}?\([^\s()]{1,255}\)[^\s()]{0,255}?\)|\([^\s]{1,255}?\)
+       |[^\s`!()\[\]{};:'".,<>?«»“”‘’])
+    |
+    (?<!@)[a-z0-9]+(?:[.\-][a-z0-9]+){0,126}[.][a-z]{2,13}(?![\w])/?(?!@)
+                                         # Domain names
+    |
+    (?:\+?[01][ *\-.\)]*)?(?:\(?\d{3}[ *\-.\)]*)?\d{3}[ *\-.\)]*\d{4}
+                                         # Phone numbers
+    |
+    (?:
+      [<>]?[:;=8][\-oO\*\']?[\)\]\(\[dDpP/\:\}\{@\|\\]  # Emoticons
+      |
+      [\)\]\(\[dDpP/\:\}\{@\|\\][\-oO\*\']?[:;=8][<>]?
+      |
+      </?3
+    )
+    |
+    <[^>\s]+>                            # HTML tags
+    |
+    -+>|<-+                              # Arrows
+    |
+    @[\w]+                               # Handles
+    |
+    \#+[\w]+[\w'\-]*[\w]+                # Hashtags
+    |
+    [\w.+-]{1,64}@[\w-]{1,63}\.(?:[\w-]\.?){1,251}[\w-]
+                                         # E-mail addresses
+    |
+    .(?:[\U0001f3fb-\U0001f3ff]?(?:\u200d.[\U0001f3fb-\U0001f3ff]?)+
+       |[\U0001f3fb-\U0001f3ff])        # Emoji sequences
+    |
+    [\U0001f1e6-\U0001f1ff]{2}           # Flags
+    |
+    \U0001f3f4\U000e0067\U000e0062
+    (?:\U000e0065\U000e006e\U000e0067|\U000e0073\U000e0063\U000e0074
+       |\U000e0077\U000e006c\U000e0073)\U000e007f
+    |
+    [^\W\d_](?:[^\W\d_]|['\-_])+[^\W\d_]  # Words with apostrophes or dashes
+    |
+    [+\-]?\d+[,/.:-]\d+[+\-]?            # Numbers, fractions, decimals
+    |
+    [\w]+                                # Words without apostrophes or dashes
+    |
+    \.(?:[\s]*\.)+                       # Ellipsis dots
+    |
+    [^\s]                                # Everything else but whitespace
+    """
+
+# Letters that the regex module also considers word characters: circled and
+# squared Latin letters, which have the Unicode Alphabetic property
+alphabetic_symbols = (
+    (0x24B6, 0x24E9),
+    (0x1F130, 0x1F149),
+    (0x1F150, 0x1F169),
+    (0x1F170, 0x1F189),
+)
+
+# Letters matched by [a-z] in the regex module when ignoring case
+latin_letters = r"a-zA-Z\u0130\u017f\u212a"
+
+# Whitespace characters of the regex module
+spaces = r"\t-\r \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000"
+
+# Runs of four or more of the same character other than a letter or digit
+# are shortened to three before tokenizing
+repeated_punct_re = re.compile(r"([^\w]|_)\1{3,}")
+
+# HTML character entities, which are replaced like TweetTokenizer does
+entity_re = re.compile(r"&(#?(x?))([^&;" + spaces + r"]+);")
+
+
+def build_word_char_classes() -> Tuple[Tuple[str, str], Tuple[str, str]]:
+    """Returns the contents of character classes that match the word
+    characters and the letters of the regex module: letters, marks, decimal
+    digits, letter numbers, connector punctuation, the zero-width (non-)
+    joiner and alphabetic symbols.  Letters are word characters other than
+    decimal digits and "_".  Both are split into the characters in the
+    Basic Multilingual Plane and the ones above it."""
+    word = []
+    letters = []
+    for cp in range(sys.maxunicode + 1):
+        cat = unicodedata.category(chr(cp))
+        if (cat[0] in "LM" or cat in ("Nl", "Pc")
+                or cp in (0x200C, 0x200D)
+                or (cat == "So" and
+                    any(a <= cp <= b for a, b in alphabetic_symbols))):
+            word.append(cp)
+            if cp != 0x5F:
+                letters.append(cp)
+        elif cat == "Nd":
+            word.append(cp)
+    return (
+        (char_ranges([cp for cp in word if cp <= 0xFFFF]),
+         char_ranges([cp for cp in word if cp > 0xFFFF])),
+        (char_ranges([cp for cp in letters if cp <= 0xFFFF]),
+         char_ranges([cp for cp in letters if cp > 0xFFFF])),
+    )
+
+
+def char_ranges(cps: List[int]) -> str:
+    """Returns the contents of a character class matching the codepoints
+    in the sorted list ``cps``."""
+    parts = []
+    i = 0
+    while i < len(cps):
+        j = i
+        while j + 1 < len(cps) and cps[j + 1] == cps[j] + 1:
+            j += 1
+        parts.append(f"\\U{cps[i]:08x}")
+        if j > i:
+            parts.append(f"-\\U{cps[j]:08x}")
+        i = j + 1
+    return "".join(parts)
+
+
+def split_char_class(ranges: Tuple[str, str], extra: str = "") -> str:
+    """Returns a regexp matching the characters of a class split by
+    build_word_char_classes(), and the characters in ``extra``.  The re
+    module checks ranges above the Basic Multilingual Plane one by one, so
+    they are only tried for characters there."""
+    bmp, astral = ranges
+    return rf"(?:[{bmp}{extra}]|(?=[\U00010000-\U0010ffff])[{astral}])"
+
+
+@functools.lru_cache(maxsize=None)
+def get_token_re() -> re.Pattern:
+    word, letters = cached_table(
+        "word_chars", ("english_classifier.py",), build_word_char_classes
+    )
+    pattern = token_pattern.replace(r"[^\W\d_]", split_char_class(letters))
+    pattern = re.sub(r"\[\\w([^\]]*)\]",
+                     lambda m: split_char_class(word, m.group(1)), pattern)
+    pattern = pattern.replace("a-z", latin_letters)
+    pattern = pattern.replace(r"\s", spaces)
+    return re.compile(pattern, re.VERBOSE)
+
+
+def replace_entity(m: re.Match) -> str:
+    """Replaces an HTML character entity with its character, or removes it
+    if it is unknown."""
+    body = m.group(3)
+    if m.group(1):
+        try:
+            number = int(body, 16 if m.group(2) else 10)
+        except ValueError:
+            return ""
+        # Browsers decode references to 0x80-0x9f as Windows-1252
+        if 0x80 <= number <= 0x9F:
+            return bytes((number,)).decode("cp1252", errors="ignore")
+    else:
+        number = html.entities.name2codepoint.get(body)
+        if number is None:
+            return ""
+    try:
+        return chr(number)
+    except (ValueError, OverflowError):
+        return ""
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits ``text`` into words, numbers and punctuation."""
+    if "&" in text:
+        text = entity_re.sub(replace_entity, text)
+    return get_token_re().findall(repeated_punct_re.sub(r"\1\1\1", text))
+
+
+@functools.lru_cache(maxsize=None)
+def expanded_english_words() -> FrozenSet[str]:
+    """Returns the English vocabulary together with the inflected forms of
+    its words that classify_desc() accepts as English, and the known first
+    words of taxonomic names."""
+    # Imported here because form_descriptions imports this module
+    from .form_descriptions import known_firsts
+
+    english_words = get_english_words()
+    words = set(english_words) | known_firsts
+    for w in english_words:
+        n = len(w)
+        words.add(w + "'s")
+        words.add(w + "s'")
+        if n >= 2:
+            words.add(w + "ing")  # E.g. bring - bringing
+        if n >= 3:
+            words.add(w + "s")  # Plural
+            words.add(w + "ed")  # E.g. hang - hanged
+            if w.endswith("y"):
+                words.add(w[:-1] + "ies")  # E.g. lily - lilies
+            if w.endswith("e"):
+                words.add(w[:-1] + "ing")  # E.g. tone - toning
+                if n >= 4:
+                    words.add(w[:-1] + "ed")  # E.g. atone - atoned
+        if n >= 5 and w.endswith("ize"):
+            words.add(w[:-3] + "ise")
+        if n >= 6 and w.endswith("ized"):
+            words.add(w[:-4] + "ised")
+        if n >= 7 and w.endswith("izing"):
+            words.add(w[:-5] + "ising")
+    return frozenset(words)
+
+
+def is_english_token(x: str) -> bool:
+    """Returns True if the token ``x`` looks like an English word."""
+    if x in not_english_words:
+        return False
+    english_words = get_english_words()
+    if (x in expanded_english_words() or
+        x.lower() in english_words or
+        x[0].isdigit()):
+        return True
+    if "-" in x or "/" in x:
+        # Compounds of English words, e.g. "brother-in-law" or "and/or"
+        return all((y in english_words and len(y) > 2) or not y
+                   for y in re.split(r"[-/]", x))
+    return False
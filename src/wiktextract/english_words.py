@@ -4,17 +4,20 @@
 # and exclude some words.  These will likely need to be tweaked semi-frequently
 # to add support for unrecognized sense descriptions.
 #
+# The words of the Brown corpus are saved in data/english/brown_words.txt by
+# tools/generate_english_words.py, and the vocabulary is built from it when
+# it is first used.
+#
 # Copyright (c) 2020-2022 Tatu Ylonen.  See file LICENSE and https://ylonen.org
 
-import nltk
-from nltk.corpus import brown
-from .form_descriptions import known_firsts  # w/ our additions
+import functools
+from importlib.resources import files
+from typing import FrozenSet, Set
+
+from .taxondata import known_firsts
 
-# Download Brown corpus if not already downloaded
-try:
-    nltk.data.find("corpora/brown.zip")
-except LookupError:
-    nltk.download("brown", quiet=True)
+# Taken before form_descriptions adds its own first words to known_firsts
+taxon_firsts = frozenset(known_firsts)
 
 # English words added to the default set from Brown corpus.  Multi-word
 # expressions separated by spaces can also be added but must match the whole
@@ -1907,11 +1910,42 @@ not_english_words = set([
     "que",
 ])
 
-# Construct a set of (most) English words.  Multi-word expressions where we
-# do not want to include the components can also be put here space-separated.
-english_words = (set(brown.words()) |
-                 known_firsts |
-                 # XXX the second words of species names add too much garbage
-                 # now that we accept "english" more loosely.
-                 # set(x for name in known_species for x in name.split()) |
-                 additional_words) - not_english_words
+
+
+def brown_words() -> Set[str]:
+    """Returns the words of the Brown corpus.  They are read from the file
+    generated by tools/generate_english_words.py, or from nltk if the file
+    has not been generated."""
+    path = files("wiktextract") / "data" / "english" / "brown_words.txt"
+    if path.is_file():
+        return set(path.read_text(encoding="utf-8").splitlines())
+    import nltk
+    from nltk.corpus import brown
+
+    # Download Brown corpus if not already downloaded
+    try:
+        nltk.data.find("corpora/brown.zip")
+    except LookupError:
+        nltk.download("brown", quiet=True)
+    return set(brown.words())
+
+
+@functools.lru_cache(maxsize=None)
+def get_english_words() -> FrozenSet[str]:
+    """Returns a set of (most) English words.  Multi-word expressions where
+    we do not want to include the components can also be put here
+    space-separated."""
+    return frozenset((brown_words() |
+                      taxon_firsts |
+                      # XXX the second words of species names add too much
+                      # garbage now that we accept "english" more loosely.
+                      # set(x for name in known_species
+                      #     for x in name.split()) |
+                      additional_words) - not_english_words)
+
+
+def __getattr__(name: str):
+    # ``english_words`` is loaded when it is first accessed
+    if name == "english_words":
+        return get_english_words()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
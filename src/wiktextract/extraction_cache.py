@@ -0,0 +1,336 @@
+# Persistent cache of the data extracted from each page, so that pages that
+# have not changed since an earlier run don't need to be parsed again.
+#
+# A cached result is reused only if the page text, the pages it read when
+# it was extracted (templates, modules, translation subpages), the
+# wiktextract version and the extraction configuration are all unchanged.
+# The Wtp messages and the statistics counted while extracting the page
+# are replayed too, so that --statistics is the same whether pages were
+# cached or not.
+#
+# Lua modules stay loaded in a worker process after the first page that
+# uses them, so the modules used by a later page can't be observed (see
+# dependencies.py).  Each worker therefore logs the modules in the order
+# they were first loaded, and a page that runs Lua depends on the modules
+# that had been loaded by the end of its extraction.  A changed module
+# invalidates the pages extracted after it was first loaded, in every
+# worker that loaded it.  Changes to modules that nearly every page loads
+# early, like Module:links, thus still invalidate most of the cache; the
+# hit rate is shown by --statistics.  If the Lua environment was created
+# before a worker started its log, its pages depend on all modules.
+
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import uuid
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .config import WiktionaryConfig
+from .dependencies import ANY_PAGE, any_page_title, record_dependencies
+from .wxr_context import WiktextractContext
+
+# Wtp messages that are stored with the cached data and replayed
+MESSAGE_KINDS = ("errors", "warnings", "debugs")
+# Statistics in WiktionaryConfig that extracting a page adds to, stored
+# with the cached data and replayed.  cache_counts counts lookups in
+# in-memory caches, which a cached page doesn't do.
+STATS_KINDS = ("language_counts", "pos_counts", "section_counts")
+
+
+def text_hash(text: Optional[str]) -> str:
+    return hashlib.blake2b(
+        (text or "").encode("utf-8"), digest_size=16
+    ).hexdigest()
+
+
+def wiktextract_version() -> str:
+    try:
+        return version("wiktextract")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class ExtractionCache:
+    """Extracted data of pages in an SQLite database.  Each worker process
+    has its own connection; new results are buffered and written when
+    commit() is called."""
+
+    def __init__(self, db_path: Union[str, Path], config: WiktionaryConfig):
+        self.db_path = Path(db_path)
+        # Data extracted with another version or with different options
+        # can't be reused
+        self.version = text_hash(
+            wiktextract_version()
+            + json.dumps(config.to_kwargs(), sort_keys=True)
+        )
+        self.conn = None
+        self.pending = []
+        self.pending_modules = []
+        # Hashes of the current pages that pages depend on, these don't
+        # change during a run
+        self.dep_hashes = {}
+        # Number of modules at the start of each module log that haven't
+        # changed
+        self.valid_log_lengths = {}
+        # Log of the modules loaded in this process: the process id, the
+        # log id (None if modules were loaded before the log was started)
+        # and the logged titles in load order
+        self.log_pid = None
+        self.log_id = None
+        self.logged_modules = {}
+        self.connect()
+        # Entries saved by older versions lack the statistics, and the
+        # module or subpage dependencies, see record_dependencies()
+        columns = {
+            row[1] for row in self.conn.execute("PRAGMA table_info(pages)")
+        }
+        if columns and "module_log" not in columns:
+            self.conn.execute("DROP TABLE pages")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+            title TEXT PRIMARY KEY,
+            body_hash TEXT,
+            version TEXT,
+            dependencies TEXT,  -- JSON list of titles of pages read
+            dependencies_hash TEXT,
+            data TEXT,  -- JSON list of extracted entries
+            messages TEXT,  -- JSON object of Wtp errors, warnings and debugs
+            stats TEXT,  -- JSON object of counts added to WiktionaryConfig
+            module_log TEXT,  -- id of the module log of the worker
+            module_count INTEGER  -- number of modules loaded in the log
+            );
+
+            CREATE TABLE IF NOT EXISTS module_logs (
+            log_id TEXT,
+            seq INTEGER,
+            title TEXT,
+            hash TEXT,
+            PRIMARY KEY(log_id, seq)
+            ) WITHOUT ROWID;
+
+            PRAGMA journal_mode = WAL;
+            """)
+        # Logs that no entry refers to anymore
+        self.conn.execute(
+            "DELETE FROM module_logs WHERE log_id NOT IN "
+            "(SELECT module_log FROM pages WHERE module_log IS NOT NULL)"
+        )
+        self.conn.commit()
+
+    def connect(self, check_same_thread: bool = True) -> None:
+        self.conn = sqlite3.connect(
+            self.db_path, timeout=60, check_same_thread=check_same_thread
+        )
+
+    def close(self) -> None:
+        if self.conn is not None:
+            self.commit()
+            self.conn.close()
+            self.conn = None
+
+    def page_hash(self, wxr: WiktextractContext, title: str) -> str:
+        prefix, _, name = title.partition(":")
+        if name != ANY_PAGE:
+            page = wxr.wtp.get_page(title)
+            return text_hash(page.body if page is not None else None)
+        # Dependency on all pages of the namespace
+        ns_ids = [
+            data["id"]
+            for data in wxr.wtp.NAMESPACE_DATA.values()
+            if data.get("name") == prefix
+        ]
+        return text_hash(
+            "\n".join(
+                sorted(
+                    page.title + "\t" + text_hash(page.body or page.redirect_to)
+                    for page in wxr.wtp.get_all_pages(ns_ids)
+                )
+            )
+        )
+
+    def dependency_hash(self, wxr: WiktextractContext, title: str) -> str:
+        h = self.dep_hashes.get(title)
+        if h is None:
+            h = self.page_hash(wxr, title)
+            self.dep_hashes[title] = h
+        return h
+
+    def dependencies_hash(
+        self,
+        wxr: WiktextractContext,
+        dependencies: List[str],
+        module_log: Optional[str],
+    ) -> str:
+        # The module log replaces the dependency on all modules
+        all_modules = any_page_title(wxr.wtp, "Module")
+        return text_hash(
+            "\n".join(
+                title + "\t" + self.dependency_hash(wxr, title)
+                for title in sorted(dependencies)
+                if module_log is None or title != all_modules
+            )
+        )
+
+    def valid_log_length(self, wxr: WiktextractContext, log_id: str) -> int:
+        """Returns the number of modules at the start of the module log
+        that are unchanged."""
+        length = self.valid_log_lengths.get(log_id)
+        if length is None:
+            length = 0
+            for seq, title, h in self.conn.execute(
+                "SELECT seq, title, hash FROM module_logs WHERE log_id = ? "
+                "ORDER BY seq",
+                (log_id,),
+            ):
+                if seq != length or self.dependency_hash(wxr, title) != h:
+                    break
+                length += 1
+            self.valid_log_lengths[log_id] = length
+        return length
+
+    def log_modules(
+        self, wxr: WiktextractContext, dependencies: List[str]
+    ) -> None:
+        """Adds the modules read by a page to the module log of this
+        process, starting a new log in a new process.  Modules loaded
+        before the log was started can't be known, and then no log is
+        kept."""
+        if self.log_pid != os.getpid():
+            self.log_pid = os.getpid()
+            self.log_id = (
+                uuid.uuid4().hex
+                if getattr(wxr.wtp, "lua", None) is None
+                else None
+            )
+            self.logged_modules = {}
+        if self.log_id is None:
+            return
+        all_modules = any_page_title(wxr.wtp, "Module")
+        module_prefix = all_modules[: -len(ANY_PAGE)]
+        for title in dependencies:
+            if (
+                title.startswith(module_prefix)
+                and title != all_modules
+                and title not in self.logged_modules
+            ):
+                seq = len(self.logged_modules)
+                self.logged_modules[title] = seq
+                self.pending_modules.append(
+                    (self.log_id, seq, title, self.dependency_hash(wxr, title))
+                )
+
+    def lookup(
+        self, wxr: WiktextractContext, title: str, body_hash: str
+    ) -> Tuple[Optional[List[Dict]], List[str]]:
+        for (
+            deps,
+            deps_hash,
+            data,
+            messages,
+            stats,
+            module_log,
+            module_count,
+        ) in self.conn.execute(
+            "SELECT dependencies, dependencies_hash, data, messages, stats, "
+            "module_log, module_count FROM pages "
+            "WHERE title = ? AND body_hash = ? AND version = ?",
+            (title, body_hash, self.version),
+        ):
+            deps = json.loads(deps)
+            if self.dependencies_hash(wxr, deps, module_log) != deps_hash:
+                return None, []
+            if (
+                module_log is not None
+                and self.valid_log_length(wxr, module_log) < module_count
+            ):
+                return None, []
+            for kind, msgs in json.loads(messages).items():
+                getattr(wxr.wtp, kind).extend(msgs)
+            for kind, counts in json.loads(stats).items():
+                config_counts = getattr(wxr.config, kind)
+                for k, v in counts.items():
+                    config_counts[k] += v
+            return json.loads(data), deps
+        return None, []
+
+    def extract(
+        self,
+        wxr: WiktextractContext,
+        title: str,
+        text: str,
+        parse_fn: Callable[[WiktextractContext, str, str], List[Dict]],
+    ) -> Tuple[List[Dict], List[str]]:
+        """Returns the cached data of the page if it is still valid;
+        otherwise calls ``parse_fn`` and stores its result.  Also returns
+        the titles of the pages the data depends on."""
+        body_hash = text_hash(text)
+        page_data, dependencies = self.lookup(wxr, title, body_hash)
+        wxr.config.count_cache_lookup("extraction", page_data is not None)
+        if page_data is not None:
+            return page_data, dependencies
+        # Modules loaded before this page are logged, see log_modules()
+        self.log_modules(wxr, [])
+        # Count the statistics of this page separately
+        config_counts = {
+            kind: getattr(wxr.config, kind) for kind in STATS_KINDS
+        }
+        for kind in STATS_KINDS:
+            setattr(wxr.config, kind, collections.defaultdict(int))
+        try:
+            with record_dependencies(wxr, text) as dependencies:
+                page_data = parse_fn(wxr, title, text)
+        finally:
+            stats = {}
+            for kind in STATS_KINDS:
+                stats[kind] = dict(getattr(wxr.config, kind))
+                for k, v in stats[kind].items():
+                    config_counts[kind][k] += v
+                setattr(wxr.config, kind, config_counts[kind])
+        dependencies = sorted(dependencies)
+        self.log_modules(wxr, dependencies)
+        module_log = module_count = None
+        if (
+            self.log_id is not None
+            and any_page_title(wxr.wtp, "Module") in dependencies
+        ):
+            module_log = self.log_id
+            module_count = len(self.logged_modules)
+        messages = {kind: getattr(wxr.wtp, kind) for kind in MESSAGE_KINDS}
+        self.pending.append(
+            (
+                title,
+                body_hash,
+                self.version,
+                json.dumps(dependencies, ensure_ascii=False),
+                self.dependencies_hash(wxr, dependencies, module_log),
+                json.dumps(page_data, ensure_ascii=False),
+                json.dumps(messages, ensure_ascii=False),
+                json.dumps(stats, ensure_ascii=False),
+                module_log,
+                module_count,
+            )
+        )
+        return page_data, dependencies
+
+    def commit(self) -> None:
+        if not self.pending and not self.pending_modules:
+            return
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO module_logs (log_id, seq, title, hash) "
+            "VALUES(?, ?, ?, ?)",
+            self.pending_modules,
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO pages (title, body_hash, version, "
+            "dependencies, dependencies_hash, data, messages, stats, "
+            "module_log, module_count) "
+            "VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            self.pending,
+        )
+        self.conn.commit()
+        self.pending = []
+        self.pending_modules = []
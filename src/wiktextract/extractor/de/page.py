@@ -1,4 +1,3 @@
-import copy
 import logging
 from collections import defaultdict
 from typing import Dict, List, Union
@@ -6,7 +5,7 @@ from typing import Dict, List, Union
 from wikitextprocessor import NodeKind, WikiNode
 from wikitextprocessor.parser import LevelNode
 
-from wiktextract.datautils import append_base_data
+from wiktextract.datautils import append_base_data, copy_base_data
 from wiktextract.wxr_context import WiktextractContext
 
 from .gloss import extract_glosses
@@ -344,7 +343,7 @@ def parse_page(
                         "word": wxr.wtp.title,
                     },
                 )
-                page_data.append(copy.deepcopy(base_data))
+                page_data.append(copy_base_data(base_data))
                 parse_section(wxr, page_data, base_data, level2_node.children)
 
     return page_data
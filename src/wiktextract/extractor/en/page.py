@@ -698,6 +698,56 @@ def init_head_tag_re(wxr):
             r")(-|/|\+|$)")
 
 
+def merge_base(wxr, data, base):
+    """Merges the part-of-speech, etymology or language level data ``base``
+    into the word entry ``data``.  The same etymology and language level
+    data is merged into several entries, so instead of copying all of it
+    into each entry, the entries share it: the lists and dicts directly
+    under ``base`` are copied, so that adding to them in one entry does not
+    change the others, but their items are shared.  The shared items must
+    not be modified after merging; copy them instead (see
+    complementary_pop() below)."""
+    for k, v in base.items():
+        if k not in data:
+            if isinstance(v, (list, dict)):
+                v = v.copy()
+            data[k] = v
+            continue
+        if data[k] == v:
+            continue
+        if (isinstance(data[k], (list, tuple)) or
+                   isinstance(v, (list, tuple))):
+            data[k] = list(data[k]) + list(v)
+        elif data[k] != v:
+            wxr.wtp.warning("conflicting values for {} in merge_base: "
+                        "{!r} vs {!r}"
+                        .format(k, data[k], v),
+                        sortid="page/904")
+
+    def complementary_pop(pron, key):
+        """Remove unnecessary keys from dict values
+        in a list comprehension..."""
+        if key in pron:
+            # The dict may be shared with other entries
+            pron = pron.copy()
+            pron.pop(key)
+        return pron
+
+    # If the result has sounds, eliminate sounds that have a prefix that
+    # does not match "word" or one of "forms"
+    if "sounds" in data and "word" in data:
+        accepted = [data["word"]]
+        accepted.extend(f["form"] for f in data.get("forms", ()))
+        data["sounds"] = list(complementary_pop(s, "pos")
+                              for s in data["sounds"]
+                              if "form" not in s or s["form"] in accepted)
+    # If the result has sounds, eliminate sounds that have a pos that
+    # does not match "pos"
+    if "sounds" in data and "pos" in data:
+        data["sounds"] = list(s for s in data["sounds"]
+                              if "pos" not in s or s["pos"] == data["pos"])
+
+
 def parse_language(wxr, langnode, language, lang_code):
     """Iterates over the text of the page, returning words (parts-of-speech)
     defined on the page one at a time.  (Individual word senses for the
@@ -738,47 +788,6 @@ def parse_language(wxr, langnode, language, lang_code):
     have_etym = False
     stack = []
 
-    def merge_base(data, base):
-        for k, v in base.items():
-            # Copy the value to ensure that we don't share lists or
-            # dicts between structures (even nested ones).
-            v = copy.deepcopy(v)
-            if k not in data:
-                # The list was copied above, so this will not create shared ref
-                data[k] = v
-                continue
-            if data[k] == v:
-                continue
-            if (isinstance(data[k], (list, tuple)) or
-                       isinstance(v, (list, tuple))):
-                data[k] = list(data[k]) + list(v)
-            elif data[k] != v:
-                wxr.wtp.warning("conflicting values for {} in merge_base: "
-                            "{!r} vs {!r}"
-                            .format(k, data[k], v),
-                            sortid="page/904")
-
-        def complementary_pop(pron, key):
-            """Remove unnecessary keys from dict values
-            in a list comprehension..."""
-            if key in pron:
-                pron.pop(key)
-            return pron
-
-        # If the result has sounds, eliminate sounds that have a prefix that
-        # does not match "word" or one of "forms"
-        if "sounds" in data and "word" in data:
-            accepted = [data["word"]]
-            accepted.extend(f["form"] for f in data.get("forms", ()))
-            data["sounds"] = list(complementary_pop(s, "pos")
-                                  for s in data["sounds"]
-                                  if "form" not in s or s["form"] in accepted)
-        # If the result has sounds, eliminate sounds that have a pos that
-        # does not match "pos"
-        if "sounds" in data and "pos" in data:
-            data["sounds"] = list(s for s in data["sounds"]
-                                  if "pos" not in s or s["pos"] == data["pos"])
-
     def push_sense():
         """Starts collecting data for a new word sense.  This returns True
         if a sense was added."""
@@ -822,7 +831,7 @@ def parse_language(wxr, langnode, language, lang_code):
         push_sense()
         if wxr.wtp.subsection:
             data = {"senses": pos_datas}
-            merge_base(data, pos_data)
+            merge_base(wxr, data, pos_data)
             etym_datas.append(data)
         pos_data = {}
         pos_datas = []
@@ -836,7 +845,7 @@ def parse_language(wxr, langnode, language, lang_code):
         have_etym = True
         push_pos()
         for data in etym_datas:
-            merge_base(data, etym_data)
+            merge_base(wxr, data, etym_data)
             page_datas.append(data)
         etym_data = {}
         etym_datas = []
@@ -3275,7 +3284,7 @@ def parse_language(wxr, langnode, language, lang_code):
     push_etym()
     ret = []
     for data in page_datas:
-        merge_base(data, base_data)
+        merge_base(wxr, data, base_data)
         ret.append(data)
 
     # Copy all tags to word senses
@@ -3352,6 +3361,17 @@ def parse_top_template(wxr, node, data):
     clean_node(wxr, None, [node], template_fn=top_template_fn)
 
 
+# Matches a subtitle line; group 2 is the subtitle text
+subtitle_re = re.compile(r"(?m)^(==+)[ \t]*([^= \t]([^=\n]|=[^=])*?)"
+                         r"[ \t]*(==+)[ \t]*$")
+
+
+def strip_subtitle_link(title: str) -> str:
+    """Removes Wikilink brackets around a subtitle, e.g. ==[[English]]==."""
+    title = re.sub(r"^\[\[", "", title)
+    return re.sub(r"\]\]$", "", title)
+
+
 def fix_subtitle_hierarchy(wxr: WiktextractContext, text: str) -> str:
     """Fix subtitle hierarchy to be strict Language -> Etymology ->
     Part-of-Speech -> Translation/Linkage."""
@@ -3360,9 +3380,7 @@ def fix_subtitle_hierarchy(wxr: WiktextractContext, text: str) -> str:
     # Known lowercase PoS names are in part_of_speech_map
     # Known lowercase linkage section names are in linkage_map
 
-    old = re.split(r"(?m)^(==+)[ \t]*([^= \t]([^=\n]|=[^=])*?)"
-                     r"[ \t]*(==+)[ \t]*$",
-                     text)
+    old = re.split(subtitle_re, text)
 
     parts = []
     npar = 4  # Number of parentheses in above expression
@@ -3371,8 +3389,7 @@ def fix_subtitle_hierarchy(wxr: WiktextractContext, text: str) -> str:
         left = old[i]
         right = old[i + npar - 1]
         # remove Wikilinks in title
-        title = re.sub(r"^\[\[", "", old[i + 1])
-        title = re.sub(r"\]\]$", "", title)
+        title = strip_subtitle_link(old[i + 1])
         level = len(left)
         part = old[i + npar]
         if level != len(right):
@@ -3428,6 +3445,34 @@ def fix_subtitle_hierarchy(wxr: WiktextractContext, text: str) -> str:
     return text
 
 
+def remove_uncaptured_languages(wxr: WiktextractContext, text: str) -> str:
+    """Removes the sections of languages that are not in
+    ``capture_language_codes`` from the page text, so that they are never
+    pre-expanded or parsed.  The sections are split at the same language
+    subtitles that fix_subtitle_hierarchy() moves to level 2.  Any text
+    before the first language subtitle (e.g., top-level templates) is
+    kept."""
+    capture_language_codes = wxr.config.capture_language_codes
+    if not capture_language_codes:
+        return text
+
+    parts = []
+    start = 0
+    keep = True
+    for m in re.finditer(subtitle_re, text):
+        title = strip_subtitle_link(m.group(2))
+        lang_code = wxr.config.LANGUAGES_BY_NAME.get(title)
+        if lang_code is None:
+            continue
+        if keep:
+            parts.append(text[start:m.start()])
+        start = m.start()
+        keep = lang_code in capture_language_codes
+    if keep:
+        parts.append(text[start:])
+    return "".join(parts)
+
+
 def parse_page(
     wxr: WiktextractContext, word: str, text: str
 ) -> List[Dict[str, str]]:
@@ -3448,6 +3493,12 @@ def parse_page(
     text = re.sub(r"(?si)<\s*(/\s*)?onlyinclude\s*>", "", text)
     text = re.sub(r"(?si)<\s*(/\s*)?includeonly\s*>", "", text)
 
+    # Drop the sections of languages that we are not going to extract
+    # before doing anything else with the text.  Pages like "a" have well
+    # over a hundred languages, and pre-expanding all of them when only
+    # one or two are captured is a waste of time.
+    text = remove_uncaptured_languages(wxr, text)
+
     # Fix up the subtitle hierarchy.  There are hundreds if not thousands of
     # pages that have, for example, Translations section under Linkage, or
     # Translations section on the same level as Noun.  Enforce a proper
@@ -3563,9 +3614,12 @@ def parse_page(
         # Add topics from the last sense of a language to its other senses,
         # marking them inaccurate as they may apply to all or some sense
         if len(lang_datas) > 1:
-            topics = lang_datas[-1].get("topics", [])
-            for t in topics:
-                t["inaccurate"] = True
+            # The topics are copied because merge_base() shares them
+            # between entries
+            topics = [dict(t, inaccurate=True)
+                      for t in lang_datas[-1].get("topics", [])]
+            if topics:
+                lang_datas[-1]["topics"] = topics
             for data in lang_datas[:-1]:
                 new_topics = data.get("topics", []) + topics
                 if new_topics:
@@ -1,4 +1,3 @@
-import copy
 import logging
 from collections import defaultdict
 from typing import Dict, List, Optional
@@ -6,7 +5,7 @@ from typing import Dict, List, Optional
 from wikitextprocessor import NodeKind, WikiNode
 from wikitextprocessor.parser import TemplateNode
 
-from wiktextract.datautils import append_base_data
+from wiktextract.datautils import append_base_data, copy_base_data
 from wiktextract.page import LEVEL_KINDS, clean_node
 from wiktextract.wxr_context import WiktextractContext
 
@@ -181,7 +180,7 @@ def parse_page(
                     },
                 )
                 base_data.update(categories_and_links)
-                page_data.append(copy.deepcopy(base_data))
+                page_data.append(copy_base_data(base_data))
                 etymology_data: Optional[EtymologyData] = None
                 for level3_node in level2_node.find_child(NodeKind.LEVEL3):
                     new_etymology_data = parse_section(
@@ -161,11 +161,11 @@ def extract_saurus_template(
     and "zh-ant-saurus". These templates get data from thesaurus pages, search
     the thesaurus database to avoid parse these pages again.
     """
-    from wiktextract.thesaurus import search_thesaurus
+    from wiktextract.thesaurus import lookup_thesaurus
 
     thesaurus_page_title = node.template_parameters.get(1)
-    for thesaurus in search_thesaurus(
-        wxr.thesaurus_db_conn,
+    for thesaurus in lookup_thesaurus(
+        wxr,
         thesaurus_page_title,
         page_data[-1].get("lang_code"),
         page_data[-1].get("pos"),
@@ -1,4 +1,3 @@
-import copy
 import logging
 import re
 from collections import defaultdict
@@ -6,7 +5,7 @@ from typing import Dict, List, Union
 
 from wikitextprocessor import NodeKind, WikiNode
 
-from wiktextract.datautils import append_base_data
+from wiktextract.datautils import append_base_data, copy_base_data
 from wiktextract.page import LEVEL_KINDS, clean_node
 from wiktextract.wxr_context import WiktextractContext
 
@@ -227,7 +226,7 @@ def parse_page(
             {"lang": lang_name, "lang_code": lang_code, "word": wxr.wtp.title},
         )
         base_data.update(categories_and_links)
-        page_data.append(copy.deepcopy(base_data))
+        page_data.append(copy_base_data(base_data))
         parse_section(wxr, page_data, base_data, level2_node.children)
 
     return page_data
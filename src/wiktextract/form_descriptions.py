@@ -6,11 +6,14 @@
 
 import re
 import functools
+import itertools
 import unicodedata
 import Levenshtein
-from nltk import TweetTokenizer
 from wiktextract.wxr_context import WiktextractContext
+from .char_classes import (char_class_table, SCRIPT_MASK, LATIN, GREEK,
+                           COMBINING, NON_LATIN, ROMANIZATION_OK)
 from .datautils import data_append, data_extend, split_at_comma_semi
+from .description_cache import persistent_cache
 from .taxondata import known_species, known_firsts
 from .topics import valid_topics, topic_generalize_map
 from .tags import (xlat_head_map, valid_tags, form_of_tags, alt_of_tags,
@@ -19,10 +22,13 @@ from .tags import (xlat_head_map, valid_tags, form_of_tags, alt_of_tags,
                    head_final_bantu_langs, head_final_bantu_map,
                    head_final_semitic_langs, head_final_semitic_map,
                    head_final_other_langs, head_final_other_map)
-from .english_words import english_words, not_english_words
+from .english_words import get_english_words
+from .english_classifier import is_english_token, tokenize
+from .table_cache import cached_table
 from typing import (
     Any,
     Dict,
+    Iterator,
     List,
     Optional,
     Set,
@@ -30,9 +36,6 @@ from typing import (
     Union,
 )
 
-# Tokenizer for classify_desc()
-tokenizer = TweetTokenizer()
-
 # These are ignored as the value of a related form in form head.
 IGNORED_RELATED = set([
     "-", "־", "᠆", "‐", "‑", "‒", "–", "—", "―", "−",
@@ -75,103 +78,23 @@ known_firsts.update([
 # positives
 known_firsts = known_firsts - set(["The"])
 
-# First words of unicodedata.name() that indicate scripts that cannot be
-# accepted in romanizations or english (i.e., should be considered "other"
-# in classify_desc()).
-non_latin_scripts = [
-    "ADLAM",
-    "ARABIC",
-    "ARABIC-INDIC",
-    "ARMENIAN",
-    "BALINESE",
-    "BENGALI",
-    "BRAHMI",
-    "BRAILLE",
-    "CANADIAN",
-    "CHAKMA",
-    "CHAM",
-    "CHEROKEE",
-    "CJK",
-    "COPTIC",
-    "COUNTING ROD",
-    "CUNEIFORM",
-    "CYRILLIC",
-    "DOUBLE-STRUCK",
-    "EGYPTIAN",
-    "ETHIOPIC",
-    "EXTENDED ARABIC-INDIC",
-    "GEORGIAN",
-    "GLAGOLITIC",
-    "GOTHIC",
-    "GREEK",
-    "GUJARATI",
-    "GURMUKHI",
-    "HANGUL",
-    "HANIFI ROHINGYA",
-    "HEBREW",
-    "HIRAGANA",
-    "JAVANESE",
-    "KANNADA",
-    "KATAKANA",
-    "KAYAH LI",
-    "KHMER",
-    "KHUDAWADI",
-    "LAO",
-    "LEPCHA",
-    "LIMBU",
-    "MALAYALAM",
-    "MEETEI",
-    "MYANMAR",
-    "NEW TAI LUE",
-    "NKO",
-    "OL CHIKI",
-    "OLD PERSIAN",
-    "OLD SOUTH ARABIAN",
-    "ORIYA",
-    "OSMANYA",
-    "PHOENICIAN",
-    "SAURASHTRA",
-    "SHARADA",
-    "SINHALA",
-    "SUNDANESE",
-    "SYLOTI",
-    "TAI THAM",
-    "TAKRI",
-    "TAMIL",
-    "TELUGU",
-    "THAANA",
-    "THAI",
-    "TIBETAN",
-    "TIFINAGH",
-    "TIRHUTA",
-    "UGARITIC",
-    "WARANG CITI",
-    "YI",
-]
-non_latin_scripts_re = re.compile(
-    r"(" +
-    r"|".join(re.escape(x) for x in non_latin_scripts) +
-    r")\b")
-
-# Sanity check xlat_head_map values
-for k, v in xlat_head_map.items():
-    if v.startswith("?"):
-        v = v[1:]
-    for tag in v.split():
-        if tag not in valid_tags:
-            print("WARNING: xlat_head_map[{}] contains unrecognized tag {}"
-                  .format(k, tag))
-
-# Regexp for finding nested translations from translation items (these are
-# used in, e.g., year/English/Translations/Arabic).  This is actually used
-# in page.py.
-nested_translations_re = re.compile(
-    r"\s+\((({}): ([^()]|\([^()]+\))+)\)"
-    .format("|".join(re.escape(x.removeprefix("?"))
-                     for x in sorted(xlat_head_map.values(),
-                                     key=lambda x: len(x),
-                                     reverse=True)
-                     if x and not x.startswith("class-"))))
+# The largest regexps below are built from the tag tables and compiled when
+# they are first used, so that importing this module does not compile them.
+
+
+@functools.lru_cache(maxsize=None)
+def get_nested_translations_re() -> re.Pattern:
+    """Returns the regexp for finding nested translations from translation
+    items (these are used in, e.g., year/English/Translations/Arabic).
+    This is actually used in translations.py."""
+    return re.compile(
+        r"\s+\((({}): ([^()]|\([^()]+\))+)\)"
+        .format("|".join(re.escape(x.removeprefix("?"))
+                         for x in sorted(xlat_head_map.values(),
+                                         key=lambda x: len(x),
+                                         reverse=True)
+                         if x and not x.startswith("class-"))))
+
 
 # Regexp that matches head tag specifiers.  Used to match tags from end of
 # translations and linkages
@@ -181,7 +104,12 @@ head_final_re_text = r"( -)?( ({}))+".format(
              # the regexp match
              sorted(xlat_head_map.keys(), key=lambda x: len(x),
                     reverse=True)))
-head_final_re = re.compile(head_final_re_text + "$")
+
+
+@functools.lru_cache(maxsize=None)
+def get_head_final_re() -> re.Pattern:
+    return re.compile(head_final_re_text + "$")
+
 
 # Regexp used to match head tag specifiers at end of a form for certain
 # Bantu languages (particularly Swahili and similar languages).
@@ -209,11 +137,15 @@ head_split_re_text = ("(" + head_final_re_text +
                       "|" + head_final_bantu_re_text +
                       "|" + head_final_semitic_re_text +
                       "|" + head_final_other_re_text + ")?( or |[,;]+)")
-head_split_re = re.compile(head_split_re_text)
 head_split_re_parens = 0
 for m in re.finditer(r"(^|[^\\])[(]+", head_split_re_text):
     head_split_re_parens += m.group(0).count("(")
 
+
+@functools.lru_cache(maxsize=None)
+def get_head_split_re() -> re.Pattern:
+    return re.compile(head_split_re_text)
+
 # Parenthesized parts that are ignored in translations
 tr_ignored_parens = set([
     "please verify",
@@ -311,7 +243,7 @@ ok_suspicious_forms = set([
 
 
 # Replacements to be done in classify_desc before tokenizing.  This is a
-# workaround for shortcomings in TweetTokenizer.
+# workaround for shortcomings in the tokenizer.
 tokenizer_fixup_map = {
     r"a.m.": "AM",
     r"p.m.": "PM",
@@ -704,14 +636,14 @@ def add_to_valid_tree1(
     assert v is None or isinstance(v, (list, tuple, str))
     assert isinstance(valid_values, (set, dict))
     if not v:
-        add_to_valid_tree(valid_sequences, k, None)
+        add_to_valid_tree(tree, k, None)
         return []
     elif isinstance(v, str):
         v = [v]
     q = []
     for vv in v:
         assert isinstance(vv, str)
-        add_to_valid_tree(valid_sequences, k, vv)
+        add_to_valid_tree(tree, k, vv)
         vvs = vv.split()
         for x in vvs:
             q.append(x)
@@ -750,59 +682,126 @@ def add_to_valid_tree_mapping(
                 q.extend(qq)
 
 
-# Tree of sequences considered to be tags (includes sequences that are
-# mapped to something that becomes one or more valid tags)
-valid_sequences = ValidNode()
-sequences_with_slashes: Set[str] = set()
-for tag in valid_tags:
-    # The basic tags used in our tag system; some are a bit weird, but easier
-    # to implement this with 'false' positives than filter out stuff no one else
-    # uses.
-    if "/" in tag:
-        sequences_with_slashes.add(tag)
-    add_to_valid_tree(valid_sequences, tag, tag)
+# The tags and topics before the hyphenated forms below are added to them
+base_valid_tags = tuple(valid_tags)
+base_valid_topics = tuple(valid_topics)
+# Might as well, while we're here: Add hyphenated location tags.
 for tag in uppercase_tags:
     hyphenated = re.sub(r"\s+", "-", tag)
-    if hyphenated in valid_tags:
-        print("DUPLICATE TAG: {} (from uppercase tag {!r})"
-              .format(hyphenated, tag))
-    assert hyphenated not in valid_tags
-    # Might as well, while we're here: Add hyphenated location tag.
     valid_tags[hyphenated] = "dialect"
-    add_to_valid_tree(valid_sequences, hyphenated, hyphenated)
-for tag in uppercase_tags:
-    hyphenated = re.sub(r"\s+", "-", tag)
-    # XXX Move to above loop? Or is this here for readability?
-    if "/" in tag:
-        sequences_with_slashes.add(tag)
-    add_to_valid_tree(valid_sequences, tag, hyphenated)
-# xlat_tags_map!
-add_to_valid_tree_mapping(valid_sequences, xlat_tags_map, valid_tags, False)
-for k in xlat_tags_map:
-    if "/" in k:
-        sequences_with_slashes.add(k)
-# Add topics to the same table, with all generalized topics also added
-for topic in valid_topics:
-    assert " " not in topic
-    if "/" in topic:
-        sequences_with_slashes.add(topic)
-    add_to_valid_tree(valid_sequences, topic, topic)
 # Let each original topic value stand alone.  These are not generally on
 # valid_topics.  We add the original topics with spaces replaced by hyphens.
 for topic in topic_generalize_map.keys():
-    hyphenated = topic.replace(" ", "-")
-    valid_topics.add(hyphenated)
-    if "/" in topic:
-        sequences_with_slashes.add(tag)
-    add_to_valid_tree(valid_sequences, topic, hyphenated)
-# Add canonicalized/generalized topic values
-add_to_valid_tree_mapping(valid_sequences, topic_generalize_map,
-                          valid_topics, True)
-
-# Regex used to divide a decode candidate into parts that shouldn't
-# have their slashes turned into spaces
-slashes_re = re.compile(r"(" + "|"
-                .join((re.escape(s) for s in sequences_with_slashes)) + r")")
+    valid_topics.add(topic.replace(" ", "-"))
+
+
+def build_valid_sequences() -> ValidNode:
+    """Builds the tree of sequences considered to be tags (includes
+    sequences that are mapped to something that becomes one or more valid
+    tags)."""
+    tree = ValidNode()
+    for tag in base_valid_tags:
+        # The basic tags used in our tag system; some are a bit weird, but
+        # easier to implement this with 'false' positives than filter out
+        # stuff no one else uses.
+        add_to_valid_tree(tree, tag, tag)
+    for tag in uppercase_tags:
+        hyphenated = re.sub(r"\s+", "-", tag)
+        add_to_valid_tree(tree, hyphenated, hyphenated)
+    for tag in uppercase_tags:
+        hyphenated = re.sub(r"\s+", "-", tag)
+        add_to_valid_tree(tree, tag, hyphenated)
+    # xlat_tags_map!
+    add_to_valid_tree_mapping(tree, xlat_tags_map, valid_tags, False)
+    # Add topics to the same table, with all generalized topics also added
+    for topic in base_valid_topics:
+        add_to_valid_tree(tree, topic, topic)
+    for topic in topic_generalize_map.keys():
+        hyphenated = topic.replace(" ", "-")
+        add_to_valid_tree(tree, topic, hyphenated)
+    # Add canonicalized/generalized topic values
+    add_to_valid_tree_mapping(tree, topic_generalize_map, valid_topics, True)
+    return tree
+
+
+def valid_tree_to_data(tree: ValidNode) -> Tuple[Tuple, ...]:
+    """Converts a tree of ValidNodes to tuples that can be serialized with
+    the marshal module.  The nodes are numbered in breadth-first order, and
+    the children of all nodes are listed one node after another."""
+    nodes = [tree]
+    for node in nodes:
+        nodes.extend(node.children.values())
+    node_ids = {id(node): i for i, node in enumerate(nodes)}
+    return (tuple(node.end for node in nodes),
+            tuple(tuple(node.tags) for node in nodes),
+            tuple(tuple(node.topics) for node in nodes),
+            tuple(len(node.children) for node in nodes),
+            tuple(w for node in nodes for w in node.children),
+            tuple(node_ids[id(child)] for node in nodes
+                  for child in node.children.values()))
+
+
+def valid_tree_from_data(data: Tuple[Tuple, ...]) -> ValidNode:
+    """Rebuilds a tree of ValidNodes from valid_tree_to_data() output."""
+    ends, tags, topics, num_children, words, child_ids = data
+    nodes = [ValidNode() for _ in ends]
+    children = [nodes[i] for i in child_ids]
+    pos = 0
+    for node, end, node_tags, node_topics, n in zip(
+            nodes, ends, tags, topics, num_children):
+        node.end = end
+        if node_tags:
+            node.tags = list(node_tags)
+        if node_topics:
+            node.topics = list(node_topics)
+        if n:
+            node.children = dict(zip(words[pos:pos + n],
+                                     children[pos:pos + n]))
+            pos += n
+    return nodes[0]
+
+
+@functools.lru_cache(maxsize=None)
+def get_valid_sequences() -> ValidNode:
+    """Returns the tree of valid tag and topic sequences.  It is built on
+    first use and cached on disk (see table_cache.py)."""
+    data = cached_table(
+        "valid_sequences",
+        ("tags.py", "topics.py", "form_descriptions.py"),
+        lambda: valid_tree_to_data(build_valid_sequences()))
+    return valid_tree_from_data(data)
+
+
+@functools.lru_cache(maxsize=None)
+def get_slashes_re() -> re.Pattern:
+    """Returns the regex used to divide a decode candidate into parts that
+    shouldn't have their slashes turned into spaces."""
+    sequences_with_slashes = set(
+        x for x in itertools.chain(base_valid_tags, uppercase_tags,
+                                   xlat_tags_map, base_valid_topics,
+                                   topic_generalize_map)
+        if "/" in x)
+    return re.compile(r"(" + "|"
+                      .join((re.escape(s) for s in sequences_with_slashes)) +
+                      r")")
+
+
+# Tables that used to be built when this module was imported
+lazy_tables = {
+    "valid_sequences": get_valid_sequences,
+    "slashes_re": get_slashes_re,
+    "nested_translations_re": get_nested_translations_re,
+    "head_final_re": get_head_final_re,
+    "head_split_re": get_head_split_re,
+}
+
+
+def __getattr__(name: str):
+    # The tables above are built when they are first accessed
+    if name in lazy_tables:
+        return lazy_tables[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # Regexp used to find "words" from word heads and linguistic descriptions
 word_re = re.compile(r"[^ ,;()\u200e]+|"
@@ -845,6 +844,89 @@ def map_with(ht, lst):
 TagList = List[str]
 PosPathStep = Tuple[int, TagList, TagList]
 
+
+class TagPath():
+    """Path through the lattice of word positions built by decode_tags1().
+    A path is linked backwards from its newest step to the path it
+    extends, so that extending a path shares the earlier steps instead of
+    copying them.  The weight of a path (its length, plus 100 if it has
+    UNKNOWN steps) is computed once for each step.  Paths compare like
+    the lists of steps (newest first) they used to be stored as, which
+    keeps the tie-breaking between equally weighted paths unchanged.
+    Extending a path twice with the same step gives the same object, so
+    that comparing duplicate paths stops where they start to share
+    steps."""
+    __slots__ = (
+                  "step",
+                  "prev",
+                  "weight",
+                  "unknown",
+                  "next",
+                )
+
+    def __init__(self,
+                 step: Optional[PosPathStep] = None,
+                 prev: Optional["TagPath"] = None):
+        self.step = step
+        self.prev = prev
+        if prev is None:
+            # The empty path
+            self.weight = 0
+            self.unknown = False
+        elif prev.unknown or step[1] != ["UNKNOWN"]:
+            self.weight = prev.weight + 1
+            self.unknown = prev.unknown
+        else:
+            self.weight = prev.weight + 101  # Penalize unknown paths
+            self.unknown = True
+        # Paths extending this one, by the position and the identities of
+        # the tag and topic lists of their newest step
+        self.next: Optional[Dict[Tuple[int, int, int], "TagPath"]] = None
+
+    def add(self, step: PosPathStep) -> "TagPath":
+        """Returns the path ``[step] + self``."""
+        key = (step[0], id(step[1]), id(step[2]))
+        if self.next is None:
+            self.next = {}
+        else:
+            path = self.next.get(key)
+            if path is not None:
+                return path
+        path = TagPath(step, self)
+        self.next[key] = path
+        return path
+
+    def extend(self, steps: List[PosPathStep]) -> "TagPath":
+        """Returns the path ``steps + self``."""
+        path = self
+        for step in reversed(steps):
+            path = path.add(step)
+        return path
+
+    def steps(self) -> Iterator[PosPathStep]:
+        """Yields the steps of the path, newest first."""
+        path = self
+        while path.prev is not None:
+            yield path.step
+            path = path.prev
+
+    def sort_key(self) -> Tuple[int, "TagPath"]:
+        return self.weight, self
+
+    def __lt__(self, other: "TagPath") -> bool:
+        a, b = self, other
+        # Paths that share their remaining steps are equal from there on
+        while a is not b:
+            if b.prev is None:
+                return False
+            if a.prev is None:
+                return True
+            if a.step != b.step:
+                return a.step < b.step
+            a, b = a.prev, b.prev
+        return False
+
+
 def check_unknown(from_i: int,
                   to_i: int,
                   i:int,
@@ -891,9 +973,9 @@ def add_new1(
     i: int,
     start_i: int,
     last_i: int,
-    new_paths: List[List[PosPathStep]],
+    new_paths: List[TagPath],
     new_nodes: List[Tuple[ValidNode, int, int]],
-    pos_paths: List[List[List[PosPathStep]]],
+    pos_paths: List[List[TagPath]],
     wordlst: List[str],
     allow_any: bool,
     no_unknown_starts: bool,
@@ -917,20 +999,20 @@ def add_new1(
                         no_unknown_starts)
         # Create new paths candidates based on different past possible
         # paths; pos_path[last_i] contains possible paths, so add this
-        # new one at the beginning(?)
-        # The list comprehension inside the parens generates an iterable
-        # of lists, so this is .extend( [(last_i...)], [(last_i...)], ... )
-        # XXX: this is becoming impossible to annotate, nodes might
-        # need to become classed objects and not just dicts, or at least
-        # a TypedDict with a "children" node
-        new_paths.extend([(last_i,
-                           node.tags,
-                           node.topics)] + u + x
-                         for x in pos_paths[last_i])
+        # new one at the beginning.  The paths at last_i are shared, not
+        # copied.
+        step = (last_i, node.tags, node.topics)
+        if u:
+            new_paths.extend(x.extend(u).add(step)
+                             for x in pos_paths[last_i])
+        else:
+            new_paths.extend(x.add(step) for x in pos_paths[last_i])
         max_last_i = i + 1
     return max_last_i
 
 @functools.lru_cache(maxsize=65536)
+@persistent_cache("decode_tags",
+                  lambda v: ([tuple(ts) for ts in v[0]], v[1]))
 def decode_tags(
     src: str,
     allow_any=False,
@@ -947,7 +1029,7 @@ def decode_tags(
         # second entry, which contains the splitting group like "masculine/
         # feminine" style keys.
         if "/" in src:
-            split_parts = re.split(slashes_re, src)
+            split_parts = re.split(get_slashes_re(), src)
             new_parts: List[str] = []
             if len(split_parts) > 1:
                 for i, s in enumerate(split_parts):
@@ -1012,7 +1094,11 @@ def decode_tags1(
 
     # print("decode_tags: src={!r}".format(src))
 
-    pos_paths: List[List[List[PosPathStep]]] = [[[]]]
+    # Lattice of word positions: pos_paths[i] holds the best paths that
+    # decode the first i words, each linked back to a path in an earlier
+    # position.
+    empty_path = TagPath()
+    pos_paths: List[List[TagPath]] = [[empty_path]]
     wordlst: List[str] = []
     max_last_i = 0  # pre-initialized here so that it can be used as a ref
 
@@ -1027,6 +1113,7 @@ def decode_tags1(
     # First split the tags at commas and semicolons.  Their significance is that
     # a multi-word sequence cannot continue across them.
     parts = split_at_comma_semi(src, extra=[";", ":"])
+    roots = get_valid_sequences().children
 
     for part in parts:
         max_last_i = len(wordlst)  # "how far have we gone?"
@@ -1039,7 +1126,7 @@ def decode_tags1(
             i = len(pos_paths) - 1
             new_nodes: List[Tuple[ValidNode, int, int]] = []
                 # replacement nodes for next loop
-            new_paths: List[List[PosPathStep]] = []
+            new_paths: List[TagPath] = []
             # print("ITER i={} w={} max_last_i={} wordlst={}"
             #       .format(i, w, max_last_i, wordlst))
             node: ValidNode
@@ -1061,10 +1148,10 @@ def decode_tags1(
                 if node.end:
                 # we've hit an end point, the tags and topics have already been
                 # gathered at some point, don't do anything with the old stuff
-                    if w in valid_sequences.children:
+                    if w in roots:
                         # This starts a *new* possible section
                         max_last_i = add_new(
-                                        valid_sequences.children[w],  # root->
+                                        roots[w],  # root->
                                         i,
                                         i,
                                         i,
@@ -1078,10 +1165,10 @@ def decode_tags1(
                         no_unknown_starts or
                         wordlst[last_i] not in allowed_unknown_starts):
                         # print("NEW", w)
-                        if w in valid_sequences.children:
+                        if w in roots:
                             # Start new sequences here
                             max_last_i = add_new(
-                                            valid_sequences.children[w],
+                                            roots[w],
                                             i,
                                             i,
                                             last_i,
@@ -1098,10 +1185,10 @@ def decode_tags1(
                     wordlst[max_last_i] not in allowed_unknown_starts):
                     # print("RECOVER w={} i={} max_last_i={} wordlst={}"
                     #       .format(w, i, max_last_i, wordlst))
-                    if w in valid_sequences.children:
+                    if w in roots:
                         max_last_i = add_new(
                                         # new sequence from root
-                                        valid_sequences.children[w],
+                                        roots[w],
                                         i,
                                         i,
                                         max_last_i,
@@ -1121,14 +1208,9 @@ def decode_tags1(
             # This *can* cause bugs if it gets stuck in a local minimum
             # or something, but this whole process is one-dimensional
             # and not that complex, so hopefully it works out...
-            pw = []
-            path: List[PosPathStep]
-            for path in new_paths:
-                weight = len(path)
-                if any(x[1] == ["UNKNOWN"] for x in path):
-                    weight += 100  # Penalize unknown paths
-                pw.append((weight, path))
-            new_paths = [weightpath[1] for weightpath in sorted(pw)[:10]]
+            # The order of the paths kept does not matter.
+            if len(new_paths) > 10:
+                new_paths = sorted(new_paths, key=TagPath.sort_key)[:10]
             pos_paths.append(new_paths)
 
         # print("END max_last_i={} len(wordlst)={} len(pos_paths)={}"
@@ -1140,11 +1222,9 @@ def decode_tags1(
                 if node.end:
                     # print("$ END start_i={} last_i={}"
                     #       .format(start_i, last_i))
+                    step = (last_i, node.tags, node.topics)
                     for path in pos_paths[start_i]:
-                        pos_paths[-1].append([(last_i,
-                                               node.tags,
-                                               node.topics)] +
-                                             path)
+                        pos_paths[-1].append(path.add(step))
                 else:
                     # print("UNK END start_i={} last_i={} wordlst={}"
                     #       .format(start_i, last_i, wordlst))
@@ -1157,13 +1237,13 @@ def decode_tags1(
                             no_unknown_starts)
                     if pos_paths[start_i]:
                         for path in pos_paths[start_i]:
-                            pos_paths[-1].append(u + path)
+                            pos_paths[-1].append(path.extend(u))
                     else:
-                        pos_paths[-1].append(u)
+                        pos_paths[-1].append(empty_path.extend(u))
         else:
             # Check for a final unknown tag
             # print("NO END NODES max_last_i={}".format(max_last_i))
-            paths = pos_paths[max_last_i] or [[]]
+            paths = pos_paths[max_last_i] or [empty_path]
             u = check_unknown(
                             max_last_i,
                             len(wordlst),
@@ -1174,28 +1254,24 @@ def decode_tags1(
             if u:
                 # print("end max_last_i={}".format(max_last_i))
                 for path in list(paths):  # Copy in case it is the last pos
-                    pos_paths[-1].append(u + path)
+                    pos_paths[-1].append(path.extend(u))
 
     # import json
-    # print("POS_PATHS:", json.dumps(pos_paths, indent=2, sort_keys=True))
+    # print("POS_PATHS:", json.dumps([[list(path.steps()) for path in paths]
+    #                                  for paths in pos_paths],
+    #                                 indent=2, sort_keys=True))
 
     if not pos_paths[-1]:
         # print("decode_tags: {}: EMPTY POS_PATHS[-1]".format(src))
         return [], []
 
     # Find the best path
-    pw = []
-    for path in pos_paths[-1]:
-        weight = len(path)
-        if any(x[1] == ["UNKNOWN"] for x in path):
-            weight += 100  # Penalize unknown paths
-        pw.append((weight, path))
-    path = min(pw)[1]
+    best = min(pos_paths[-1], key=TagPath.sort_key)
 
     # Convert the best path to tagsets and topics
     tagsets: List[List[str]] = [[]]
     topics: List[str] = []
-    for i, tagspec, topicspec in path:
+    for i, tagspec, topicspec in best.steps():
         if len(tagsets or "") > 16:
             # ctx.error("Too many tagsets! This is probably exponential",
             #           sortid="form_descriptions/20230818")
@@ -1303,7 +1379,7 @@ def parse_head_final_tags(wxr, lang, form):
                 tags.extend(head_final_other_map[tagkeys].split(" "))
 
     # Handle normal head-final tags
-    m = re.search(head_final_re, form)
+    m = re.search(get_head_final_re(), form)
     if m is not None:
         tagkeys = m.group(3)
         # Only replace tags ending with numbers in languages that have
@@ -1712,10 +1788,10 @@ def parse_word_head(wxr, pos, text, data, is_reconstruction,
             if psplit == wxr.wtp.title:
                 splits.append(psplit)
             else:
-                splits.extend(re.split(head_split_re, psplit))
+                splits.extend(re.split(get_head_split_re(), psplit))
     else:
         # Do the normal split; previous only-behavior.
-        splits = re.split(head_split_re, base)
+        splits = re.split(get_head_split_re(), base)
     # print("SPLITS:", splits)
     alts = []
     # print("parse_word_head: splits:", splits,
@@ -2578,7 +2654,7 @@ def parse_alt_or_inflection_of1(wxr, gloss, gloss_template_args):
     lst = base.split()
     # print("parse_alt_or_inflection_of: lst={}".format(lst))
     if len(lst) >= 3 and lst[-1] in ("case", "case."):
-        node = valid_sequences.children.get(lst[-2])
+        node = get_valid_sequences().children.get(lst[-2])
         if node and node.end:
             for t in node.tags:
                 tags.extend(t.split(" "))
@@ -2615,13 +2691,13 @@ def parse_alt_or_inflection_of1(wxr, gloss, gloss_template_args):
     base = base.strip()
     if base.endswith(",") and len(base) > 2:
         base = base[:-1].strip()
-    while (base.endswith(".") and not wxr.wtp.page_exists(base) and
+    while (base.endswith(".") and not wxr.page_exists(base) and
            base not in gloss_template_args):
         base = base[:-1].strip()
     if base.endswith("(\u201cconjecture\")"):
         base = base[:-14].strip()
         tags.append("conjecture")
-    while (base.endswith(".") and not wxr.wtp.page_exists(base) and
+    while (base.endswith(".") and not wxr.page_exists(base) and
            base not in gloss_template_args):
         base = base[:-1].strip()
     if (base.endswith(".") and base not in gloss_template_args and
@@ -2658,7 +2734,7 @@ def parse_alt_or_inflection_of1(wxr, gloss, gloss_template_args):
     for p in parts:
         # Check for some suspicious base forms
         m = re.search(r"[.,] |[{}()]", p)
-        if m and not wxr.wtp.page_exists(p):
+        if m and not wxr.page_exists(p):
             wxr.wtp.debug("suspicious alt_of/form_of with {!r}: {}"
                       .format(m.group(0), p),
                       sortid="form_descriptions/2278")
@@ -2674,6 +2750,7 @@ def parse_alt_or_inflection_of1(wxr, gloss, gloss_template_args):
 
 
 @functools.lru_cache(maxsize=65536)
+@persistent_cache("classify_desc")
 def classify_desc(desc, allow_unknown_tags=False, no_unknown_starts=False):
     """Determines whether the given description is most likely tags, english,
     a romanization, or something else.  Returns one of: "tags", "english",
@@ -2700,6 +2777,7 @@ def classify_desc(desc, allow_unknown_tags=False, no_unknown_starts=False):
     # Check if it looks like the taxonomic name of a species
     if desc in known_species:
         return "taxonomic"
+    english_words = get_english_words()
     desc1 = re.sub(r"^×([A-Z])", r"\1", desc)
     desc1 = re.sub(r"\s*×.*", "", desc1)
     lst = desc1.split()
@@ -2727,40 +2805,10 @@ def classify_desc(desc, allow_unknown_tags=False, no_unknown_starts=False):
             return "english"   # Handles ones containing whitespace
         desc1 = re.sub(tokenizer_fixup_re,
                        lambda m: tokenizer_fixup_map[m.group(0)], desc)
-        tokens = tokenizer.tokenize(desc1)
+        tokens = tokenize(desc1)
         if not tokens:
             return "other"
-        lst = list(x not in not_english_words and
-                   # not x.isdigit() and
-                   (x in english_words or x.lower() in english_words or
-                    x in known_firsts or
-                    x[0].isdigit() or
-                    # (x[0].isupper() and x.find("-") < 0 and x.isascii()) or
-                   (x.endswith("s") and len(x) >= 4 and
-                    x[:-1] in english_words) or  # Plural
-                    (x.endswith("ies") and len(x) >= 5 and
-                     x[:-3] + "y" in english_words) or  # E.g. lily - lilies
-                    (x.endswith("ing") and len(x) >= 5 and
-                     x[:-3] in english_words) or  # E.g. bring - bringing
-                    (x.endswith("ing") and len(x) >= 5 and
-                     x[:-3] + "e" in english_words) or  # E.g., tone - toning
-                    (x.endswith("ed") and len(x) >= 5 and
-                     x[:-2] in english_words) or   # E.g. hang - hanged
-                    (x.endswith("ed") and len(x) >= 5 and
-                     x[:-2] + "e" in english_words) or  # E.g. atone - atoned
-                    (x.endswith("'s") and x[:-2] in english_words) or
-                    (x.endswith("s'") and x[:-2] in english_words) or
-                    (x.endswith("ise") and len(x) >= 5 and
-                     x[:-3] + "ize" in english_words) or
-                    (x.endswith("ised") and len(x) >= 6 and
-                     x[:-4] + "ized" in english_words) or
-                    (x.endswith("ising") and len(x) >= 7 and
-                     x[:-5] + "izing" in english_words) or
-                    (re.search(r"[-/]", x) and
-                     all(((y in english_words and len(y) > 2)
-                          or not y)
-                         for y in re.split(r"[-/]", x))))
-                   for x in tokens)
+        lst = list(is_english_token(x) for x in tokens)
         cnt = lst.count(True)
         if (any(lst[i] and x[0].isalpha() and len(x) > 1
                 for i, x in enumerate(tokens)) and
@@ -2779,55 +2827,30 @@ def classify_desc(desc, allow_unknown_tags=False, no_unknown_starts=False):
         return "romanization"
     # If all characters are in classes that could occur in romanizations,
     # treat as romanization
-    classes = list(unicodedata.category(x)
-                   if x not in ("-", ",", ":", "/", '"') else "OK"
-                   for x in normalized_desc)
+    char_classes = char_class_table()
     classes1 = []
     num_latin = 0
     num_greek = 0
     # part = ""
-    # for ch, cl in zip(normalized_desc, classes):
-    #     part += f"{ch}({cl})"
+    # for ch in normalized_desc:
+    #     part += f"{ch}({unicodedata.category(ch)})"
     # print(part)
-    for ch, cl in zip(normalized_desc, classes):
-        if ch in ("'",  # ' in Arabic, / in IPA-like parenthesized forms
-                  ".",  # e.g., "..." in translations
-                  ";",
-                  ":",
-                  "!",
-                  "‘",
-                  "’",
-                  '"',
-                  '“',
-                  '”',
-                  "/",
-                  "?",
-                  "…",  # alternative to "..."
-                  "⁉",  # 見る/Japanese automatic transcriptions...
-                  "？",
-                  "！",
-                  "⁻",  # superscript -, used in some Cantonese roman, e.g. "we"
-                  "ʔ",
-                  "ʼ",
-                  "ʾ",
-                  "ʹ"):  # ʹ e.g. in understand/English/verb Russian transl
+    for ch in normalized_desc:
+        script = char_classes[ord(ch)] & SCRIPT_MASK
+        if script == ROMANIZATION_OK:
             classes1.append("OK")
             continue
+        cl = unicodedata.category(ch)
         if cl not in ("Ll", "Lu"):
             classes1.append(cl)
             continue
-        try:
-            name = unicodedata.name(ch)
-            first = name.split()[0]
-            if first == "LATIN":
-                num_latin += 1
-            elif first == "GREEK":
-                num_greek += 1
-            elif first == "COMBINING":  # Combining diacritic
-                cl = "OK"
-            elif re.match(non_latin_scripts_re, name):
-                cl = "NO"  # Not acceptable in romanizations
-        except ValueError:
+        if script == LATIN:
+            num_latin += 1
+        elif script == GREEK:
+            num_greek += 1
+        elif script == COMBINING:  # Combining diacritic
+            cl = "OK"
+        elif script == NON_LATIN:
             cl = "NO"  # Not acceptable in romanizations
         classes1.append(cl)
     # print("classify_desc: {!r} classes1: {}".format(desc, classes1))
@@ -1,5 +1,8 @@
 import importlib
 import types
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Tuple
 
 
 def import_extractor_module(
@@ -15,3 +18,32 @@ def import_extractor_module(
         full_module_name = default_module_name
 
     return importlib.import_module(full_module_name)
+
+
+@dataclass(frozen=True)
+class Extractor:
+    """The extractor modules of a Wiktionary edition and the template
+    names they define, resolved once."""
+
+    page_module: types.ModuleType
+    thesaurus_module: types.ModuleType
+    panel_templates: FrozenSet[str]
+    panel_prefixes: Tuple[str, ...]
+
+    def is_panel_template(self, template_name: str) -> bool:
+        return (
+            template_name in self.panel_templates
+            or template_name.startswith(self.panel_prefixes)
+        )
+
+
+@lru_cache(maxsize=None)
+def get_extractor(lang_code: str) -> Extractor:
+    page_module = import_extractor_module(lang_code, "page")
+    return Extractor(
+        page_module=page_module,
+        thesaurus_module=import_extractor_module(lang_code, "thesaurus"),
+        panel_templates=frozenset(page_module.PANEL_TEMPLATES),
+        # Sorted so that the order of checks doesn't depend on set order
+        panel_prefixes=tuple(sorted(page_module.PANEL_PREFIXES)),
+    )
@@ -7,10 +7,12 @@ import copy
 import html
 import functools
 import collections
-import unicodedata
 from wiktextract.wxr_context import WiktextractContext
 from wikitextprocessor import WikiNode, NodeKind, MAGIC_FIRST
 from wiktextract.tags import valid_tags
+from wiktextract.char_classes import is_superscript
+from wiktextract.tag_bits import (tag_bit, tags_mask, tuple_mask, mask_tags,
+                                  mask_categories, mask_category_masks)
 from wiktextract.inflectiondata import infl_map, infl_start_map, infl_start_re
 from wiktextract.datautils import data_append, freeze, split_at_comma_semi
 from wiktextract.form_descriptions import (classify_desc, decode_tags,
@@ -324,16 +326,35 @@ class HdrSpan(object):
         self.expanded = False
 
 
-def is_superscript(ch):
-    """Returns True if the argument is a superscript character."""
-    assert isinstance(ch, str) and len(ch) == 1
-    try:
-        name = unicodedata.name(ch)
-    except ValueError:
-        return False
-    return re.match(r"SUPERSCRIPT |"
-                    r"MODIFIER LETTER SMALL |"
-                    r"MODIFIER LETTER CAPITAL ", name) is not None
+# Language-specific fields listing tags that are removed from a tagset when
+# all of them are present, in the order they are removed
+USELESS_TAG_FIELDS = ("numbers", "genders", "voices", "strengths", "persons",
+                      "definitenesses")
+
+
+@functools.lru_cache(maxsize=None)
+def useless_tag_masks(lang):
+    """Returns the masks of the tag combinations that serve no purpose
+    together (cover all options) in the language.  Each combination is
+    removed from a tagset that contains all of its tags."""
+    masks = []
+    if get_lang_conf(lang, "animate_inanimate_remove"):
+        masks.append(tags_mask(["animate", "inanimate"]))
+    if get_lang_conf(lang, "virile_nonvirile_remove"):
+        masks.append(tags_mask(["virile", "nonvirile"]))
+    for field in USELESS_TAG_FIELDS:
+        tags = get_lang_conf(lang, field)
+        if tags:
+            masks.append(tags_mask(tags))
+    return tuple(masks)
+
+
+def remove_useless_mask(lang, mask):
+    """Like remove_useless_tags(), for a tagset given as a bitmask."""
+    for useless in useless_tag_masks(lang):
+        if mask & useless == useless:
+            mask &= ~useless
+    return mask
 
 
 def remove_useless_tags(lang, pos, tags):
@@ -342,52 +363,19 @@ def remove_useless_tags(lang, pos, tags):
     assert isinstance(lang, str)
     assert isinstance(pos, str)
     assert isinstance(tags, set)
-    if ("animate" in tags and "inanimate" in tags and
-        get_lang_conf(lang, "animate_inanimate_remove")):
-        tags.remove("animate")
-        tags.remove("inanimate")
-    if ("virile" in tags and "nonvirile" in tags and
-        get_lang_conf(lang, "virile_nonvirile_remove")):
-        tags.remove("virile")
-        tags.remove("nonvirile")
-    # If all numbers in the language are listed, remove them all
-    numbers = get_lang_conf(lang, "numbers")
-    if numbers and all(x in tags for x in numbers):
-        for x in numbers:
-            tags.remove(x)
-    # If all genders in the language are listed, remove them all
-    genders = get_lang_conf(lang, "genders")
-    if genders and all(x in tags for x in genders):
-        for x in genders:
-            tags.remove(x)
-    # If all voices in the language are listed, remove them all
-    voices = get_lang_conf(lang, "voices")
-    if voices and all(x in tags for x in voices):
-        for x in voices:
-            tags.remove(x)
-    # If all strengths of the language are listed, remove them all
-    strengths = get_lang_conf(lang, "strengths")
-    if strengths and all(x in tags for x in strengths):
-        for x in strengths:
-            tags.remove(x)
-    # If all persons of the language are listed, remove them all
-    persons = get_lang_conf(lang, "persons")
-    if persons and all(x in tags for x in persons):
-        for x in persons:
-            tags.remove(x)
-    # If all definitenesses of the language are listed, remove them all
-    definitenesses = get_lang_conf(lang, "definitenesses")
-    if definitenesses and all(x in tags for x in definitenesses):
-        for x in definitenesses:
-            tags.remove(x)
+    mask = tags_mask(tags)
+    new_mask = remove_useless_mask(lang, mask)
+    if new_mask != mask:
+        tags.difference_update(mask_tags(mask & ~new_mask))
 
 
 def tagset_cats(tagset):
     """Returns a set of tag categories for the tagset (merged from all
     alternatives)."""
-    return set(valid_tags[t]
-               for ts in tagset
-               for t in ts)
+    mask = 0
+    for ts in tagset:
+        mask |= tuple_mask(ts)
+    return set(mask_categories(mask))
 
 
 def or_tagsets(lang, pos, tagsets1, tagsets2):
@@ -399,7 +387,7 @@ def or_tagsets(lang, pos, tagsets1, tagsets2):
     assert all(isinstance(x, tuple) for x in tagsets1)
     assert isinstance(tagsets2, list)
     assert all(isinstance(x, tuple) for x in tagsets1)
-    tagsets = []  # This will be the result
+    tagsets = []  # This will be the result, as bitmasks
 
     def add_tags(tags1):
         if not tags1:
@@ -410,42 +398,38 @@ def or_tagsets(lang, pos, tagsets1, tagsets2):
         for tags2 in tagsets:
             # Determine if tags1 can be merged with tags2
             num_differ = 0
-            if tags1 and tags2:
-                cats1 = set(valid_tags[t] for t in tags1)
-                cats2 = set(valid_tags[t] for t in tags2)
-                cats = cats1 | cats2
-                for cat in cats:
-                    tags1_in_cat = set(t for t in tags1 if valid_tags[t] == cat)
-                    tags2_in_cat = set(t for t in tags2 if valid_tags[t] == cat)
-                    if (tags1_in_cat != tags2_in_cat or
-                        not tags1_in_cat or not tags2_in_cat):
+            if tags2:
+                for cat_mask in mask_category_masks(tags1 | tags2):
+                    tags1_in_cat = tags1 & cat_mask
+                    tags2_in_cat = tags2 & cat_mask
+                    if tags1_in_cat != tags2_in_cat:
                         num_differ += 1
                         if not tags1_in_cat or not tags2_in_cat:
                             # Prevent merging if one is empty
                             num_differ += 1
+                        if num_differ > 1:
+                            break
             # print("tags1={} tags2={} num_differ={}"
-            #       .format(tags1, tags2, num_differ))
+            #       .format(mask_tags(tags1), mask_tags(tags2), num_differ))
             if num_differ <= 1:
                 # Yes, they can be merged
                 tagsets.remove(tags2)
-                tags = set(tags1) | set(tags2)
-                remove_useless_tags(lang, pos, tags)
-                tags = tuple(sorted(tags))
-                add_tags(tags)  # Could result in further merging
+                add_tags(remove_useless_mask(lang, tags1 | tags2))
+                # Could result in further merging
                 return
         # If we could not merge, add to tagsets
         tagsets.append(tags1)
 
     for tags in tagsets1:
-        add_tags(tags)
+        add_tags(tuple_mask(tags))
     for tags in tagsets2:
-        add_tags(tags)
+        add_tags(tuple_mask(tags))
     if not tagsets:
-        tagsets.append(())
+        return [()]
 
     # print("or_tagsets: {} + {} -> {}"
     #       .format(tagsets1, tagsets2, tagsets))
-    return tagsets
+    return [mask_tags(tags) for tags in tagsets]
 
 
 def and_tagsets(lang, pos, tagsets1, tagsets2):
@@ -455,19 +439,18 @@ def and_tagsets(lang, pos, tagsets1, tagsets2):
     assert all(isinstance(x, tuple) for x in tagsets1)
     assert isinstance(tagsets2, list) and len(tagsets2) >= 1
     assert all(isinstance(x, tuple) for x in tagsets1)
+    dummy = tag_bit("dummy-ignored-text-cell")
+    masks2 = [tuple_mask(tags2) for tags2 in tagsets2]
     new_tagsets = []
     for tags1 in tagsets1:
-        for tags2 in tagsets2:
-            tags = set(tags1) | set(tags2)
-            remove_useless_tags(lang, pos, tags)
-            if "dummy-ignored-text-cell" in tags:
-                tags.remove("dummy-ignored-text-cell")
-            tags = tuple(sorted(tags))
+        mask1 = tuple_mask(tags1)
+        for mask2 in masks2:
+            tags = remove_useless_mask(lang, mask1 | mask2) & ~dummy
             if tags not in new_tagsets:
                 new_tagsets.append(tags)
     # print("and_tagsets: {} + {} -> {}"
     #       .format(tagsets1, tagsets2, new_tagsets))
-    return new_tagsets
+    return [mask_tags(tags) for tags in new_tagsets]
 
 
 @functools.lru_cache(65536)
@@ -680,6 +663,185 @@ def parse_title(title, source):
     return global_tags, table_tags, extra_forms
 
 
+def compile_infl_value(v, default_then=None):
+    """Compiles a value from infl_map or infl_start_map, possibly a nested
+    conditional expression, into a function
+    ``fn(lang, pos, depth, tablecontext, base_tags, ignore_tags, problems)``
+    that returns the tagset the value evaluates to.  Problems that
+    expand_header() reports as debug messages are appended to ``problems``.
+    Also returns the set of tags tested by "if" conditions in the value.
+    ``default_then`` is the "default" of the enclosing expressions."""
+    # If it is a string, we are done.  A list is interpreted as
+    # alternatives.  (Currently the alternatives must directly be strings.)
+    if isinstance(v, str):
+        v = [v]
+    if isinstance(v, (list, tuple)):
+        masks = tuple(tags_mask(x.split()) for x in v)
+
+        def evaluate_tags(lang, pos, depth, tablecontext, base_tags,
+                          ignore_tags, problems):
+            tagset = []
+            for mask in masks:
+                tags = mask_tags(remove_useless_mask(lang, mask))
+                if tags not in tagset:
+                    tagset.append(tags)
+            return tagset
+
+        return evaluate_tags, frozenset()
+
+    # Otherwise the value should be a dictionary describing a
+    # conditional expression.
+    if not isinstance(v, dict):
+        def evaluate_unimplemented(lang, pos, depth, tablecontext, base_tags,
+                                   ignore_tags, problems):
+            problems.append(("unimplemented", v))
+            return [()]
+
+        return evaluate_unimplemented, frozenset()
+
+    def values(c, types):
+        if isinstance(c, types):
+            return frozenset([c])
+        assert isinstance(c, (list, tuple, set))
+        return frozenset(c)
+
+    # "lang": a single language or a list of languages.
+    # "nested-table-depth": an int or a list of ints.  "depth" is how deep
+    # into a nested table tree the current table lies.  It is first started
+    # in handle_wikitext_table, so only applies to tables-within-tables, not
+    # other WikiNode content.
+    # "inflection-template": a string or a list of strings, matched against
+    # tablecontext.template_name, which is passed down from
+    # page/parse_inflection before parsing and expanding itself has begun.
+    # "pos": a single part-of-speech or a list of them.
+    # "if": a space-separated list of tags that must all be in ``base_tags``,
+    # or any of them if prefixed with "any:".
+    langs = values(v["lang"], str) if "lang" in v else None
+    depths = (values(v["nested-table-depth"], int)
+              if "nested-table-depth" in v else None)
+    templates = (values(v["inflection-template"], str)
+                 if "inflection-template" in v else None)
+    poses = values(v["pos"], str) if "pos" in v else None
+    if_tags = None
+    if_any = False
+    if "if" in v:
+        c = v["if"]
+        assert isinstance(c, str)
+        if_any = c.startswith("any: ")
+        if_tags = tuple(c[5:].split() if if_any else c.split())
+    # Handle "default" assignment.  Store the value to be used as a default
+    # later.
+    if "default" in v:
+        assert isinstance(v["default"], str)
+        default_then = v["default"]
+    # Based on the result of evaluating the condition, select either
+    # "then" part or "else" part.
+    then_fn, then_tags = compile_infl_value(v.get("then", ""), default_then)
+    else_v = v.get("else")
+    no_else = else_v is None and not default_then
+    if else_v is None:
+        else_v = default_then or "error-unrecognized-form"
+    else_fn, else_tags = compile_infl_value(else_v, default_then)
+    tested_tags = then_tags | else_tags | frozenset(if_tags or ())
+
+    def evaluate_cond(lang, pos, depth, tablecontext, base_tags, ignore_tags,
+                      problems):
+        cond = True
+        tested = False
+        if langs is not None:
+            cond = lang in langs
+            tested = True
+        if cond and depths is not None:
+            cond = depth in depths
+            tested = True
+        if cond and tablecontext and templates is not None:
+            cond = tablecontext.template_name in templates
+            tested = True
+        if cond and poses is not None:
+            cond = pos in poses
+            tested = True
+        if cond and if_tags is not None and not ignore_tags:
+            if if_any:
+                cond = any(t in base_tags for t in if_tags)
+            else:
+                cond = all(t in base_tags for t in if_tags)
+            tested = True
+        # Warn about missing conditions for debugging
+        if not tested and not default_then:
+            problems.append(("missing-cond",))
+        if cond:
+            return then_fn(lang, pos, depth, tablecontext, base_tags,
+                           ignore_tags, problems)
+        if no_else:
+            problems.append(("no-else",))
+        return else_fn(lang, pos, depth, tablecontext, base_tags,
+                       ignore_tags, problems)
+
+    return evaluate_cond, tested_tags
+
+
+# Compiled infl_map and infl_start_map values, by id of the value.  The
+# value is kept with its compiled function so that the id is not reused.
+compiled_infl_values = {}
+
+# Memoized results of splitting header texts and looking up the parts, and
+# results of expand_header() that produced no debug messages.  These are
+# only valid for the infl_map they were computed with (tests replace it).
+header_parts_memo = {}
+expand_header_memo = {}
+expand_header_memo_map = None
+EXPAND_HEADER_MEMO_SIZE = 100000
+
+
+def infl_value_fn(v):
+    """Returns the compiled function and tested tags of an infl_map
+    value."""
+    entry = compiled_infl_values.get(id(v))
+    if entry is None or entry[0] is not v:
+        entry = (v, compile_infl_value(v))
+        compiled_infl_values[id(v)] = entry
+    return entry[1]
+
+
+def header_parts(wxr, text):
+    """Splits a cell header into parts and looks them up in infl_map.
+    Returns a tuple of (part, fn) pairs, where fn is a compiled function
+    from compile_infl_value() or None if the part is unrecognized, and the
+    set of tags tested by the functions."""
+    text = clean_value(wxr, text)
+    parts = []
+    tested_tags = frozenset()
+    for text in split_at_comma_semi(text, separators=[";"]):
+        if not text:
+            continue
+        if text in infl_map:
+            v = infl_map[text]  # list or string
+        else:
+            m = re.match(infl_start_re, text)
+            if m is not None:
+                v = infl_start_map[m.group(1)]
+                # print("INFL_START {} -> {}".format(text, v))
+            elif re.match(r"Notes", text):
+                # Ignored header, this just adds dummy-skip-this
+                parts.append((text, infl_value_fn("dummy-skip-this")[0]))
+                continue
+            elif text in IGNORED_COLVALUES:
+                parts.append((text, infl_value_fn("dummy-ignore-skipped")[0]))
+                continue
+            # Try without final parenthesized part
+            text_without_parens = re.sub(r"[,/]?\s+\([^)]*\)\s*$", "", text)
+            if text_without_parens in infl_map:
+                v = infl_map[text_without_parens]
+            elif m is None:
+                # Unrecognized header
+                parts.append((text, None))
+                continue
+        fn, tags = infl_value_fn(v)
+        parts.append((text, fn))
+        tested_tags |= tags
+    return tuple(parts), tested_tags
+
+
 def expand_header(wxr, tablecontext, word, lang, pos, text, base_tags,
                   silent=False, ignore_tags=False, depth=0):
     """Expands a cell header to tagset, handling conditional expressions
@@ -691,6 +853,7 @@ def expand_header(wxr, tablecontext, word, lang, pos, text, base_tags,
     is True, then tags listed in "if" will be ignored in the test (this is
     used when trying to heuristically detect whether a non-<th> cell is anyway
     a header)."""
+    global expand_header_memo_map
     assert isinstance(wxr, WiktextractContext)
     assert isinstance(word, str)
     assert isinstance(lang, str)
@@ -700,173 +863,66 @@ def expand_header(wxr, tablecontext, word, lang, pos, text, base_tags,
     assert silent in (True, False)
     assert isinstance(depth, int)
     # print("EXPAND_HDR: text={!r} base_tags={!r}".format(text, base_tags))
-    # First map the text using the inflection map
-    text = clean_value(wxr, text)
+    if expand_header_memo_map is not infl_map:
+        header_parts_memo.clear()
+        expand_header_memo.clear()
+        expand_header_memo_map = infl_map
+    parsed = header_parts_memo.get(text)
+    if parsed is None:
+        if len(header_parts_memo) >= EXPAND_HEADER_MEMO_SIZE:
+            header_parts_memo.clear()
+        # First map the text using the inflection map
+        parsed = header_parts(wxr, text)
+        header_parts_memo[text] = parsed
+    parts, tested_tags = parsed
+    # The result depends on ``base_tags`` only through the tags tested in
+    # "if" conditions
+    key = (text, lang, pos, depth, ignore_tags,
+           (tablecontext.template_name,) if tablecontext else None,
+           tested_tags.intersection(base_tags) if tested_tags else None)
+    combined_return = expand_header_memo.get(key)
+    if combined_return is not None:
+        return list(combined_return)
+
     combined_return = []
-    parts = split_at_comma_semi(text, separators=[";"])
-    for text in parts:
-        if not text:
+    messages = False
+    for text, fn in parts:
+        if fn is None:
+            if not silent:
+                wxr.wtp.debug("inflection table: unrecognized header: {}"
+                          .format(repr(text)),
+                          sortid="inflection/735")
+            # Unrecognized header
+            combined_return = or_tagsets(lang, pos, combined_return,
+                                         [("error-unrecognized-form",)])
+            messages = True
             continue
-        if text in infl_map:
-            v = infl_map[text]  # list or string
-        else:
-            m = re.match(infl_start_re, text)
-            if m is not None:
-                v = infl_start_map[m.group(1)]
-                # print("INFL_START {} -> {}".format(text, v))
-            elif re.match(r"Notes", text):
-                # Ignored header
-                # print("IGNORING NOTES")
-                combined_return = or_tagsets(lang, pos, combined_return,
-                                             [("dummy-skip-this",)])
-                                             # this just adds dummy-skip-this
-                continue
-            elif text in IGNORED_COLVALUES:
-                combined_return = or_tagsets(lang, pos, combined_return,
-                                             [("dummy-ignore-skipped",)])
-                continue
-            # Try without final parenthesized part
-            text_without_parens = re.sub(r"[,/]?\s+\([^)]*\)\s*$", "", text)
-            if text_without_parens in infl_map:
-                v = infl_map[text_without_parens]
-            elif m is None:
-                if not silent:
-                    wxr.wtp.debug("inflection table: unrecognized header: {}"
-                              .format(repr(text)),
-                              sortid="inflection/735")
-                # Unrecognized header
-                combined_return = or_tagsets(lang, pos, combined_return,
-                                             [("error-unrecognized-form",)])
-                continue
 
-        # Then loop interpreting the value, until the value is a simple string.
-        # This may evaluate nested conditional expressions.
-        default_then = None
-        while True:
-            # If it is a string, we are done.
-            if isinstance(v, str):
-                tags = set(v.split())
-                remove_useless_tags(lang, pos, tags)
-                tagset = [tuple(sorted(tags))]
-                break
-            # For a list, just interpret it as alternatives.  (Currently the
-            # alternatives must directly be strings.)
-            if isinstance(v, (list, tuple)):
-                tagset = []
-                for x in v:
-                    tags = set(x.split())
-                    remove_useless_tags(lang, pos, tags)
-                    tags = tuple(sorted(tags))
-                    if tags not in tagset:
-                        tagset.append(tags)
-                break
-            # Otherwise the value should be a dictionary describing a
-            # conditional expression.
-            if not isinstance(v, dict):
+        # Evaluate the value, including any nested conditional expressions
+        problems = []
+        tagset = fn(lang, pos, depth, tablecontext, base_tags, ignore_tags,
+                    problems)
+        for problem in problems:
+            messages = True
+            if problem[0] == "unimplemented":
                 wxr.wtp.debug("inflection table: internal: "
                           "UNIMPLEMENTED INFL_MAP VALUE: {}"
-                          .format(infl_map[text]),
+                          .format(problem[1]),
                           sortid="inflection/767")
-                tagset = [()]
-                break
-            # Evaluate the conditional expression.
-            assert isinstance(v, dict)
-            cond = "default-true"
-            c = ""
-            # Handle "lang" condition.  The value must be either a
-            # single language or a list of languages, and the
-            # condition evaluates to True if the table is one of
-            # those languages.
-            if "lang" in v:
-                c = v["lang"]
-                if isinstance(c, str):
-                    cond = c == lang
-                else:
-                    assert isinstance(c, (list, tuple, set))
-                    cond = lang in c
-            # Handle "nested-table-depth" condition. The value must
-            # be an int or list of ints, and the condition evaluates
-            # True if the depth is one of those values.
-            # "depth" is how deep into a nested table tree the current
-            # table lies. It is first started in handle_wikitext_table,
-            # so only applies to tables-within-tables, not other
-            # WikiNode content. `depth` is currently only passed as a
-            # parameter down the table parsing stack, and not stored.
-            if cond and "nested-table-depth" in v:
-                d = v["nested-table-depth"]
-                if isinstance(d, int):
-                    cond = d == depth
-                else:
-                    assert isinstance(d, (list, tuple, set))
-                    cond = depth in d
-            # Handle inflection-template condition. Must be a string
-            # or list of strings, and if tablecontext.template_name is in
-            # those, accept the condition.
-            # TableContext.template_name is passed down from page/
-            # parse_inflection, before parsing and expanding itself
-            # has begun.
-            if cond and tablecontext and "inflection-template" in v:
-                d = v["inflection-template"]
-                if isinstance(d, str):
-                    cond = d == tablecontext.template_name
-                else:
-                    assert isinstance(d, (list, tuple, set))
-                    cond = tablecontext.template_name in d
-            # Handle "pos" condition.  The value must be either a single
-            # part-of-speech or a list of them, and the condition evaluates to
-            # True if the part-of-speech is any of those listed.
-            if cond and "pos" in v:
-                c = v["pos"]
-                if isinstance(c, str):
-                    cond = c == pos
-                else:
-                    assert isinstance(c, (list, tuple, set))
-                    cond = pos in c
-            # Handle "if" condition.  The value must be a string containing
-            # a space-separated list of tags.  The condition evaluates to True
-            # if ``base_tags`` contains all of the listed tags.  If the condition
-            # is of the form "any: ...tags...", then any of the tags will be
-            # enough.
-            if cond and "if" in v and not ignore_tags:
-                c = v["if"]
-                assert isinstance(c, str)
-                # "if" condition is true if any of the listed tags is present if
-                # it starts with "any:", otherwise all must be present
-                if c.startswith("any: "):
-                    cond = any(t in base_tags for t in c[5:].split())
-                else:
-                    cond = all(t in base_tags for t in c.split())
-
-            # Handle "default" assignment. Store the value to be used
-            # as a default later.
-            if "default" in v:
-                assert isinstance(v["default"], str)
-                default_then = v["default"]
-
-            # Warning message about missing conditions for debugging.
-
-            if cond == "default-true" and not default_then and not silent:
+            elif silent:
+                continue
+            elif problem[0] == "missing-cond":
                 wxr.wtp.debug("inflection table: IF MISSING COND: word={} "
                           "lang={} text={} base_tags={} c={} cond={}"
-                          .format(word, lang, text, base_tags, c, cond),
+                          .format(word, lang, text, base_tags, "",
+                                  "default-true"),
                           sortid="inflection/851")
-            # Based on the result of evaluating the condition, select either
-            # "then" part or "else" part.
-            if cond:
-                v = v.get("then", "")
             else:
-                v = v.get("else")
-                if v is None:
-                    if default_then:
-                        v = default_then
-                    else:
-                        if not silent:
-                            wxr.wtp.debug("inflection table: IF WITHOUT ELSE EVALS "
-                                      "False: "
-                                      "{}/{} {!r} base_tags={}"
-                                      .format(word, lang, text, base_tags),
-                                      sortid="inflection/865")
-                        v = "error-unrecognized-form"
+                wxr.wtp.debug("inflection table: IF WITHOUT ELSE EVALS "
+                          "False: "
+                          "{}/{} {!r} base_tags={}"
+                          .format(word, lang, text, base_tags),
+                          sortid="inflection/865")
 
         # Merge the resulting tagset from this header part with the other
         # tagsets from the whole header
@@ -875,6 +931,12 @@ def expand_header(wxr, tablecontext, word, lang, pos, text, base_tags,
     # Return the combined tagsets, or empty tagset if we got no tagsets
     if not combined_return:
         combined_return = [()]
+    # Results that produced debug messages are not memoized, so that the
+    # messages are produced again for other words
+    if not messages:
+        if len(expand_header_memo) >= EXPAND_HEADER_MEMO_SIZE:
+            expand_header_memo.clear()
+        expand_header_memo[key] = tuple(combined_return)
     return combined_return
 
 
@@ -1179,6 +1241,45 @@ def compute_coltags(lang, pos, hdrspans, start, colspan, celltext):
     assert all(isinstance(x, tuple) for x in coltags)
     return coltags
 
+# Memoized results of compute_coltags(), keyed by the language, part of
+# speech, cell position and the layout signature of the header spans.
+# Tables generated by the same template share these.
+coltags_cache = {}
+COLTAGS_CACHE_SIZE = 100000
+
+
+def layout_signature(hdrspans):
+    """Returns a hashable signature of the header span fields that
+    compute_coltags() uses.  The index of the first occurrence of each
+    span is included, because the same span may be in the list twice."""
+    first_index = {}
+    return tuple((h.start, h.colspan, h.rownum, h.all_headers_row,
+                  h.expanded, tuple(h.tagsets),
+                  first_index.setdefault(id(h), i))
+                 for i, h in enumerate(hdrspans))
+
+
+def cached_compute_coltags(wxr, lang, pos, hdrspans, start, colspan,
+                           celltext, layout=None):
+    """Like compute_coltags(), but reuses the result computed for another
+    cell at the same position under identical header spans.  ``layout`` is
+    layout_signature(hdrspans) if the caller already has it."""
+    if celltext == debug_cell_text:
+        return compute_coltags(lang, pos, hdrspans, start, colspan, celltext)
+    if layout is None:
+        layout = layout_signature(hdrspans)
+    key = (lang, pos, start, colspan, layout)
+    coltags = coltags_cache.get(key)
+    wxr.config.count_cache_lookup("table layout", coltags is not None)
+    if coltags is None:
+        if len(coltags_cache) >= COLTAGS_CACHE_SIZE:
+            coltags_cache.clear()
+        coltags = tuple(compute_coltags(lang, pos, hdrspans, start, colspan,
+                                        celltext))
+        coltags_cache[key] = coltags
+    return list(coltags)
+
+
 def parse_simple_table(wxr, tablecontext, word, lang, pos,
                        rows, titles, source, after, depth):
     """This is the default table parser.  Despite its name, it can parse
@@ -1284,11 +1385,12 @@ def parse_simple_table(wxr, tablecontext, word, lang, pos,
         all_hdr_tags = []  # list of tuples
         new_rowtags = []
         for rt0 in rowtags:
-            for ct0 in compute_coltags(lang, pos, hdrspans,
-                                       col_idx, #col_idx=>start
-                                       colspan,
-                                       col, # cell_text
-                                       ):
+            for ct0 in cached_compute_coltags(wxr, lang, pos, hdrspans,
+                                              col_idx, #col_idx=>start
+                                              colspan,
+                                              col, # cell_text
+                                              current_layout(),
+                                              ):
                 base_tags = (set(rt0) | set(ct0) | set(global_tags) |
                          set(table_tags))  # Union.
                 alt_tags = expand_header(wxr, tablecontext,
@@ -1399,6 +1501,7 @@ def parse_simple_table(wxr, tablecontext, word, lang, pos,
                 #               col0_hdrspan.tagsets))
                 col0_hdrspan.colspan = col_idx - col0_hdrspan.start
                 col0_hdrspan.expanded = True
+                layout_memo[0] = None
             # Clear old col0_hdrspan
             if col == debug_cell_text:
                 print("START NEW {}".format(hdrspan.tagsets))
@@ -1883,6 +1986,17 @@ def parse_simple_table(wxr, tablecontext, word, lang, pos,
     # Then extract the actual forms
     ret = []
     hdrspans = []
+    # The hdrspans list, its length and its layout_signature(), computed
+    # again only after header spans have been added or expanded, as most
+    # cells of a row are under the same header spans
+    layout_memo = [None, 0, None]
+
+    def current_layout():
+        if layout_memo[0] is not hdrspans or layout_memo[1] != len(hdrspans):
+            layout_memo[:] = [hdrspans, len(hdrspans),
+                              layout_signature(hdrspans)]
+        return layout_memo[2]
+
     first_col_has_text = False
     rownum = 0
     title = None
@@ -2125,8 +2239,10 @@ def parse_simple_table(wxr, tablecontext, word, lang, pos,
             have_text = True
 
             # Determine column tags for the multi-column cell
-            combined_coltags = compute_coltags(lang, pos, hdrspans, col_idx,
-                                               colspan, col)
+            combined_coltags = cached_compute_coltags(wxr, lang, pos,
+                                                      hdrspans, col_idx,
+                                                      colspan, col,
+                                                      current_layout())
             if any("dummy-ignored-text-cell" in ts for ts in combined_coltags):
                 continue
 
@@ -2269,6 +2385,7 @@ def parse_simple_table(wxr, tablecontext, word, lang, pos,
                 #               col0_hdrspan.tagsets))
                 col0_hdrspan.colspan = len(row) - col0_hdrspan.start
                 col0_hdrspan.expanded = True
+                layout_memo[0] = None
     # XXX handle refs and defs
     # for x in hdrspans:
     #     print("  HDRSPAN {} {} {} {!r}"
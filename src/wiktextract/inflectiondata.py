@@ -6927,6 +6927,9 @@ infl_map = {
 }
 
 
+# The checks below are run on infl_map and infl_start_map by
+# tests/test_tag_tables.py
+
 def check_tags(k, v):
     assert isinstance(k, str)
     assert isinstance(v, str)
@@ -6980,10 +6983,6 @@ def check_v(k, v):
               .format(k, v))
 
 
-for k, v in infl_map.items():
-    check_v(k, v)
-
-
 # Mapping from start of header to tags for inflection tables.  The start must
 # be followed by a space (automatically added, do not enter here).
 infl_start_map = {
@@ -7009,8 +7008,6 @@ infl_start_map = {
     # gláedach/Old Irish
     "Initial mutations of a following adjective:": "dummy-skip-this",
 }
-for k, v in infl_start_map.items():
-    check_v(k, v)
 
 infl_start_re = re.compile(
     r"^({}) ".format("|".join(re.escape(x) for x in infl_start_map.keys())))
@@ -2,8 +2,10 @@
 # Language-specific configuration for various aspects of inflection table
 # parsing.
 
+import functools
 import re
-# from wiktextract.datautils import languages_by_name
+from types import MappingProxyType
+
 from wiktextract.tags import valid_tags, tag_categories
 from wiktextract.parts_of_speech import PARTS_OF_SPEECH
 
@@ -658,65 +660,103 @@ lang_specific = {
 }
 
 
-# Sanity check lang_specific
-# def_ls_keys = lang_specific["default"].keys()
-# for k, v in lang_specific.items():
-#     if k[0].isupper() and k not in languages_by_name:
-#         raise AssertionError("key {!r} in lang_specific is not a valid language"
-#                              .format(k))
-#     assert isinstance(v, dict)
-#     for kk, vv in v.items():
-#         if kk not in def_ls_keys and kk != "next":
-#             raise AssertionError("{} key {!r} not in default entry"
-#                                  .format(k, kk))
-#         if kk in ("hdr_expand_first", "hdr_expand_cont"):
-#             if not isinstance(vv, set):
-#                 raise AssertionError("{} key {!r} must be set"
-#                                      .format(lang, kk))
-#             for t in vv:
-#                 if t not in tag_categories:
-#                     raise AssertionError("{} key {!r} invalid tag category {}"
-#                                          .format(k, kk, t))
-#         elif kk in ("genders", "numbers", "persons", "strengths", "voices"):
-#             if not vv:
-#                 continue
-#             if not isinstance(vv, (list, tuple, set)):
-#                 raise AssertionError("{} key {!r} must be list/tuple/set"
-#                                      .format(k, kk))
-#             for t in vv:
-#                 if t not in valid_tags:
-#                     raise AssertionError("{} key {!r} invalid tag {!r}"
-#                                          .format(k, kk, t))
-#         elif kk == "lang_tag_mappings" and vv is not None:
-#             for pos, transf in vv.items():
-#                 assert pos in PARTS_OF_SPEECH
-#                 assert isinstance(transf, dict)
-#                 for pre, post in transf.items():
-#                     assert isinstance(pre, tuple)
-#                     assert all(t in valid_tags for t in pre)
-#                     assert isinstance(post, list)
-#                     assert all(t in valid_tags for t in post)
-#         elif kk == "next":
-#             if vv not in lang_specific:
-#                 raise AssertionError("{} key {!r} value {!r} is not defined"
-#                                      .format(k, kk, vv))
+def check_lang_specific():
+    """Sanity checks lang_specific.  This is run by the tests instead of on
+    every lookup."""
+    def_ls_keys = lang_specific["default"].keys()
+    for k, v in lang_specific.items():
+        assert isinstance(v, dict)
+        for kk, vv in v.items():
+            if kk not in def_ls_keys and kk != "next":
+                raise AssertionError("{} key {!r} not in default entry"
+                                     .format(k, kk))
+            if kk in ("hdr_expand_first", "hdr_expand_cont"):
+                if not isinstance(vv, set):
+                    raise AssertionError("{} key {!r} must be set"
+                                         .format(k, kk))
+                for t in vv:
+                    if t not in tag_categories:
+                        raise AssertionError("{} key {!r} invalid tag "
+                                             "category {}".format(k, kk, t))
+            elif kk in ("genders", "numbers", "persons", "strengths",
+                        "voices"):
+                if not vv:
+                    continue
+                if not isinstance(vv, (list, tuple, set)):
+                    raise AssertionError("{} key {!r} must be list/tuple/set"
+                                         .format(k, kk))
+                for t in vv:
+                    if t not in valid_tags:
+                        raise AssertionError("{} key {!r} invalid tag {!r}"
+                                             .format(k, kk, t))
+            elif kk == "lang_tag_mappings" and vv is not None:
+                for pos, transf in vv.items():
+                    assert pos in PARTS_OF_SPEECH
+                    assert isinstance(transf, dict)
+                    for pre, post in transf.items():
+                        assert isinstance(pre, tuple)
+                        assert all(t in valid_tags for t in pre)
+                        assert isinstance(post, list)
+                        assert all(t in valid_tags for t in post)
+            elif kk == "form_transformations":
+                for patpos, pattern, dst, tags in vv:
+                    if patpos not in PARTS_OF_SPEECH:
+                        raise AssertionError("{} key {!r} invalid pos {!r}"
+                                             .format(k, kk, patpos))
+                    re.compile(pattern)
+                    for t in tags.split():
+                        if t not in valid_tags:
+                            raise AssertionError("{} key {!r} invalid tag "
+                                                 "{!r}".format(k, kk, t))
+            elif kk == "next":
+                if vv not in lang_specific:
+                    raise AssertionError("{} key {!r} value {!r} is not "
+                                         "defined".format(k, kk, vv))
 
-def get_lang_conf(lang, field):
-    """Returns the given field from language-specific data or "default"
-    if the language is not listed or does not have the field."""
+
+@functools.lru_cache(maxsize=None)
+def lang_conf(lang):
+    """Returns the configuration of the language with the fields inherited
+    through the "next" chain and from "default" resolved, as a read-only
+    mapping."""
     assert isinstance(lang, str)
-    assert isinstance(field, str)
+    conf = {}
     while True:
         lconfigs = lang_specific.get(lang)
         if lconfigs is None:
             lang = "default"
-        elif lang == "default" and field not in lconfigs:
-            raise RuntimeError("Invalid lang_specific field {!r}"
-                               .format(field))
-        else:
-            if field in lconfigs:
-                return lconfigs[field]
-            lang = lconfigs.get("next", "default")
+            continue
+        for field, value in lconfigs.items():
+            if field != "next" and field not in conf:
+                conf[field] = value
+        if lang == "default":
+            return MappingProxyType(conf)
+        lang = lconfigs.get("next", "default")
+
+
+def get_lang_conf(lang, field):
+    """Returns the given field from language-specific data or "default"
+    if the language is not listed or does not have the field."""
+    try:
+        return lang_conf(lang)[field]
+    except KeyError:
+        raise RuntimeError("Invalid lang_specific field {!r}"
+                           .format(field))
+
+
+@functools.lru_cache(maxsize=None)
+def form_transformations(lang, pos):
+    """Returns the form_transformations rules of the language for the
+    part-of-speech as (compiled pattern, replacement, tags) tuples, and a
+    combined pattern that matches if any of the rules may match."""
+    rules = tuple((re.compile(pattern), dst, tags.split())
+                  for patpos, pattern, dst, tags
+                  in get_lang_conf(lang, "form_transformations")
+                  if patpos == pos)
+    if not rules:
+        return rules, None
+    return rules, re.compile("|".join("(?:{})".format(rule[0].pattern)
+                                      for rule in rules))
 
 
 def lang_specific_tags(lang, pos, form):
@@ -728,18 +768,14 @@ def lang_specific_tags(lang, pos, form):
     assert isinstance(lang, str)
     assert isinstance(pos, str)
     assert isinstance(form, str)
-    rules = get_lang_conf(lang, "form_transformations")
-    for patpos, pattern, dst, tags in rules:
+    rules, any_rule_re = form_transformations(lang, pos)
+    if any_rule_re is None or not any_rule_re.search(form):
+        return form, []
     #   PoS, regex, replacement, tags; pattern -> dst :: "^ich " > ""
-        assert patpos in PARTS_OF_SPEECH
-        if pos != patpos:
-            continue
-        m = re.search(pattern, form)
+    for pattern, dst, tags in rules:
+        m = pattern.search(form)
         if not m:
             continue
         form = form[:m.start()] + dst + form[m.end():]
-        tags = tags.split()
-        for t in tags:
-            assert t in valid_tags
-        return form, tags
+        return form, list(tags)
     return form, []
@@ -12,7 +12,7 @@ from .form_descriptions import (classify_desc, parse_head_final_tags,
                                 parse_sense_qualifier,
                                 head_final_bantu_langs, head_final_bantu_re,
                                 head_final_other_langs, head_final_other_re,
-                                head_final_numeric_langs, head_final_re)
+                                head_final_numeric_langs, get_head_final_re)
 from .tags import linkage_beginning_tags
 
 # Linkage will be ignored if it matches this regexp before splitting
@@ -323,8 +323,8 @@ def parse_linkage_item_text(wxr: Wtp,
         # print("linkage prefix: desc={!r} cls={} rest={!r} cls2={}"
         #      .format(desc, cls, rest, cls2))
 
-        e1 = wxr.wtp.page_exists(desc)
-        e2 = wxr.wtp.page_exists(rest)
+        e1 = wxr.page_exists(desc)
+        e2 = wxr.page_exists(rest)
         if cls != "tags":
             if (cls2 == "tags" or
                 (e1 and not e1) or
@@ -447,7 +447,7 @@ def parse_linkage_item_text(wxr: Wtp,
                  not re.search(head_final_bantu_re, item2)) and
                 (lang not in head_final_other_langs or
                  not re.search(head_final_other_re, item2)) and
-                (not re.search(head_final_re, item2) or
+                (not re.search(get_head_final_re(), item2) or
                  (item2[-1].isdigit() and
                   lang not in head_final_numeric_langs)) and
                 not re.search(r"\bor\b", wxr.wtp.title) and
@@ -796,7 +796,7 @@ def parse_linkage_item_text(wxr: Wtp,
             # which is which.
             if ((not w or "," not in w) and
                 (not r or "," not in r) and
-                not wxr.wtp.page_exists(w)):
+                not wxr.page_exists(w)):
                 lst = w.split("／") if len(w) > 1 else [w]
                 if len(lst) == 1:
                     lst = w.split(" / ")
@@ -811,8 +811,8 @@ def parse_linkage_item_text(wxr: Wtp,
             # Heuristically remove "." at the end of most linkages
             # (some linkage lists end in a period, but we also have
             # abbreviations that end with a period that should be kept)
-            if (w.endswith(".") and not wxr.wtp.page_exists(w) and
-                (wxr.wtp.page_exists(w[:-1]) or
+            if (w.endswith(".") and not wxr.page_exists(w) and
+                (wxr.page_exists(w[:-1]) or
                  (len(w) >= 5) and "." not in w[:-1])):
                 w = w[:-1]
 
@@ -0,0 +1,105 @@
+# Rendering parse trees directly to clean text.
+#
+# clean_node() normally converts a parse tree back to wikitext, expands it
+# to HTML and then removes the HTML and wikitext formatting with the regular
+# expressions in clean_value().  Most glosses and other short values only
+# contain plain text, links and bold or italic text, and these are rendered
+# here in a single walk over the tree, collecting category and link targets
+# on the way.  Values containing anything else (templates, HTML, tables,
+# characters that template expansion or clean_value() could change) are left
+# to the general path, which gives the same result.
+
+import re
+from typing import List, Optional, Tuple, Union
+
+from wikitextprocessor import NodeKind, WikiNode
+
+from .clean import clean_value
+from .wxr_context import WiktextractContext
+
+# Text containing these is rendered by the general path
+SPECIAL_TEXT_RE = re.compile(r"[][{}<>|&'~^]|__")
+
+FORMATTING_KINDS = {NodeKind.BOLD, NodeKind.ITALIC}
+
+
+class UnhandledNode(Exception):
+    pass
+
+
+def clean_link_part(wxr: WiktextractContext, text: str) -> str:
+    """Cleans a link target, link text or category name like clean_node()
+    does for the links it finds in expanded text."""
+    return re.sub(r"\s+", " ", clean_value(wxr, text)).strip()
+
+
+def node_to_plain_text(
+    wxr: WiktextractContext,
+    value: Union[str, WikiNode, List[Union[str, WikiNode, List]]],
+) -> Optional[Tuple[str, List[str], List[Tuple[str, str]]]]:
+    """Returns the text of ``value`` as clean_value() would clean it after
+    expanding, the categories and the (text, target) tuples of the links in
+    it, or None if ``value`` contains something that must be expanded."""
+    category_ns_names = wxr.patterns.category_ns_names
+    parts = []
+    categories = []
+    links = []
+
+    def plain_arg(arg) -> str:
+        if isinstance(arg, str):
+            arg = [arg]
+        if not all(isinstance(x, str) for x in arg):
+            raise UnhandledNode
+        text = "".join(arg)
+        if SPECIAL_TEXT_RE.search(text):
+            raise UnhandledNode
+        return text
+
+    def link(node: WikiNode) -> None:
+        if not 1 <= len(node.largs) <= 2:
+            raise UnhandledNode
+        target = plain_arg(node.largs[0]).strip()
+        if "#" in target or not target:
+            raise UnhandledNode
+        if ":" in target:
+            prefix, name = target.split(":", 1)
+            if prefix.strip() not in category_ns_names:
+                raise UnhandledNode
+            name = clean_link_part(wxr, name)
+            if name:
+                categories.append(name)
+        else:
+            text = target
+            if len(node.largs) == 2:
+                text = plain_arg(node.largs[1]).strip()
+                if not text:
+                    raise UnhandledNode
+            parts.append(text)
+            links.append(
+                (clean_link_part(wxr, text), clean_link_part(wxr, target))
+            )
+        recurse(node.children)
+
+    def recurse(value) -> None:
+        if isinstance(value, str):
+            if SPECIAL_TEXT_RE.search(value):
+                raise UnhandledNode
+            parts.append(value)
+        elif isinstance(value, (list, tuple)):
+            for x in value:
+                recurse(x)
+        elif isinstance(value, WikiNode):
+            if value.kind == NodeKind.LINK:
+                link(value)
+            elif value.kind in FORMATTING_KINDS:
+                recurse(value.children)
+            else:
+                raise UnhandledNode
+        else:
+            raise UnhandledNode
+
+    try:
+        recurse(value)
+    except UnhandledNode:
+        return None
+    return clean_value(wxr, "".join(parts)), categories, links
@@ -13,7 +13,9 @@ from wiktextract.wxr_context import WiktextractContext
 
 from .clean import clean_value
 from .datautils import data_append, data_extend
-from .import_utils import import_extractor_module
+from .dependencies import record_dependencies
+from .import_utils import get_extractor
+from .node_text import node_to_plain_text
 
 # NodeKind values for subtitles
 LEVEL_KINDS = {
@@ -34,8 +36,20 @@ def parse_page(
     all available languages).  ``word`` is page title, and ``text`` is
     page text in Wikimedia format.  Other arguments indicate what is
     captured."""
-    page_extractor_mod = import_extractor_module(wxr.wtp.lang_code, "page")
-    page_data = page_extractor_mod.parse_page(wxr, page_title, page_text)
+    page_extractor_mod = get_extractor(wxr.wtp.lang_code).page_module
+    if wxr.extraction_cache is not None:
+        page_data, dependencies = wxr.extraction_cache.extract(
+            wxr, page_title, page_text, page_extractor_mod.parse_page
+        )
+    elif wxr.dependency_db is not None:
+        with record_dependencies(wxr, page_text) as dependencies:
+            page_data = page_extractor_mod.parse_page(
+                wxr, page_title, page_text
+            )
+    else:
+        page_data = page_extractor_mod.parse_page(wxr, page_title, page_text)
+    if wxr.dependency_db is not None:
+        wxr.dependency_db.add(page_title, dependencies)
     inject_linkages(wxr, page_data)
     if wxr.config.dump_file_lang_code == "en":
         process_categories(wxr, page_data)
@@ -47,10 +61,7 @@ def is_panel_template(wxr: WiktextractContext, template_name: str) -> bool:
     """Checks if `Template_name` is a known panel template name (i.e., one that
     produces an infobox in Wiktionary, but this also recognizes certain other
     templates that we do not wish to expand)."""
-    page_extractor_mod = import_extractor_module(wxr.wtp.lang_code, "page")
-    if template_name in page_extractor_mod.PANEL_TEMPLATES:
-        return True
-    return template_name.startswith(tuple(page_extractor_mod.PANEL_PREFIXES))
+    return get_extractor(wxr.wtp.lang_code).is_panel_template(template_name)
 
 
 def recursively_extract(
@@ -146,7 +157,7 @@ def recursively_extract(
 
 def inject_linkages(wxr: WiktextractContext, page_data: List[Dict]) -> None:
     # Inject linkages from thesaurus entries
-    from .thesaurus import search_thesaurus
+    from .thesaurus import lookup_thesaurus
 
     local_thesaurus_ns = wxr.wtp.NAMESPACE_DATA.get("Thesaurus", {}).get("name")
     for data in page_data:
@@ -155,9 +166,7 @@ def inject_linkages(wxr: WiktextractContext, page_data: List[Dict]) -> None:
         word = data["word"]
         lang_code = data["lang_code"]
         pos = data["pos"]
-        for term in search_thesaurus(
-            wxr.thesaurus_db_conn, word, lang_code, pos
-        ):
+        for term in lookup_thesaurus(wxr, word, lang_code, pos):
             for dt in data.get(term.linkage, ()):
                 if dt.get("word") == term.term and (
                     not term.sense or dt.get("sense") == term.sense
@@ -240,16 +249,6 @@ def process_categories(wxr: WiktextractContext, page_data: List[Dict]) -> None:
                     continue  # Don't add to form_of or alt_of entries
                 data_extend(wxr, data, field, lst)
 
-    # Regexp for matching category tags that start with a language name.
-    # Group 2 will be the language name. The category tag should be without
-    # the namespace prefix.
-    starts_lang_re = re.compile(
-        r"^("
-        + wxr.wtp.NAMESPACE_DATA.get("Rhymes", {}).get("name", "")
-        + ":)?("
-        + "|".join(re.escape(x) for x in wxr.config.LANGUAGES_BY_NAME)
-        + ")[ /]?"
-    )
     # Remove category links that start with a language name from entries for
     # different languages
     for data in page_data:
@@ -257,9 +256,10 @@ def process_categories(wxr: WiktextractContext, page_data: List[Dict]) -> None:
         cats = data.get("categories", ())
         new_cats = []
         for cat in cats:
-            m = re.match(starts_lang_re, cat)
-            if m:
-                catlang = m.group(2)
+            # Language name at the start of the category, possibly after the
+            # Rhymes: namespace prefix
+            catlang = wxr.patterns.category_lang_name(cat)
+            if catlang is not None:
                 catlang_code = wxr.config.LANGUAGES_BY_NAME.get(catlang)
                 if catlang_code != lang_code and not (
                     catlang_code == "en" and data.get("lang_code") == "mul"
@@ -316,6 +316,43 @@ def clean_node(
 ) -> str:
     """Expands the node to text, cleaning up any HTML and duplicate spaces.
     This is intended for expanding things like glosses for a single sense."""
+    rendered = node_to_plain_text(wxr, value)
+    if rendered is None:
+        v = clean_node_html(
+            wxr, sense_data, value, template_fn, post_template_fn, collect_links
+        )
+    else:
+        v, categories, links = rendered
+        if sense_data is not None:
+            for cat in categories:
+                if cat not in sense_data.get("categories", ()):
+                    data_append(wxr, sense_data, "categories", cat)
+            if collect_links:
+                for ltuple in links:
+                    if ltuple not in sense_data.get("links", ()):
+                        data_append(wxr, sense_data, "links", ltuple)
+
+    # Strip any unhandled templates and other stuff.  This is mostly intended
+    # to clean up erroneous codings in the original text.
+    # v = re.sub(r"(?s)\{\{.*", "", v)
+    # Some templates create <sup>(Category: ...)</sup>; remove
+    v = wxr.patterns.category_sup_re.sub("", v)
+    # Some templates create question mark in <sup>, e.g.,
+    # some Korean Hanja form
+    v = re.sub(r"\^\?", "", v)
+    return v
+
+
+def clean_node_html(
+    wxr: WiktextractContext,
+    sense_data: Optional[Dict],
+    value: Union[str, WikiNode, List[Union[str, WikiNode, List]]],
+    template_fn: Optional[Callable[[str, Dict], str]] = None,
+    post_template_fn: Optional[Callable[[str, Dict, str], str]] = None,
+    collect_links: bool = False,
+) -> str:
+    """The general path of clean_node(): expands the node to HTML, captures
+    categories and links from it and cleans it with clean_value()."""
 
     # print("CLEAN_NODE:", repr(value))
     def clean_template_fn(name, ht):
@@ -369,11 +406,6 @@ def clean_node(
     # Capture categories if sense_data has been given.  We also track
     # Lua execution errors here.
     # If collect_links=True (for glosses), capture links
-    category_ns_data = wxr.wtp.NAMESPACE_DATA.get("Category", {})
-    category_ns_names = {category_ns_data.get("name")} | set(
-        category_ns_data.get("aliases")
-    )
-    category_names_pattern = rf"(?:{'|'.join(category_ns_names)})"
     if sense_data is not None:
         # Check for Lua execution error
         if '<strong class="error">Lua execution error' in v:
@@ -382,10 +414,7 @@ def clean_node(
             data_append(wxr, sense_data, "tags", "error-lua-timeout")
         # Capture Category tags
         if not collect_links:
-            for m in re.finditer(
-                rf"(?is)\[\[:?\s*{category_names_pattern}\s*:([^]|]+)",
-                v,
-            ):
+            for m in wxr.patterns.category_capture_re.finditer(v):
                 cat = clean_value(wxr, m.group(1))
                 cat = re.sub(r"\s+", " ", cat)
                 cat = cat.strip()
@@ -401,7 +430,10 @@ def clean_node(
             ):
                 # Add here other stuff different "Something:restofthelink"
                 # things;
-                if m.group(2) and m.group(2).strip() in category_ns_names:
+                if (
+                    m.group(2)
+                    and m.group(2).strip() in wxr.patterns.category_ns_names
+                ):
                     cat = clean_value(wxr, m.group(3))
                     cat = re.sub(r"\s+", " ", cat)
                     cat = cat.strip()
@@ -433,17 +465,4 @@ def clean_node(
 
     v = clean_value(wxr, v)
     # print("After clean_value:", repr(v))
-
-    # Strip any unhandled templates and other stuff.  This is mostly intended
-    # to clean up erroneous codings in the original text.
-    # v = re.sub(r"(?s)\{\{.*", "", v)
-    # Some templates create <sup>(Category: ...)</sup>; remove
-    v = re.sub(
-        rf"(?si)\s*(?:<sup>)?\({category_names_pattern}:[^)]+\)(?:</sup>)?",
-        "",
-        v,
-    )
-    # Some templates create question mark in <sup>, e.g.,
-    # some Korean Hanja form
-    v = re.sub(r"\^\?", "", v)
     return v
@@ -0,0 +1,83 @@
+# Compiled patterns and lookup tables that depend on the namespace names of
+# the Wiktionary edition and on the language names in the configuration.
+# These are built once for each WiktextractContext instead of on every call
+# of the functions that use them.
+
+import re
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from wikitextprocessor import Wtp
+
+from .config import WiktionaryConfig
+
+
+class EditionPatterns:
+    def __init__(self, wtp: Wtp, config: WiktionaryConfig):
+        category_ns_data = wtp.NAMESPACE_DATA.get("Category", {})
+        self.category_ns_names: FrozenSet[str] = frozenset(
+            {category_ns_data.get("name")}
+            | set(category_ns_data.get("aliases"))
+        )
+        cat = rf"(?:{'|'.join(self.category_ns_names)})"
+        # Category links removed by clean_value()
+        self.category_link_re = re.compile(
+            rf"(?si)\[\[\s*{cat}\s*:\s*([^]]+?)\s*\]\]"
+        )
+        # Category links captured by clean_node()
+        self.category_capture_re = re.compile(
+            rf"(?is)\[\[:?\s*{cat}\s*:([^]|]+)"
+        )
+        # Some templates create <sup>(Category: ...)</sup>
+        self.category_sup_re = re.compile(
+            rf"(?si)\s*(?:<sup>)?\({cat}:[^)]+\)(?:</sup>)?"
+        )
+
+        # Title prefixes of each namespace, keyed by (namespace, lower)
+        self.ns_prefixes: Dict[Tuple[str, bool], Tuple[str, ...]] = {}
+        for ns, data in wtp.NAMESPACE_DATA.items():
+            names = [data["name"]] + data["aliases"]
+            self.ns_prefixes[(ns, False)] = tuple(x + ":" for x in names)
+            self.ns_prefixes[(ns, True)] = tuple(x.lower() + ":" for x in names)
+
+        self.rhymes_prefix = (
+            wtp.NAMESPACE_DATA.get("Rhymes", {}).get("name", "") + ":"
+        )
+        # Order of each language name in LANGUAGES_BY_NAME, and the lengths
+        # of the names, for finding the language name a category starts with
+        self.lang_name_order: Dict[str, int] = {
+            name: i for i, name in enumerate(config.LANGUAGES_BY_NAME)
+        }
+        self.lang_name_lengths: Tuple[int, ...] = tuple(
+            sorted({len(name) for name in self.lang_name_order})
+        )
+
+    def ns_title_prefixes(
+        self, namespace: str, lower: bool = False
+    ) -> Tuple[str, ...]:
+        return self.ns_prefixes.get((namespace, lower), ())
+
+    def starting_lang_name(self, text: str) -> Optional[str]:
+        """Returns the language name at the start of ``text``, followed by
+        a space, a slash or the end of the text.  If several language names
+        match, the first one in LANGUAGES_BY_NAME is returned."""
+        best = None
+        best_order = None
+        for length in self.lang_name_lengths:
+            if length > len(text):
+                break
+            if length < len(text) and text[length] not in " /":
+                continue
+            order = self.lang_name_order.get(text[:length])
+            if order is not None and (best_order is None or order < best_order):
+                best = text[:length]
+                best_order = order
+        return best
+
+    def category_lang_name(self, category: str) -> Optional[str]:
+        """Returns the language name that a category starts with, possibly
+        after the Rhymes: namespace prefix."""
+        if category.startswith(self.rhymes_prefix):
+            name = self.starting_lang_name(category[len(self.rhymes_prefix) :])
+            if name is not None:
+                return name
+        return self.starting_lang_name(category)
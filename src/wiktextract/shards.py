@@ -0,0 +1,138 @@
+# Writing extracted data into per-worker shard files and merging them
+# into a single sorted JSON lines file.
+#
+# Each worker process appends the JSON lines of the pages it has processed
+# to the shard file of its worker slot, so the output does not need to go
+# through the parent process.  A worker that replaces a killed one uses the
+# same slot and keeps appending to the same shard.  The shards are merged
+# with an external merge sort, which produces a file sorted by (lang_code,
+# word, pos) regardless of the order in which the pages were processed.
+# Each line is parsed once, when its run is sorted.  The sorted runs store
+# the sort key before each line, encoded so that the lines of the runs sort
+# as plain strings and the runs can be merged without parsing anything.
+
+import gzip
+import heapq
+import itertools
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Iterator, List, TextIO, Tuple, Union
+
+SHARD_PREFIX = "wiktextract-"
+
+# Maximum number of lines sorted in memory at a time when merging shards
+MAX_RUN_LINES = 1000000
+
+# Escapes the control characters in sort key fields in an order-preserving
+# way, as "\x1f" followed by a character from "@" to "_".  Escaped fields
+# only contain characters that sort after "\t", so the fields can be
+# separated with tabs.
+KEY_ESCAPES = str.maketrans(
+    {chr(i): "\x1f" + chr(0x40 + i) for i in range(0x20)}
+)
+
+
+def shard_path(out_dir: Union[str, Path], name: str, compress: bool) -> Path:
+    suffix = ".jsonl.gz" if compress else ".jsonl"
+    return Path(out_dir) / f"{SHARD_PREFIX}{name}{suffix}"
+
+
+def write_shard(
+    out_dir: Union[str, Path], slot: int, jsonl: str, compress: bool = False
+) -> None:
+    """Appends JSON lines to the shard file of worker slot ``slot``, so
+    that there are at most as many shards as worker processes.  Compressed
+    shards get one gzip member per call, so that the file stays valid even
+    if the process is terminated without closing anything."""
+    if not jsonl:
+        return
+    data = jsonl.encode("utf-8")
+    if compress:
+        data = gzip.compress(data)
+    with shard_path(out_dir, str(slot), compress).open("ab") as f:
+        f.write(data)
+
+
+def find_shards(out_dir: Union[str, Path]) -> List[Path]:
+    return sorted(
+        p
+        for p in Path(out_dir).glob(f"{SHARD_PREFIX}*")
+        if p.name.endswith((".jsonl", ".jsonl.gz"))
+    )
+
+
+def remove_shards(out_dir: Union[str, Path]) -> None:
+    """Removes shard files left in the directory by an earlier run."""
+    for path in find_shards(out_dir):
+        path.unlink()
+
+
+def read_lines(path: Path) -> Iterator[str]:
+    if path.name.endswith(".gz"):
+        f = gzip.open(path, "rt", encoding="utf-8")
+    else:
+        f = path.open(encoding="utf-8")
+    with f:
+        for line in f:
+            if line.strip():
+                yield line if line.endswith("\n") else line + "\n"
+
+
+def sort_key(line: str) -> Tuple[str, str, str, str]:
+    """Sorts entries by language code, word and part-of-speech.  The whole
+    line breaks ties, which makes the merged output fully deterministic.
+    Redirects have no word, so they are sorted by their title."""
+    data = json.loads(line)
+    return (
+        data.get("lang_code", ""),
+        data.get("word", data.get("title", "")),
+        data.get("pos", ""),
+        line,
+    )
+
+
+def run_line(key: Tuple[str, str, str, str]) -> str:
+    """Line of a sorted run: the escaped fields of the sort key and the
+    line, separated by tabs.  These lines sort like the keys, and JSON
+    lines don't contain tabs."""
+    return (
+        "\t".join(str(field).translate(KEY_ESCAPES) for field in key[:3])
+        + "\t"
+        + key[3]
+    )
+
+
+def merge_shards(
+    shards: List[Path], out_f: TextIO, max_run_lines: int = MAX_RUN_LINES
+) -> int:
+    """Writes the lines of all shards into ``out_f`` sorted by sort_key().
+    The shards are first split into sorted runs of at most ``max_run_lines``
+    lines, which are then merged in a single streaming pass, so memory use
+    does not depend on the total size of the data.  Returns the number of
+    lines written."""
+    with tempfile.TemporaryDirectory(
+        prefix="wiktextract-runs", dir=shards[0].parent if shards else None
+    ) as tmpdirname:
+        runs = []
+        for shard in shards:
+            lines = read_lines(shard)
+            while True:
+                chunk = list(itertools.islice(lines, max_run_lines))
+                if not chunk:
+                    break
+                chunk = sorted(run_line(sort_key(line)) for line in chunk)
+                run_path = Path(tmpdirname) / f"run-{len(runs)}.txt"
+                with run_path.open("w", encoding="utf-8") as f:
+                    f.writelines(chunk)
+                runs.append(run_path)
+        logging.info(
+            f"Merging {len(runs)} sorted runs from {len(shards)} shards"
+        )
+
+        count = 0
+        for line in heapq.merge(*map(read_lines, runs)):
+            out_f.write(line.split("\t", 3)[3])
+            count += 1
+        return count
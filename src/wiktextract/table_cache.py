@@ -0,0 +1,79 @@
+# Caching tables derived from the tag and topic tables on disk.
+#
+# Some tables, like the tree of valid tag sequences used by decode_tags(),
+# take much longer to build from the source tables in Python code than to
+# load.  They are built on first use and saved in the cache directory,
+# keyed by a hash of the source files they are built from, so later runs
+# and the other worker processes only need to load them.  If the cache
+# directory cannot be written, the tables are just built in each process.
+
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from .description_cache import tables_hash
+
+# Environment variable that overrides the cache directory
+CACHE_DIR_ENV = "WIKTEXTRACT_CACHE_DIR"
+
+
+def cache_dir() -> Path:
+    path = os.environ.get(CACHE_DIR_ENV)
+    if path:
+        return Path(path)
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache:
+        return Path(xdg_cache) / "wiktextract"
+    return Path.home() / ".cache" / "wiktextract"
+
+
+def marshal_version() -> str:
+    """Returns the part of the cached table file names that identifies the
+    Python version, as the marshal format depends on it."""
+    return "{}.{}-{}".format(
+        sys.version_info.major, sys.version_info.minor, marshal.version
+    )
+
+
+def table_path(name: str, source_files: Iterable[str]) -> Path:
+    """Returns the path of the cached table ``name`` built from the given
+    files of the wiktextract package.  The file name contains a hash of the
+    files, and of the Python version because the marshal format depends on
+    it."""
+    return cache_dir() / "{}-{}-{}.marshal".format(
+        name, tables_hash(source_files), marshal_version()
+    )
+
+
+def cached_table(
+    name: str, source_files: Iterable[str], build: Callable[[], Any]
+) -> Any:
+    """Returns the table ``name`` from the cache directory, or calls
+    ``build()`` to build it and saves it in the cache.  The table must only
+    contain values that the marshal module can serialize."""
+    path = table_path(name, source_files)
+    try:
+        with path.open("rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    table = build()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Other processes may be loading the table at the same time
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as f:
+            marshal.dump(table, f)
+        os.replace(tmp_path, path)
+        # Remove tables built from older source files.  Other Python
+        # versions may share the cache directory and still use theirs.
+        for old_path in path.parent.glob(
+            f"{name}-*-{marshal_version()}.marshal"
+        ):
+            if old_path != path:
+                old_path.unlink(missing_ok=True)
+    except OSError:
+        pass
+    return table
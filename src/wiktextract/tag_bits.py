@@ -0,0 +1,76 @@
+# Tagsets as integer bitmasks.
+#
+# Each tag gets a bit the first time it is seen, and each tag category has a
+# mask of the bits of its tags.  Merging tagsets and comparing the tags they
+# have in each category are then bitwise operations; tagsets are converted
+# back to sorted tuples of tags only when returned to the caller.
+
+import functools
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .tags import valid_tags
+
+# Bit of each tag seen so far
+tag_bits: Dict[str, int] = {}
+# Tag and category of each bit position
+bit_tags: List[str] = []
+bit_categories: List[Optional[str]] = []
+# Bits of the tags seen so far in each category of valid_tags
+category_masks: Dict[str, int] = {}
+
+
+def tag_bit(tag: str) -> int:
+    bit = tag_bits.get(tag)
+    if bit is None:
+        bit = 1 << len(bit_tags)
+        category = valid_tags.get(tag)
+        tag_bits[tag] = bit
+        bit_tags.append(tag)
+        bit_categories.append(category)
+        if category is not None:
+            category_masks[category] = category_masks.get(category, 0) | bit
+    return bit
+
+
+def tags_mask(tags: Iterable[str]) -> int:
+    mask = 0
+    for tag in tags:
+        mask |= tag_bit(tag)
+    return mask
+
+
+@functools.lru_cache(maxsize=65536)
+def tuple_mask(tags: Tuple[str, ...]) -> int:
+    """Cached tags_mask() for the tuples that tagsets are made of."""
+    return tags_mask(tags)
+
+
+def mask_bits(mask: int) -> Iterable[int]:
+    """Yields the bit positions set in ``mask``."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@functools.lru_cache(maxsize=65536)
+def mask_tags(mask: int) -> Tuple[str, ...]:
+    """Returns the tags in ``mask`` as a sorted tuple."""
+    return tuple(sorted(bit_tags[i] for i in mask_bits(mask)))
+
+
+@functools.lru_cache(maxsize=65536)
+def mask_categories(mask: int) -> Tuple[str, ...]:
+    """Returns the categories of the valid tags in ``mask``."""
+    categories = []
+    for i in mask_bits(mask):
+        category = bit_categories[i]
+        if category is not None and category not in categories:
+            categories.append(category)
+    return tuple(categories)
+
+
+@functools.lru_cache(maxsize=65536)
+def mask_category_masks(mask: int) -> Tuple[int, ...]:
+    """Returns the masks of the categories of the valid tags in ``mask``."""
+    return tuple(category_masks[c] for c in mask_categories(mask))
@@ -3,20 +3,20 @@
 #
 # Copyright (c) 2021 Tatu Ylonen.  See file LICENSE and https://ylonen.org
 import logging
-import os
 import sqlite3
 import tempfile
 import time
 import traceback
 from collections.abc import Iterable
 from dataclasses import dataclass
-from multiprocessing import Pool, current_process
+from multiprocessing import current_process
 from pathlib import Path
-from typing import List, Optional, Set, TextIO, Tuple
+from typing import Dict, Iterator, List, Optional, Set, TextIO, Tuple
 
 from wikitextprocessor import Page
 
-from .import_utils import import_extractor_module
+from .import_utils import get_extractor
+from .watchdog import SupervisedPool, watch_page
 from .wxr_context import WiktextractContext
 
 
@@ -39,11 +39,7 @@ def worker_func(
     page: Page,
 ) -> Tuple[bool, Optional[List[ThesaurusTerm]], dict, str]:
     wxr: WiktextractContext = worker_func.wxr
-    with tempfile.TemporaryDirectory(prefix="wiktextract") as tmpdirname:
-        debug_path = "{}/wiktextract-{}".format(tmpdirname, os.getpid())
-        with open(debug_path, "w", encoding="utf-8") as f:
-            f.write(page.title + "\n")
-
+    with watch_page(page.title):
         wxr.wtp.start_page(page.title)
         try:
             terms = extract_thesaurus_page(wxr, page)
@@ -66,16 +62,42 @@ def worker_func(
 def extract_thesaurus_page(
     wxr: WiktextractContext, page: Page
 ) -> Optional[List[ThesaurusTerm]]:
-    thesaurus_extractor_mod = import_extractor_module(
-        wxr.wtp.lang_code, "thesaurus"
-    )
+    thesaurus_extractor_mod = get_extractor(wxr.wtp.lang_code).thesaurus_module
     return thesaurus_extractor_mod.extract_thesaurus_page(wxr, page)
 
 
+def batch_worker_func(
+    pages: List[Page],
+) -> Tuple[List[ThesaurusTerm], dict, List[str]]:
+    """Processes a batch of thesaurus pages in a worker process.  Returns
+    the terms, statistics and messages of all pages, and the exception
+    messages of pages that failed."""
+    terms = []
+    stats = {}
+    errors = []
+    for page in pages:
+        success, page_terms, page_stats, err = worker_func(page)
+        if not success:
+            errors.append(err)
+            continue
+        if page_terms is not None:
+            terms.extend(page_terms)
+        for k, v in page_stats.items():
+            stats.setdefault(k, []).extend(v)
+    return terms, stats, errors
+
+
 def extract_thesaurus_data(
-    wxr: WiktextractContext, num_processes: Optional[int] = None
+    wxr: WiktextractContext,
+    num_processes: Optional[int] = None,
+    page_timeout: Optional[float] = None,
 ) -> None:
-    from .wiktionary import init_worker_process
+    from .wiktionary import (
+        DEFAULT_BATCH_SIZE,
+        batch_pages,
+        batch_without_page,
+        init_worker_process,
+    )
 
     start_t = time.time()
     logging.info("Extracting thesaurus data")
@@ -83,21 +105,32 @@ def extract_thesaurus_data(
     thesaurus_ns_id = thesaurus_ns_data.get("id")
 
     wxr.remove_unpicklable_objects()
-    with Pool(num_processes, init_worker_process, (worker_func, wxr)) as pool:
+    with SupervisedPool(
+        num_processes,
+        batch_worker_func,
+        init_worker_process,
+        (worker_func, wxr),
+        page_timeout=page_timeout,
+        retry_fn=batch_without_page,
+    ) as pool:
         wxr.reconnect_databases(False)
-        for success, terms, stats, err in pool.imap_unordered(
-            worker_func, wxr.wtp.get_all_pages([thesaurus_ns_id], False)
-        ):
-            if not success:
-                # Print error in parent process - do not remove
-                logging.error(err)
-                continue
-            if terms is not None:
-                for term in terms:
-                    insert_thesaurus_term(wxr.thesaurus_db_conn, term)
-            wxr.config.merge_return(stats)
-
-    wxr.thesaurus_db_conn.commit()
+
+        def term_batches() -> Iterator[List[ThesaurusTerm]]:
+            for terms, stats, errors in pool.imap_unordered(
+                batch_pages(
+                    wxr.wtp.get_all_pages([thesaurus_ns_id], False),
+                    DEFAULT_BATCH_SIZE,
+                )
+            ):
+                for err in errors:
+                    # Print error in parent process - do not remove
+                    logging.error(err)
+                wxr.config.merge_return(stats)
+                yield terms
+
+        insert_thesaurus_terms(wxr.thesaurus_db_conn, term_batches())
+        wxr.config.errors.extend(pool.skipped)
+
     num_pages = wxr.wtp.saved_page_nums([thesaurus_ns_id], False)
     total = thesaurus_linkage_number(wxr.thesaurus_db_conn)
     logging.info(
@@ -179,36 +212,141 @@ def search_thesaurus(
         )
 
 
-def insert_thesaurus_term(
-    db_conn: sqlite3.Connection, term: ThesaurusTerm
+def load_thesaurus_index(
+    db_conn: sqlite3.Connection,
+) -> Dict[Tuple[str, str, str], List[ThesaurusTerm]]:
+    """Loads all terms into a dictionary keyed by (entry, language code,
+    part-of-speech), so that looking up words that are not in the thesaurus,
+    which is the common case, doesn't query the database."""
+    start_t = time.time()
+    index = {}
+    for r in db_conn.execute(
+        "SELECT term, entries.id, linkage, tags, topics, roman, "
+        "language_variant, sense, entry, pos, language_code "
+        "FROM terms JOIN entries ON terms.entry_id = entries.id"
+    ):
+        term = ThesaurusTerm(
+            term=r[0],
+            entry_id=r[1],
+            linkage=r[2],
+            tags=r[3],
+            topics=r[4],
+            roman=r[5],
+            language_variant=r[6],
+            sense=r[7],
+            entry=r[8],
+            pos=r[9],
+            language_code=r[10],
+        )
+        index.setdefault((term.entry, term.language_code, term.pos), []).append(
+            term
+        )
+    logging.info(
+        "Loaded thesaurus terms of {} entries (took {:.1f}s)".format(
+            len(index), time.time() - start_t
+        )
+    )
+    return index
+
+
+def lookup_thesaurus(
+    wxr: WiktextractContext,
+    entry: str,
+    lang_code: str,
+    pos: str,
+    linkage_type: Optional[str] = None,
+) -> Iterable[ThesaurusTerm]:
+    """Like search_thesaurus(), but uses the in-memory index of the
+    thesaurus when one has been loaded.  Lookups answered from the index
+    count as hits of the "thesaurus" cache in --statistics, and queries of
+    the database as misses."""
+    wxr.config.count_cache_lookup("thesaurus", wxr.thesaurus_index is not None)
+    if wxr.thesaurus_index is None:
+        return search_thesaurus(
+            wxr.thesaurus_db_conn, entry, lang_code, pos, linkage_type
+        )
+    terms = wxr.thesaurus_index.get((entry, lang_code, pos), ())
+    if linkage_type is not None:
+        terms = [term for term in terms if term.linkage == linkage_type]
+    return terms
+
+
+def insert_thesaurus_terms(
+    db_conn: sqlite3.Connection,
+    term_batches: Iterable[List[ThesaurusTerm]],
 ) -> None:
-    entry_id = None
-    for (new_entry_id,) in db_conn.execute(
-        "INSERT OR IGNORE INTO entries (entry, language_code, pos, sense) "
-        "VALUES(?, ?, ?, ?) RETURNING id",
-        (term.entry, term.language_code, term.pos, term.sense),
+    """Loads batches of terms into the database in a single transaction.
+    Entries are deduplicated in memory and their ids assigned here, so
+    both tables can be written with executemany().  The index of the
+    entries table is created after the load.  As with INSERT OR IGNORE,
+    the first sense of an entry and the first of duplicate terms is
+    kept.  Like the unique index, NULL values are not equal to each other,
+    so a term whose entry, language code or part of speech is missing
+    always gets an entry of its own."""
+    entry_ids = {}
+    next_id = 1
+    for entry_id, entry, pos, lang_code in db_conn.execute(
+        "SELECT id, entry, pos, language_code FROM entries"
     ):
-        entry_id = new_entry_id
-    if entry_id is None:
-        for (old_entry_id,) in db_conn.execute(
-            "SELECT id FROM entries WHERE entry = ? AND language_code = ? "
-            "AND pos = ?",
-            (term.entry, term.language_code, term.pos),
-        ):
-            entry_id = old_entry_id
-    db_conn.execute(
-        "INSERT OR IGNORE INTO terms (term, entry_id, linkage, tags, topics, "
-        "roman, language_variant) VALUES(?, ?, ?, ?, ?, ?, ?)",
-        (
-            term.term,
-            entry_id,
-            term.linkage,
-            term.tags,
-            term.topics,
-            term.roman,
-            term.language_variant,
-        ),
+        if None not in (entry, pos, lang_code):
+            entry_ids[(entry, pos, lang_code)] = entry_id
+        next_id = max(next_id, entry_id + 1)
+
+    db_conn.executescript(
+        """
+        PRAGMA synchronous = OFF;
+        PRAGMA cache_size = -262144;
+        DROP INDEX IF EXISTS entries_index;
+        """
     )
+    try:
+        for terms in term_batches:
+            new_entries = []
+            new_terms = []
+            for term in terms:
+                key = (term.entry, term.pos, term.language_code)
+                entry_id = entry_ids.get(key)
+                if entry_id is None:
+                    entry_id = next_id
+                    next_id += 1
+                    if None not in key:
+                        entry_ids[key] = entry_id
+                    new_entries.append((entry_id, *key, term.sense))
+                new_terms.append(
+                    (
+                        term.term,
+                        entry_id,
+                        term.linkage,
+                        term.tags,
+                        term.topics,
+                        term.roman,
+                        term.language_variant,
+                    )
+                )
+            db_conn.executemany(
+                "INSERT INTO entries (id, entry, pos, language_code, sense) "
+                "VALUES(?, ?, ?, ?, ?)",
+                new_entries,
+            )
+            db_conn.executemany(
+                "INSERT OR IGNORE INTO terms (term, entry_id, linkage, tags, "
+                "topics, roman, language_variant) VALUES(?, ?, ?, ?, ?, ?, ?)",
+                new_terms,
+            )
+    except BaseException:
+        db_conn.rollback()
+        raise
+    else:
+        db_conn.commit()
+    finally:
+        db_conn.executescript(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS entries_index
+            ON entries(entry, pos, language_code);
+            PRAGMA synchronous = FULL;
+            PRAGMA cache_size = -2000;
+            """
+        )
 
 
 def close_thesaurus_db(db_path: Path, db_conn: sqlite3.Connection) -> None:
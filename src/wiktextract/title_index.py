@@ -0,0 +1,90 @@
+# In-memory index of all page titles in the database.
+#
+# page_exists() checks are made from heuristics that run many times per
+# page, and each of them would otherwise be a query to the SQLite database.
+# The index is built once in the parent process before the worker processes
+# are created.  The titles are stored sorted in a single bytes object with
+# an array of offsets, so that the index takes little memory and, as it is
+# never modified, stays shared between forked worker processes.  A Bloom
+# filter answers most lookups of titles that don't exist without searching
+# the titles.
+
+import hashlib
+import logging
+import time
+from array import array
+from typing import Iterable
+
+from wikitextprocessor import Wtp
+
+# Bloom filter size; 10 bits per title and 7 hashes give about 1% false
+# positives
+BLOOM_BITS_PER_TITLE = 10
+BLOOM_HASHES = 7
+
+
+def bloom_hashes(data: bytes, num_bits: int) -> Iterable[int]:
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return ((h1 + i * h2) % num_bits for i in range(BLOOM_HASHES))
+
+
+class TitleIndex:
+    """Immutable set of page titles.  ``title in index`` is equivalent to
+    Wtp.page_exists(title) for the pages in the database when the index
+    was built."""
+
+    def __init__(self, titles: Iterable[str]):
+        encoded = sorted({title.encode("utf-8") for title in titles})
+        self.num_titles = len(encoded)
+        self.data = b"".join(encoded)
+        # Start offset of each title in data, and the end of data
+        self.offsets = array("Q", [0])
+        ofs = 0
+        for title in encoded:
+            ofs += len(title)
+            self.offsets.append(ofs)
+        self.num_bits = max(64, self.num_titles * BLOOM_BITS_PER_TITLE)
+        bloom = bytearray((self.num_bits + 7) // 8)
+        for title in encoded:
+            for bit in bloom_hashes(title, self.num_bits):
+                bloom[bit >> 3] |= 1 << (bit & 7)
+        self.bloom = bytes(bloom)
+
+    @classmethod
+    def from_wtp(cls, wtp: Wtp) -> "TitleIndex":
+        start_t = time.time()
+        index = cls(
+            title for (title,) in wtp.db_conn.execute("SELECT title FROM pages")
+        )
+        logging.info(
+            "Indexed {} page titles (took {:.1f}s)".format(
+                index.num_titles, time.time() - start_t
+            )
+        )
+        return index
+
+    def __len__(self) -> int:
+        return self.num_titles
+
+    def __contains__(self, title: str) -> bool:
+        key = title.encode("utf-8")
+        bloom = self.bloom
+        for bit in bloom_hashes(key, self.num_bits):
+            if not bloom[bit >> 3] & (1 << (bit & 7)):
+                return False
+        data = self.data
+        offsets = self.offsets
+        lo = 0
+        hi = self.num_titles
+        while lo < hi:
+            mid = (lo + hi) // 2
+            value = data[offsets[mid] : offsets[mid + 1]]
+            if value < key:
+                lo = mid + 1
+            elif value > key:
+                hi = mid
+            else:
+                return True
+        return False
@@ -9,7 +9,7 @@ from wikitextprocessor import MAGIC_FIRST, MAGIC_LAST
 
 from .datautils import split_at_comma_semi, data_append, data_extend
 from .form_descriptions import (classify_desc, decode_tags,
-                                nested_translations_re, tr_note_re,
+                                get_nested_translations_re, tr_note_re,
                                 parse_translation_desc)
 
 
@@ -315,9 +315,9 @@ def parse_translation_item_text(wxr, word, data, item, sense, pos_datas,
 
     # Find and remove nested translations from the item
     nested = list(m.group(1)
-                  for m in re.finditer(nested_translations_re, item))
+                  for m in re.finditer(get_nested_translations_re(), item))
     if nested:
-        item = re.sub(nested_translations_re, "", item)
+        item = re.sub(get_nested_translations_re(), "", item)
 
     if re.search(r"\(\d+\)|\[\d+\]", item) and "numeral:" not in item:
         wxr.wtp.debug("possible sense number in translation item: {}"
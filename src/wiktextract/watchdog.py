@@ -0,0 +1,366 @@
+# Supervising the worker processes that extract pages.
+#
+# Each worker process publishes the title of the page it is processing and
+# the time it started into a slot in shared memory.  The parent process
+# checks the slots while waiting for results.  It logs the pages that have
+# taken longer than a threshold and asks the worker to dump its stack trace
+# to stderr.  If a page takes longer than the page timeout, the worker is
+# killed and replaced by a new one, and the page is skipped.  Nothing is
+# written to the file system while processing pages.
+
+import ctypes
+import faulthandler
+import logging
+import multiprocessing
+import os
+import signal
+import time
+import traceback
+from contextlib import contextmanager
+from multiprocessing.connection import wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+# Maximum length of a page title in a slot, in UTF-8 bytes
+TITLE_BYTES = 512
+
+# Pages taking longer than this many seconds are logged
+SLOW_PAGE_SECONDS = 100.0
+
+# How often the parent process checks the slots, in seconds
+CHECK_INTERVAL = 5.0
+
+# How many times a task is run again after its worker died between pages
+MAX_TASK_RETRIES = 2
+
+# Signal that makes a worker process dump its stack trace
+DUMP_SIGNAL = getattr(signal, "SIGUSR1", None)
+
+# Watchdog of the current worker process, set by PageWatchdog.attach()
+worker_watchdog: Optional["PageWatchdog"] = None
+
+
+class PageWatchdog:
+    """Shared memory slots for the pages being processed by worker
+    processes, one slot per worker.  Create this in the parent process
+    before the worker processes and call attach() in each worker."""
+
+    def __init__(self, num_slots: int, threshold: float = SLOW_PAGE_SECONDS):
+        self.num_slots = num_slots
+        self.threshold = threshold
+        self.titles = multiprocessing.RawArray(
+            ctypes.c_char, num_slots * TITLE_BYTES
+        )
+        # Start time of the current page in each slot, 0 when idle
+        self.start_times = multiprocessing.RawArray(ctypes.c_double, num_slots)
+        self.pids = multiprocessing.RawArray(ctypes.c_int, num_slots)
+        # Slot of the current worker process
+        self.slot = None
+
+    def attach(self, slot: int) -> None:
+        """Makes the current worker process use the given slot."""
+        global worker_watchdog
+
+        self.slot = slot
+        self.pids[slot] = os.getpid()
+        self.start_times[slot] = 0.0
+        worker_watchdog = self
+        if DUMP_SIGNAL is not None:
+            faulthandler.register(DUMP_SIGNAL, all_threads=True)
+
+    def start_page(self, title: str) -> None:
+        if self.slot is None:
+            return
+        data = title.encode("utf-8")[: TITLE_BYTES - 1]
+        ofs = self.slot * TITLE_BYTES
+        self.start_times[self.slot] = 0.0
+        self.titles[ofs : ofs + len(data) + 1] = data + b"\0"
+        self.start_times[self.slot] = time.time()
+
+    def end_page(self) -> None:
+        if self.slot is not None:
+            self.start_times[self.slot] = 0.0
+
+    def current_title(self, slot: int) -> str:
+        ofs = slot * TITLE_BYTES
+        data = self.titles[ofs : ofs + TITLE_BYTES]
+        return data.split(b"\0", 1)[0].decode("utf-8", errors="replace")
+
+    def current_page(self, slot: int) -> Optional[Tuple[str, float]]:
+        """Returns the title and start time of the page the worker in
+        ``slot`` is processing, None if it is not processing a page.  The
+        start time is read before and after the title, so that a title
+        being replaced by the worker is not returned."""
+        start_t = self.start_times[slot]
+        if not start_t:
+            return None
+        title = self.current_title(slot)
+        if self.start_times[slot] != start_t:
+            return None
+        return title, start_t
+
+    def page_duration(self, slot: int) -> float:
+        """Returns how long the worker in ``slot`` has been processing its
+        current page, 0 if it is not processing a page."""
+        start_t = self.start_times[slot]
+        return time.time() - start_t if start_t else 0.0
+
+    def check(self, reported: set) -> None:
+        """Logs the pages that have been processed for longer than the
+        threshold.  ``reported`` holds the (pid, start time) pairs already
+        logged, so that each slow page is logged once."""
+        now = time.time()
+        for slot in range(self.num_slots):
+            start_t = self.start_times[slot]
+            pid = self.pids[slot]
+            if not start_t or now - start_t < self.threshold:
+                continue
+            if (pid, start_t) in reported:
+                continue
+            reported.add((pid, start_t))
+            logging.warning(
+                "====== WARNING: PAGE {!r} HAS TAKEN {:.1f}s IN PROCESS "
+                "{}".format(self.current_title(slot), now - start_t, pid)
+            )
+            if DUMP_SIGNAL is not None:
+                try:
+                    os.kill(pid, DUMP_SIGNAL)
+                except ProcessLookupError:
+                    pass
+
+
+def worker_slot() -> int:
+    """Returns the slot of the current worker process, 0 outside the
+    worker processes of a SupervisedPool."""
+    watchdog = worker_watchdog
+    if watchdog is None or watchdog.slot is None:
+        return 0
+    return watchdog.slot
+
+
+@contextmanager
+def watch_page(title: str) -> Iterator[None]:
+    """Publishes ``title`` as the page the current worker process is
+    processing while the block runs.  Does nothing outside the worker
+    processes of a SupervisedPool."""
+    watchdog = worker_watchdog
+    if watchdog is None:
+        yield
+        return
+    watchdog.start_page(title)
+    try:
+        yield
+    finally:
+        watchdog.end_page()
+
+
+def worker_main(
+    conn,
+    watchdog: PageWatchdog,
+    slot: int,
+    initializer: Optional[Callable],
+    initargs: tuple,
+    func: Callable,
+) -> None:
+    watchdog.attach(slot)
+    if initializer is not None:
+        initializer(*initargs)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        try:
+            result = True, func(task)
+        except Exception:
+            result = False, traceback.format_exc()
+        conn.send(result)
+
+
+class Worker:
+    def __init__(self, process: multiprocessing.Process, conn):
+        self.process = process
+        self.conn = conn
+        # Task being processed, None when idle
+        self.task = None
+        # How many times the task has been run again after the worker
+        # processing it died between pages
+        self.retries = 0
+
+
+class SupervisedPool:
+    """Worker processes that call ``func`` on tasks, like
+    multiprocessing.Pool.imap_unordered().  A worker that has been
+    processing the same page for longer than ``page_timeout`` seconds, or
+    that dies while processing a page, is replaced by a new worker and the
+    page is skipped.  ``retry_fn(task, title)`` returns the task to run
+    again without the skipped page, or None if nothing is left to run.  A
+    task whose worker dies between pages is run again as such, at most
+    MAX_TASK_RETRIES times.  Skipped pages are logged and saved in
+    ``skipped`` in the same format as Wtp errors."""
+
+    def __init__(
+        self,
+        num_processes: Optional[int],
+        func: Callable,
+        initializer: Optional[Callable] = None,
+        initargs: tuple = (),
+        page_timeout: Optional[float] = None,
+        retry_fn: Optional[Callable[[Any, str], Any]] = None,
+    ):
+        self.num_processes = num_processes or os.cpu_count() or 1
+        self.func = func
+        self.initializer = initializer
+        self.initargs = initargs
+        self.page_timeout = page_timeout
+        self.retry_fn = retry_fn
+        self.watchdog = PageWatchdog(self.num_processes)
+        self.skipped: List[Dict] = []
+        self.retry = []
+        self.workers = [self.start_worker(i) for i in range(self.num_processes)]
+
+    def __enter__(self) -> "SupervisedPool":
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb) -> None:
+        self.close(terminate=exc_type is not None)
+
+    def start_worker(self, slot: int) -> Worker:
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=worker_main,
+            args=(
+                child_conn,
+                self.watchdog,
+                slot,
+                self.initializer,
+                self.initargs,
+                self.func,
+            ),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return Worker(process, parent_conn)
+
+    def close(self, terminate: bool = False) -> None:
+        for worker in self.workers:
+            if terminate:
+                worker.process.kill()
+                continue
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in self.workers:
+            worker.process.join()
+            worker.conn.close()
+        self.workers = []
+
+    def replace_worker(
+        self, slot: int, reason: str, page: Optional[Tuple[str, float]]
+    ) -> None:
+        """Kills the worker in ``slot`` and starts a new worker.  ``page``
+        is the (title, start time) of the page it was processing, which is
+        skipped, or None if it died between pages.  The rest of its task
+        is run again."""
+        worker = self.workers[slot]
+        worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+        self.watchdog.start_times[slot] = 0.0
+        self.workers[slot] = self.start_worker(slot)
+        if page is None:
+            if worker.retries >= MAX_TASK_RETRIES:
+                logging.error(f"=== {reason} between pages, task dropped")
+                return
+            logging.error(f"=== {reason} between pages, task retried")
+            self.retry.append((worker.task, worker.retries + 1))
+            return
+        title = page[0]
+        msg = f"page skipped, {reason}"
+        logging.error(f"=== {msg}: {title!r}")
+        self.skipped.append(
+            {
+                "msg": msg,
+                "trace": "",
+                "title": title,
+                "section": None,
+                "subsection": None,
+                "called_from": "watchdog",
+                "path": (),
+            }
+        )
+        if self.retry_fn is not None:
+            task = self.retry_fn(worker.task, title)
+            if task is not None:
+                self.retry.append((task, 0))
+
+    def next_task(self, tasks: Iterator) -> Tuple[Optional[Any], int]:
+        """Returns the next task to run and how many times it has been
+        run again after its worker died between pages."""
+        if self.retry:
+            return self.retry.pop()
+        return next(tasks, None), 0
+
+    def check_timeouts(self) -> None:
+        """Replaces the workers that have been processing the same page for
+        longer than the page timeout."""
+        now = time.time()
+        for slot in range(self.num_processes):
+            page = self.watchdog.current_page(slot)
+            if page is None or now - page[1] <= self.page_timeout:
+                continue
+            # The page may have been finished after it was read
+            if self.watchdog.start_times[slot] != page[1]:
+                continue
+            self.replace_worker(
+                slot, f"timeout of {self.page_timeout:g}s exceeded", page
+            )
+
+    def imap_unordered(self, tasks: Iterable) -> Iterator:
+        """Yields the return values of ``func`` in the order they are
+        completed.  Tasks must not be None."""
+        tasks = iter(tasks)
+        reported = set()
+        while True:
+            for worker in self.workers:
+                if worker.task is None:
+                    worker.task, worker.retries = self.next_task(tasks)
+                    if worker.task is not None:
+                        worker.conn.send(worker.task)
+            busy = {
+                worker.conn: slot
+                for slot, worker in enumerate(self.workers)
+                if worker.task is not None
+            }
+            if not busy:
+                break
+            for conn in wait(list(busy), CHECK_INTERVAL):
+                slot = busy[conn]
+                try:
+                    success, result = conn.recv()
+                except (EOFError, OSError):
+                    self.replace_worker(
+                        slot,
+                        "worker process died",
+                        self.watchdog.current_page(slot),
+                    )
+                    continue
+                self.workers[slot].task = None
+                if not success:
+                    raise RuntimeError(result)
+                yield result
+            self.watchdog.check(reported)
+            if self.page_timeout is not None:
+                self.check_timeouts()
@@ -5,44 +5,54 @@
 # Copyright (c) 2018-2022 Tatu Ylonen.  See file LICENSE and https://ylonen.org
 
 import io
+import itertools
 import json
 import logging
 import os
 import re
 import tarfile
-import tempfile
 import time
 import traceback
-from multiprocessing import Pool, current_process
+from functools import partial
+from multiprocessing import current_process
 from pathlib import Path
-from typing import Dict, List, Optional, Set, TextIO, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
 
 from wikitextprocessor import Page
 from wikitextprocessor.dumpparser import process_dump
 
 from .page import parse_page
+from .shards import (
+    find_shards,
+    merge_shards,
+    remove_shards,
+    shard_path,
+    write_shard,
+)
 from .thesaurus import (
     emit_words_in_thesaurus,
     extract_thesaurus_data,
+    load_thesaurus_index,
     thesaurus_linkage_number,
 )
+from .title_index import TitleIndex
+from .watchdog import SupervisedPool, watch_page, worker_slot
 from .wxr_context import WiktextractContext
 
+# Number of pages sent to a worker process at a time
+DEFAULT_BATCH_SIZE = 100
+
 
 def page_handler(page: Page) -> Tuple[bool, Tuple[List[dict], dict], str]:
     # Make sure there are no newlines or other strange characters in the
     # title.  They could cause security problems at several post-processing
     # steps.
     wxr: WiktextractContext = page_handler.wxr
-    # Helps debug extraction hangs. This writes the path of each file being
-    # processed into /tmp/wiktextract*/wiktextract-*.  Once a hang
-    # has been observed, these files contain page(s) that hang.  They should
-    # be checked before aborting the process, as an interrupt might delete them.
-    with tempfile.TemporaryDirectory(prefix="wiktextract") as tmpdirname:
-        debug_path = "{}/wiktextract-{}".format(tmpdirname, os.getpid())
-        with open(debug_path, "w", encoding="utf-8") as f:
-            f.write(page.title + "\n")
-
+    # Helps debug extraction hangs.  The title of the page being processed
+    # is published to the parent process, which logs pages that take too
+    # long, makes the worker dump its stack trace and kills the worker if
+    # the page timeout is exceeded.
+    with watch_page(page.title):
         wxr.wtp.start_page(page.title)
         try:
             title = re.sub(r"[\s\000-\037]+", " ", page.title)
@@ -85,6 +95,69 @@ def page_handler(page: Page) -> Tuple[bool, Tuple[List[dict], dict], str]:
             return False, ([], {}), msg
 
 
+def batch_page_handler(
+    pages: List[Page],
+    human_readable: bool = False,
+    out_dir: Optional[str] = None,
+    compress_shards: bool = False,
+) -> Tuple[int, str, List[Tuple[str, str, str]], dict, List[str]]:
+    """Processes a batch of pages in a worker process.  The extracted data
+    is serialized here, so that the parent process only needs to write it
+    out.  Returns the number of pages in the batch, the JSON lines, the
+    (word, lang_code, pos) keys of emitted entries, the statistics and
+    messages collected from all pages, and the exception messages of pages
+    that failed.  If ``out_dir`` is given, the JSON lines are instead
+    appended to the shard file of this worker slot in that directory."""
+    wxr: WiktextractContext = page_handler.wxr
+    out_f = io.StringIO()
+    emitted = []
+    stats = {}
+    errors = []
+    for page in pages:
+        success, (page_data, page_stats), err = page_handler(page)
+        if not success:
+            errors.append(err)
+            continue
+        for k, v in page_stats.items():
+            stats.setdefault(k, []).extend(v)
+        for dt in page_data:
+            write_json_data(dt, out_f, human_readable)
+            word = dt.get("word")
+            lang_code = dt.get("lang_code")
+            pos = dt.get("pos")
+            if word and lang_code and pos:
+                emitted.append((word, lang_code, pos))
+    if wxr.extraction_cache is not None:
+        wxr.extraction_cache.commit()
+    if wxr.dependency_db is not None:
+        wxr.dependency_db.commit()
+    if wxr.description_cache is not None:
+        wxr.description_cache.commit()
+        wxr.description_cache.move_counts(wxr.config.cache_counts)
+    stats.update(wxr.config.to_return())
+    wxr.config.reset_stats()
+    jsonl = out_f.getvalue()
+    if out_dir is not None:
+        write_shard(out_dir, worker_slot(), jsonl, compress_shards)
+        jsonl = ""
+    return len(pages), jsonl, emitted, stats, errors
+
+
+def batch_without_page(pages: List[Page], title: str) -> Optional[List[Page]]:
+    """Returns the pages of a batch except the page that was skipped."""
+    pages = [page for page in pages if page.title != title]
+    return pages or None
+
+
+def batch_pages(
+    pages: Iterable[Page], batch_size: int
+) -> Iterator[List[Page]]:
+    """Groups pages into lists of at most ``batch_size`` pages."""
+    it = iter(pages)
+    while batch := list(itertools.islice(it, batch_size)):
+        yield batch
+
+
 def parse_wiktionary(
     wxr: WiktextractContext,
     dump_path: str,
@@ -96,6 +169,10 @@ def parse_wiktionary(
     override_folders: Optional[List[str]] = None,
     skip_extract_dump: bool = False,
     save_pages_path: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    out_dir: Optional[str] = None,
+    compress_shards: bool = False,
+    page_timeout: Optional[float] = None,
 ) -> None:
     """Parses Wiktionary from the dump file ``path`` (which should point
     to a "enwiktionary-<date>-pages-articles.xml.bz2" file.  This
@@ -122,7 +199,16 @@ def parse_wiktionary(
     )
 
     if not phase1_only:
-        reprocess_wiktionary(wxr, num_processes, out_f, human_readable)
+        reprocess_wiktionary(
+            wxr,
+            num_processes,
+            out_f,
+            human_readable,
+            batch_size=batch_size,
+            out_dir=out_dir,
+            compress_shards=compress_shards,
+            page_timeout=page_timeout,
+        )
 
 
 def write_json_data(data: Dict, out_f: TextIO, human_readable: bool) -> None:
@@ -140,7 +226,6 @@ def estimate_progress(
     processed_pages: int, all_pages: int, start_time: float, last_time: float
 ) -> float:
     current_time = time.time()
-    processed_pages += 1
     if current_time - last_time > 1:
         remaining_pages = all_pages - processed_pages
         estimate_seconds = (
@@ -172,14 +257,24 @@ def reprocess_wiktionary(
     out_f: TextIO,
     human_readable: bool = False,
     search_pattern: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    out_dir: Optional[str] = None,
+    compress_shards: bool = False,
+    page_timeout: Optional[float] = None,
 ) -> None:
-    """Reprocesses the Wiktionary from the sqlite db."""
+    """Reprocesses the Wiktionary from the sqlite db.  Pages are sent to
+    the worker processes in batches of ``batch_size`` pages.  If ``out_dir``
+    is given, each worker slot writes its data into its own shard file
+    in that directory, and the shards are then merged into ``out_f`` (if
+    not None) sorted by language code, word and part-of-speech.  A page
+    that takes longer than ``page_timeout`` seconds is skipped, the worker
+    processing it is restarted, and the page is added to the errors."""
     logging.info("Second phase - processing pages")
 
     # Extract thesaurus data. This iterates over thesaurus pages,
     # but is very fast.
     if thesaurus_linkage_number(wxr.thesaurus_db_conn) == 0:
-        extract_thesaurus_data(wxr, num_processes)
+        extract_thesaurus_data(wxr, num_processes, page_timeout)
 
     emitted = set()
     process_ns_ids = list(
@@ -190,39 +285,63 @@ def reprocess_wiktionary(
     )
     start_time = time.time()
     last_time = start_time
+    processed_pages = 0
     all_page_nums = wxr.wtp.saved_page_nums(
         process_ns_ids, True, "wikitext", search_pattern
     )
+    if out_dir is not None:
+        # Shards must contain exactly one JSON object per line
+        human_readable = False
+        os.makedirs(out_dir, exist_ok=True)
+        remove_shards(out_dir)
+    if wxr.title_index is None:
+        wxr.title_index = TitleIndex.from_wtp(wxr.wtp)
+    # Loaded before creating the worker processes, so that they share it
+    wxr.thesaurus_index = load_thesaurus_index(wxr.thesaurus_db_conn)
     wxr.remove_unpicklable_objects()
-    with Pool(num_processes, init_worker_process, (page_handler, wxr)) as pool:
+    with SupervisedPool(
+        num_processes,
+        partial(
+            batch_page_handler,
+            human_readable=human_readable,
+            out_dir=out_dir,
+            compress_shards=compress_shards,
+        ),
+        init_worker_process,
+        (page_handler, wxr),
+        page_timeout=page_timeout,
+        retry_fn=batch_without_page,
+    ) as pool:
         wxr.reconnect_databases(False)
-        for processed_pages, (success, ret, err) in enumerate(
-            pool.imap_unordered(
-                page_handler,
+        for num_pages, jsonl, page_keys, stats, errors in pool.imap_unordered(
+            batch_pages(
                 wxr.wtp.get_all_pages(
                     process_ns_ids, True, "wikitext", search_pattern
                 ),
-            )
+                batch_size,
+            ),
         ):
-            if not success:
+            for err in errors:
                 # Print error in parent process - do not remove
                 logging.error(err)
-                continue
-
-            page_data, stats = ret
             wxr.config.merge_return(stats)
-            for dt in page_data:
-                write_json_data(dt, out_f, human_readable)
-                word = dt.get("word")
-                lang_code = dt.get("lang_code")
-                pos = dt.get("pos")
-                if word and lang_code and pos:
-                    emitted.add((word, lang_code, pos))
+            if out_f is not None and out_dir is None:
+                out_f.write(jsonl)
+            emitted.update(page_keys)
+            processed_pages += num_pages
             last_time = estimate_progress(
                 processed_pages, all_page_nums, start_time, last_time
             )
+        wxr.config.errors.extend(pool.skipped)
 
-    emit_words_in_thesaurus(wxr, emitted, out_f, human_readable)
+    if out_dir is None:
+        emit_words_in_thesaurus(wxr, emitted, out_f, human_readable)
+    else:
+        thesaurus_path = shard_path(out_dir, "thesaurus", False)
+        with thesaurus_path.open("w", encoding="utf-8") as f:
+            emit_words_in_thesaurus(wxr, emitted, f, False)
+        if out_f is not None:
+            merge_shards(find_shards(out_dir), out_f)
     logging.info("Reprocessing wiktionary complete")
 
 
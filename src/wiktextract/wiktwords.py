@@ -30,6 +30,17 @@ from wiktextract import (
     parse_wiktionary,
     reprocess_wiktionary,
 )
+from wiktextract.dependencies import (
+    DependencyDB,
+    changed_dependencies,
+    dependency_db_path,
+    pages_to_reextract,
+)
+from wiktextract.description_cache import (
+    DescriptionCache,
+    use_description_cache,
+)
+from wiktextract.extraction_cache import ExtractionCache
 from wiktextract.inflection import set_debug_cell_text
 from wiktextract.template_override import template_override_fns
 from wiktextract.thesaurus import (
@@ -37,7 +48,7 @@ from wiktextract.thesaurus import (
     extract_thesaurus_data,
     thesaurus_linkage_number,
 )
-from wiktextract.wiktionary import write_json_data
+from wiktextract.wiktionary import DEFAULT_BATCH_SIZE, write_json_data
 from wiktextract.wxr_context import WiktextractContext
 
 # Pages within these namespaces are captured.
@@ -53,6 +64,14 @@ RECOGNIZED_NAMESPACE_NAMES = [
 ]
 
 
+def positive_int(value: str) -> int:
+    """Argument type for options that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {value}")
+    return number
+
+
 def process_single_page(
     path_or_title: str,
     args: argparse.Namespace,
@@ -92,6 +111,19 @@ def process_single_page(
         write_json_data(data, out_f, human_readable)
 
 
+def print_affected_pages(wxr: WiktextractContext, old_db_path: str) -> None:
+    old_wtp = Wtp(db_path=old_db_path, lang_code=wxr.wtp.lang_code)
+    old_dependency_db = DependencyDB(dependency_db_path(old_db_path))
+    changed = changed_dependencies(
+        old_wtp, wxr.wtp, old_dependency_db.dependency_titles()
+    )
+    logging.info(f"{len(changed)} pages used by other pages have changed")
+    for title in pages_to_reextract(old_dependency_db, changed):
+        print(title)
+    old_dependency_db.close()
+    old_wtp.close_db_conn()
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Multilingual Wiktionary data extractor"
@@ -229,6 +261,74 @@ def main():
         default=None,
         help="Number of parallel processes (default: #cpus)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=positive_int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Number of pages sent to a worker process at a time "
+        f"(default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=str,
+        default=None,
+        help="Directory where each worker process writes its output into "
+        "its own shard file; the shards are merged into --out (if given) "
+        "sorted by language code, word and part-of-speech",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=None,
+        help="Number of shard files written with --out-dir, i.e., number of "
+        "worker processes (default: --num-processes)",
+    )
+    parser.add_argument(
+        "--compress-shards",
+        action="store_true",
+        default=False,
+        help="Write gzip compressed shard files with --out-dir",
+    )
+    parser.add_argument(
+        "--page-timeout",
+        type=float,
+        default=None,
+        help="Skip pages that take longer than this many seconds to "
+        "process; the worker process is restarted and the page is saved in "
+        "the errors (default: no timeout)",
+    )
+    parser.add_argument(
+        "--extraction-cache",
+        type=str,
+        default=None,
+        help="SQLite file in which to cache the data extracted from each "
+        "page; pages whose text and used templates and modules have not "
+        "changed since an earlier run are not parsed again",
+    )
+    parser.add_argument(
+        "--description-cache",
+        type=str,
+        default=None,
+        help="SQLite file in which to cache the results of decoding tags "
+        "and classifying descriptions, shared by the worker processes and "
+        "reused in later runs until the tag tables change",
+    )
+    parser.add_argument(
+        "--record-dependencies",
+        action="store_true",
+        default=False,
+        help="Save the Template, Module and other pages used by each page "
+        "in an SQLite file next to the database file",
+    )
+    parser.add_argument(
+        "--affected-pages",
+        type=str,
+        default=None,
+        metavar="OLD_DB_PATH",
+        help="Print the pages that used Template, Module or other pages that "
+        "are different in --db-path than in this older database (requires "
+        "--record-dependencies when extracting the older database)",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -342,9 +442,16 @@ def main():
     else:
         print("Capturing words for:", ", ".join(args.language))
 
+    if args.out_dir:
+        if args.human_readable:
+            logging.error("--human-readable can't be used with --out-dir")
+            sys.exit(1)
+        if args.shards:
+            args.num_processes = args.shards
+
     # Open output file.
     out_path = args.out
-    if not out_path and args.pages_dir:
+    if not out_path and (args.pages_dir or args.out_dir):
         out_f = None
     elif out_path and out_path != "-":
         if out_path.startswith("/dev/"):
@@ -426,6 +533,17 @@ def main():
     )
 
     wxr = WiktextractContext(context1, conf1)
+    if args.extraction_cache:
+        wxr.extraction_cache = ExtractionCache(args.extraction_cache, conf1)
+    if args.record_dependencies:
+        wxr.dependency_db = DependencyDB(dependency_db_path(wxr.wtp.db_path))
+    if args.description_cache:
+        wxr.description_cache = DescriptionCache(args.description_cache)
+        use_description_cache(wxr.description_cache)
+
+    if args.affected_pages:
+        print_affected_pages(wxr, args.affected_pages)
+        sys.exit(0)
 
     # load redirects if given
     if args.redirects_file:
@@ -458,6 +576,10 @@ def main():
                 args.override,
                 skip_extract_dump,
                 args.pages_dir,
+                args.batch_size,
+                args.out_dir,
+                args.compress_shards,
+                args.page_timeout,
             )
 
         if args.override is not None and args.path is None:
@@ -490,6 +612,10 @@ def main():
                 out_f,
                 args.human_readable,
                 search_pattern=args.search_pattern,
+                batch_size=args.batch_size,
+                out_dir=args.out_dir,
+                compress_shards=args.compress_shards,
+                page_timeout=args.page_timeout,
             )
 
     finally:
@@ -506,6 +632,14 @@ def main():
         with open(args.categories_file, "w") as f:
             json.dump(tree, f, indent=2, sort_keys=True)
 
+    if wxr.extraction_cache is not None:
+        wxr.extraction_cache.close()
+    if wxr.dependency_db is not None:
+        wxr.dependency_db.close()
+    if wxr.description_cache is not None:
+        wxr.description_cache.move_counts(wxr.config.cache_counts)
+        wxr.description_cache.close()
+        use_description_cache(None)
     wxr.wtp.close_db_conn()
     close_thesaurus_db(wxr.thesaurus_db_path, wxr.thesaurus_db_conn)
 
@@ -547,6 +681,18 @@ def main():
         ):
             print("  {:>7d} {}".format(cnt, k))
 
+        print("")
+        print("CACHE HIT RATES")
+        cache_counts = wxr.config.cache_counts
+        for name in sorted(set(name for name, hit in cache_counts)):
+            hits = cache_counts[(name, True)]
+            total = hits + cache_counts[(name, False)]
+            print(
+                "  {:>6.1%} of {:>9d} {}".format(
+                    hits / total if total else 0, total, name
+                )
+            )
+
     if args.errors:
         with open(args.errors, "w", encoding="utf-8") as f:
             json.dump(
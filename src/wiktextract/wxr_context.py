@@ -4,6 +4,7 @@ import sqlite3
 from wikitextprocessor import Wtp
 
 from wiktextract.config import WiktionaryConfig
+from wiktextract.description_cache import use_description_cache
 
 
 class WiktextractContext:
@@ -15,9 +16,16 @@ class WiktextractContext:
         "pos",
         "thesaurus_db_path",
         "thesaurus_db_conn",
+        "thesaurus_index",
+        "extraction_cache",
+        "dependency_db",
+        "description_cache",
+        "title_index",
+        "patterns",
     )
 
     def __init__(self, wtp: Wtp, config: WiktionaryConfig):
+        from .patterns import EditionPatterns
         from .thesaurus import init_thesaurus_db
 
         self.config = config
@@ -29,6 +37,28 @@ class WiktextractContext:
             f"{wtp.db_path.stem}_thesaurus"
         )
         self.thesaurus_db_conn = init_thesaurus_db(self.thesaurus_db_path)
+        # Set to the dictionary returned by load_thesaurus_index() to look up
+        # thesaurus terms without querying the database
+        self.thesaurus_index = None
+        # Set to an ExtractionCache object to reuse data extracted from
+        # unchanged pages in earlier runs
+        self.extraction_cache = None
+        # Set to a DependencyDB object to save the Template, Module and other
+        # pages used by each page
+        self.dependency_db = None
+        # Set to a DescriptionCache object to share the results of
+        # decode_tags() and classify_desc() between processes and runs
+        self.description_cache = None
+        # Set to a TitleIndex object to answer page_exists() without
+        # querying the database
+        self.title_index = None
+        # Compiled patterns that depend on the namespace and language names
+        self.patterns = EditionPatterns(wtp, config)
+
+    def page_exists(self, title: str) -> bool:
+        if self.title_index is not None:
+            return title in self.title_index
+        return self.wtp.page_exists(title)
 
     def reconnect_databases(self, check_same_thread: bool = True) -> None:
         # `multiprocessing.pool.Pool.imap()` runs in another thread, if the db
@@ -40,6 +70,13 @@ class WiktextractContext:
         self.wtp.db_conn = sqlite3.connect(
             self.wtp.db_path, check_same_thread=check_same_thread
         )
+        if self.extraction_cache is not None:
+            self.extraction_cache.connect(check_same_thread)
+        if self.dependency_db is not None:
+            self.dependency_db.connect(check_same_thread)
+        if self.description_cache is not None:
+            self.description_cache.connect(check_same_thread)
+            use_description_cache(self.description_cache)
 
     def remove_unpicklable_objects(self) -> None:
         # remove these variables before passing the `WiktextractContext` object
@@ -48,6 +85,12 @@ class WiktextractContext:
         self.thesaurus_db_conn = None
         self.wtp.db_conn.close()
         self.wtp.db_conn = None
+        if self.extraction_cache is not None:
+            self.extraction_cache.close()
+        if self.dependency_db is not None:
+            self.dependency_db.close()
+        if self.description_cache is not None:
+            self.description_cache.close()
         self.wtp.lua = None
         self.wtp.lua_invoke = None
         self.wtp.lua_reset_env = None
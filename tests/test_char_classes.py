@@ -0,0 +1,65 @@
+import json
+import unicodedata
+import unittest
+from importlib.resources import files
+from unittest.mock import patch
+
+from wiktextract.char_classes import (
+    COMBINING,
+    GREEK,
+    LATIN,
+    NON_LATIN,
+    ROMANIZATION_OK,
+    SCRIPT_MASK,
+    ComputedCharClasses,
+    char_class,
+    char_class_table,
+    compute_char_class,
+    compute_char_classes,
+    is_superscript,
+)
+
+
+class CharClassTests(unittest.TestCase):
+    def test_scripts(self):
+        for ch, script in (
+            ("a", LATIN),
+            ("Ō", LATIN),
+            ("β", GREEK),
+            ("́", COMBINING),
+            ("ж", NON_LATIN),
+            ("漢", NON_LATIN),
+            ("’", ROMANIZATION_OK),
+            ("/", ROMANIZATION_OK),
+        ):
+            with self.subTest(ch=ch):
+                self.assertEqual(char_class(ch) & SCRIPT_MASK, script)
+
+    def test_superscript(self):
+        self.assertTrue(is_superscript("²"))
+        self.assertTrue(is_superscript("ᵃ"))
+        self.assertTrue(is_superscript("⁻"))
+        self.assertFalse(is_superscript("2"))
+        self.assertFalse(is_superscript("\U0010ffff"))
+
+    def test_table_up_to_date(self):
+        # The shipped table must match the lists in char_classes.py; run
+        # tools/generate_char_classes.py to update it
+        path = files("wiktextract") / "data" / "unicode" / "char_classes.json"
+        with path.open(encoding="utf-8") as f:
+            data = json.load(f)
+        if data["unidata_version"] != unicodedata.unidata_version:
+            self.skipTest("table generated for another Unicode version")
+        self.assertEqual(data, compute_char_classes())
+
+    def test_other_unicode_version(self):
+        # Classes are computed from the names if the table is for another
+        # Unicode version
+        char_class_table.cache_clear()
+        self.addCleanup(char_class_table.cache_clear)
+        with patch("unicodedata.unidata_version", "0.0.0"):
+            table = char_class_table()
+        self.assertIsInstance(table, ComputedCharClasses)
+        for ch in ("a", "ж", "²", "\U0010ffff"):
+            with self.subTest(ch=ch):
+                self.assertEqual(char_class(ch), compute_char_class(ch))
@@ -0,0 +1,147 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from wikitextprocessor import Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.dependencies import (
+    DependencyDB,
+    changed_dependencies,
+    dependency_db_path,
+    pages_to_reextract,
+    record_dependencies,
+)
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.wxr_context import WiktextractContext
+
+
+class DependencyTests(unittest.TestCase):
+    def setUp(self):
+        self.wxr = WiktextractContext(Wtp(), WiktionaryConfig())
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = DependencyDB(Path(self.tmpdir.name) / "deps.db")
+
+    def tearDown(self):
+        self.db.close()
+        self.tmpdir.cleanup()
+        self.wxr.wtp.close_db_conn()
+        close_thesaurus_db(
+            self.wxr.thesaurus_db_path, self.wxr.thesaurus_db_conn
+        )
+
+    def test_record_dependencies(self):
+        self.wxr.wtp.add_page("Template:foo", 10, "{{bar}}")
+        self.wxr.wtp.add_page("Template:bar", 10, "bar")
+        self.wxr.wtp.start_page("test")
+        with record_dependencies(self.wxr) as deps:
+            self.assertEqual(self.wxr.wtp.expand("{{foo}}"), "bar")
+        self.assertEqual(deps, {"Template:foo", "Template:bar"})
+
+    def test_record_lua_dependencies(self):
+        self.wxr.wtp.add_page("Template:foo", 10, "{{#invoke:bar|baz}}")
+        self.wxr.wtp.add_page(
+            "Module:bar",
+            828,
+            """local export = {}
+            function export.baz(frame)
+              return "baz"
+            end
+            return export""",
+        )
+        self.wxr.wtp.start_page("test")
+        with record_dependencies(self.wxr) as deps:
+            self.assertEqual(self.wxr.wtp.expand("{{foo}}"), "baz")
+        self.assertEqual(deps, {"Template:foo", "Module:bar", "Module:*"})
+        # The module is already loaded and may not be read again
+        self.wxr.wtp.start_page("test2")
+        with record_dependencies(self.wxr) as deps:
+            self.assertEqual(self.wxr.wtp.expand("{{foo}}"), "baz")
+        self.assertLessEqual({"Template:foo", "Module:*"}, deps)
+
+    def test_record_subpage(self):
+        self.wxr.wtp.add_page("dog/translations", 0, "{{bar}}")
+        self.wxr.wtp.start_page("dog")
+        with record_dependencies(self.wxr) as deps:
+            self.wxr.wtp.read_by_title("dog/translations")
+            self.wxr.wtp.get_page("cat/translations")
+        self.assertEqual(deps, {"dog/translations", "cat/translations"})
+
+    def test_changed_subpage(self):
+        new_wtp = Wtp()
+        self.addCleanup(new_wtp.close_db_conn)
+        self.wxr.wtp.add_page("dog/translations", 0, "a")
+        self.wxr.wtp.add_page("cat/translations", 0, "a")
+        new_wtp.add_page("dog/translations", 0, "b")
+        new_wtp.add_page("cat/translations", 0, "a")
+        new_wtp.add_page("fish/translations", 0, "a")
+        self.assertEqual(
+            changed_dependencies(
+                self.wxr.wtp,
+                new_wtp,
+                [
+                    "dog/translations",
+                    "cat/translations",
+                    "fish/translations",
+                    "Module:*",
+                ],
+            ),
+            ["dog/translations", "fish/translations"],
+        )
+        self.db.add("a", ["dog/translations", "Template:foo"])
+        self.db.commit()
+        self.assertEqual(
+            set(self.db.dependency_titles()),
+            {"dog/translations", "Template:foo"},
+        )
+        self.assertEqual(
+            pages_to_reextract(self.db, ["dog/translations"]), ["a"]
+        )
+
+    def test_record_invoke_in_page_text(self):
+        with record_dependencies(self.wxr, "{{#Invoke: bar|baz}}") as deps:
+            pass
+        self.assertEqual(deps, {"Module:*"})
+
+    def test_record_dependencies_wtp_class_unchanged(self):
+        orig_get_page = Wtp.get_page
+        with record_dependencies(self.wxr):
+            self.assertIs(Wtp.get_page, orig_get_page)
+            with record_dependencies(self.wxr):
+                pass
+            self.assertIn("get_page", vars(self.wxr.wtp))
+            self.assertIn("read_by_title", vars(self.wxr.wtp))
+        self.assertIs(Wtp.get_page, orig_get_page)
+        self.assertNotIn("get_page", vars(self.wxr.wtp))
+        self.assertNotIn("read_by_title", vars(self.wxr.wtp))
+
+    def test_pages_to_reextract(self):
+        self.db.add("a", ["Template:foo", "Module:bar"])
+        self.db.add("b", ["Template:foo"])
+        self.db.add("c", [])
+        self.db.commit()
+        self.assertEqual(
+            pages_to_reextract(self.db, ["Template:foo"]), ["a", "b"]
+        )
+        self.assertEqual(pages_to_reextract(self.db, ["Module:bar"]), ["a"])
+        self.assertEqual(pages_to_reextract(self.db, ["Module:baz"]), [])
+
+    def test_pages_to_reextract_any_module(self):
+        self.db.add("a", ["Template:foo", "Module:*"])
+        self.db.add("b", ["Template:foo"])
+        self.db.commit()
+        self.assertEqual(pages_to_reextract(self.db, ["Module:bar"]), ["a"])
+        self.assertEqual(pages_to_reextract(self.db, ["Template:bar"]), [])
+
+    def test_replace_dependencies(self):
+        self.db.add("a", ["Template:foo"])
+        self.db.commit()
+        self.db.add("a", ["Template:bar"])
+        self.db.commit()
+        self.assertEqual(pages_to_reextract(self.db, ["Template:foo"]), [])
+        self.assertEqual(pages_to_reextract(self.db, ["Template:bar"]), ["a"])
+
+    def test_dependency_db_path(self):
+        self.assertEqual(
+            dependency_db_path("/tmp/en.db"), Path("/tmp/en_dependencies.db")
+        )
@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from wiktextract.description_cache import (
+    DescriptionCache,
+    persistent_cache,
+    tables_hash,
+    use_description_cache,
+)
+from wiktextract.form_descriptions import decode_tags
+
+
+class DescriptionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / "cache.db"
+        self.cache = DescriptionCache(self.db_path)
+        use_description_cache(self.cache)
+        self.calls = []
+
+        @persistent_cache("upper")
+        def upper(text):
+            self.calls.append(text)
+            return text.upper()
+
+        self.upper = upper
+
+    def tearDown(self):
+        use_description_cache(None)
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_hit(self):
+        self.assertEqual(self.upper("foo"), "FOO")
+        self.assertEqual(self.upper("foo"), "FOO")
+        self.assertEqual(self.calls, ["foo", "foo"])  # not committed yet
+        self.cache.commit()
+        self.assertEqual(self.upper("foo"), "FOO")
+        self.assertEqual(self.calls, ["foo", "foo"])
+        self.assertEqual(self.cache.counts[("upper", True)], 1)
+        self.assertEqual(self.cache.counts[("upper", False)], 2)
+
+    def test_new_run(self):
+        self.upper("foo")
+        self.cache.close()
+        self.cache = DescriptionCache(self.db_path)
+        use_description_cache(self.cache)
+        self.assertEqual(self.upper("foo"), "FOO")
+        self.assertEqual(self.calls, ["foo"])
+
+    def test_changed_tables(self):
+        self.upper("foo")
+        self.cache.commit()
+        self.cache.version = "other"
+        self.upper("foo")
+        self.assertEqual(self.calls, ["foo", "foo"])
+
+    def test_move_counts(self):
+        self.upper("foo")
+        counts = {("upper", False): 1}
+        self.cache.move_counts(counts)
+        self.assertEqual(counts, {("upper", False): 2})
+        self.assertEqual(self.cache.counts, {})
+
+    def test_decode_tags(self):
+        # Bypass the lru_cache of decode_tags()
+        decode = decode_tags.__wrapped__
+        expected = decode("first-person singular")
+        self.cache.commit()
+        self.assertEqual(decode("first-person singular"), expected)
+        self.assertEqual(self.cache.counts[("decode_tags", True)], 1)
+
+    def test_tables_hash_missing_file(self):
+        self.assertNotEqual(
+            tables_hash(["tags.py", "no_such_file.txt"]),
+            tables_hash(["tags.py"]),
+        )
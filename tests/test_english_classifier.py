@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from wiktextract.english_classifier import (
+    get_token_re,
+    is_english_token,
+    tokenize,
+)
+from wiktextract.table_cache import CACHE_DIR_ENV
+
+
+class EnglishClassifierTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # The character classes of the tokenizer are saved in the cache
+        # directory
+        tmpdir = tempfile.TemporaryDirectory()
+        patcher = patch.dict(os.environ, {CACHE_DIR_ENV: tmpdir.name})
+        patcher.start()
+        cls.addClassCleanup(tmpdir.cleanup)
+        cls.addClassCleanup(patcher.stop)
+        cls.addClassCleanup(get_token_re.cache_clear)
+        get_token_re.cache_clear()
+
+    def test_tokenize(self):
+        self.assertEqual(
+            tokenize("one's own, e.g. rock-'n'-roll..."),
+            ["one's", "own", ",", "e", ".", "g", ".", "rock-'n'-roll", "..."],
+        )
+
+    def test_tokenize_numbers(self):
+        self.assertEqual(
+            tokenize("1.5 to 3/4 -2"), ["1.5", "to", "3/4", "-", "2"]
+        )
+
+    def test_tokenize_entities(self):
+        self.assertEqual(tokenize("past&nbsp;tense"), ["past", "tense"])
+
+    def test_tokenize_unknown_entities(self):
+        # Entities that are not HTML 4 entities are removed
+        self.assertEqual(tokenize("AT&T;x"), ["ATx"])
+        self.assertEqual(tokenize("a &vert; b"), ["a", "b"])
+        self.assertEqual(tokenize("&#150;&#233;"), ["–", "é"])
+
+    def test_tokenize_email(self):
+        self.assertEqual(tokenize("foo@bar.com"), ["foo@bar.com"])
+        self.assertEqual(tokenize("@foo bar"), ["@foo", "bar"])
+
+    def test_tokenize_word_chars(self):
+        # Combining marks are part of words, superscript digits are not
+        self.assertEqual(tokenize("ро́за"), ["ро́за"])
+        self.assertEqual(tokenize("m²"), ["m", "²"])
+        self.assertEqual(tokenize("👍🏻 🇫🇮"), ["👍🏻", "🇫🇮"])
+
+    def test_tokenize_repeated_punctuation(self):
+        self.assertEqual(tokenize("what!!!!!"), ["what", "!", "!", "!"])
+
+    def test_inflected(self):
+        for token in ("dogs", "dog's", "hanged", "toning", "Dog"):
+            with self.subTest(token=token):
+                self.assertTrue(is_english_token(token))
+
+    def test_compound(self):
+        self.assertTrue(is_english_token("dog-house"))
+        self.assertFalse(is_english_token("dog-xq"))
+
+    def test_digits(self):
+        self.assertTrue(is_english_token("1990s"))
+
+    def test_not_english(self):
+        self.assertFalse(is_english_token("xqzv"))
+        self.assertFalse(is_english_token("avec"))
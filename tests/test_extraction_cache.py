@@ -0,0 +1,151 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from wikitextprocessor import Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.extraction_cache import ExtractionCache
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.wxr_context import WiktextractContext
+
+
+class ExtractionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.wxr = WiktextractContext(Wtp(), WiktionaryConfig())
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = ExtractionCache(
+            Path(self.tmpdir.name) / "cache.db", self.wxr.config
+        )
+        self.parsed = []
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+        self.wxr.wtp.close_db_conn()
+        close_thesaurus_db(
+            self.wxr.thesaurus_db_path, self.wxr.thesaurus_db_conn
+        )
+
+    def parse_fn(self, wxr, title, text):
+        self.parsed.append(title)
+        wxr.wtp.start_page(title)
+        wxr.config.section_counts["noun"] += 1
+        return [{"word": title, "gloss": wxr.wtp.expand(text)}]
+
+    def parse_reads_fn(self, wxr, title, text):
+        # Reads the pages listed in the text, like the modules loaded by
+        # Lua code or a translation subpage
+        self.parsed.append(title)
+        return [
+            {"word": title, "gloss": wxr.wtp.read_by_title(t)}
+            for t in text.split()
+        ]
+
+    def extract(self, text, title="foo", parse_fn=None):
+        self.wxr.wtp.start_page(title)
+        data, dependencies = self.cache.extract(
+            self.wxr, title, text, parse_fn or self.parse_fn
+        )
+        self.cache.commit()
+        return data
+
+    def new_run(self):
+        self.cache.close()
+        self.cache = ExtractionCache(self.cache.db_path, self.wxr.config)
+
+    def test_unchanged_page(self):
+        self.wxr.wtp.add_page("Template:bar", 10, "baz")
+        self.assertEqual(
+            self.extract("{{bar}}"), [{"word": "foo", "gloss": "baz"}]
+        )
+        self.assertEqual(
+            self.extract("{{bar}}"), [{"word": "foo", "gloss": "baz"}]
+        )
+        self.assertEqual(self.parsed, ["foo"])
+
+    def test_changed_text(self):
+        self.extract("a")
+        self.assertEqual(self.extract("b"), [{"word": "foo", "gloss": "b"}])
+        self.assertEqual(self.parsed, ["foo", "foo"])
+
+    def test_changed_template(self):
+        self.wxr.wtp.add_page("Template:bar", 10, "baz")
+        self.extract("{{bar}}")
+        self.wxr.wtp.add_page("Template:bar", 10, "zap")
+        # New cache object, as in a new run
+        self.cache.close()
+        self.cache = ExtractionCache(self.cache.db_path, self.wxr.config)
+        self.assertEqual(
+            self.extract("{{bar}}"), [{"word": "foo", "gloss": "zap"}]
+        )
+        self.assertEqual(self.parsed, ["foo", "foo"])
+
+    def test_changed_config(self):
+        self.extract("a")
+        self.cache.close()
+        self.wxr.config.capture_language_codes = ["fi"]
+        self.cache = ExtractionCache(self.cache.db_path, self.wxr.config)
+        self.extract("a")
+        self.assertEqual(self.parsed, ["foo", "foo"])
+
+    def test_changed_module(self):
+        self.wxr.wtp.add_page("Template:bar", 10, "{{#invoke:baz|f}}")
+        self.wxr.wtp.add_page("Module:baz", 828, "return require('Module:q')")
+        self.wxr.wtp.add_page(
+            "Module:q", 828, "return {f = function(frame) return 'a' end}"
+        )
+        self.extract("{{bar}}")
+        # Changes a module that was only loaded with require()
+        self.wxr.wtp.add_page(
+            "Module:q", 828, "return {f = function(frame) return 'b' end}"
+        )
+        self.cache.close()
+        self.cache = ExtractionCache(self.cache.db_path, self.wxr.config)
+        self.extract("{{bar}}")
+        self.assertEqual(self.parsed, ["foo", "foo"])
+
+    def test_statistics_replayed(self):
+        self.extract("a")
+        self.assertEqual(self.wxr.config.section_counts, {"noun": 1})
+        self.extract("a")
+        self.assertEqual(self.parsed, ["foo"])
+        self.assertEqual(self.wxr.config.section_counts, {"noun": 2})
+
+    def test_changed_subpage(self):
+        self.wxr.wtp.add_page("foo/translations", 0, "a")
+        self.extract("foo/translations", parse_fn=self.parse_reads_fn)
+        self.new_run()
+        self.extract("foo/translations", parse_fn=self.parse_reads_fn)
+        self.assertEqual(self.parsed, ["foo"])
+        self.wxr.wtp.add_page("foo/translations", 0, "b")
+        self.new_run()
+        self.assertEqual(
+            self.extract("foo/translations", parse_fn=self.parse_reads_fn),
+            [{"word": "foo", "gloss": "b"}],
+        )
+        self.assertEqual(self.parsed, ["foo", "foo"])
+
+    def test_module_loaded_later(self):
+        self.wxr.wtp.add_page("Module:a", 828, "a")
+        self.wxr.wtp.add_page("Module:b", 828, "b")
+        self.extract("Module:a", title="x", parse_fn=self.parse_reads_fn)
+        self.extract("Module:b", title="y", parse_fn=self.parse_reads_fn)
+        # Module:a was loaded before y was extracted, so y may use it
+        self.wxr.wtp.add_page("Module:a", 828, "c")
+        self.new_run()
+        self.extract("Module:a", title="x", parse_fn=self.parse_reads_fn)
+        self.extract("Module:b", title="y", parse_fn=self.parse_reads_fn)
+        self.assertEqual(self.parsed, ["x", "y", "x", "y"])
+        # Module:b was loaded after x was extracted, so x couldn't use it
+        self.wxr.wtp.add_page("Module:b", 828, "d")
+        self.new_run()
+        self.extract("Module:a", title="x", parse_fn=self.parse_reads_fn)
+        self.extract("Module:b", title="y", parse_fn=self.parse_reads_fn)
+        self.assertEqual(self.parsed, ["x", "y", "x", "y", "y"])
+
+    def test_hit_rate_counted(self):
+        self.extract("a")
+        self.extract("a")
+        self.assertEqual(self.wxr.config.cache_counts[("extraction", True)], 1)
+        self.assertEqual(self.wxr.config.cache_counts[("extraction", False)], 1)
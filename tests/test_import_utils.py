@@ -0,0 +1,30 @@
+import unittest
+
+from wiktextract.import_utils import get_extractor
+
+
+class ExtractorTests(unittest.TestCase):
+    def test_get_extractor(self):
+        extractor = get_extractor("fr")
+        self.assertIs(get_extractor("fr"), extractor)
+        self.assertEqual(
+            extractor.page_module.__name__, "wiktextract.extractor.fr.page"
+        )
+        # French has no thesaurus extractor
+        self.assertEqual(
+            extractor.thesaurus_module.__name__,
+            "wiktextract.extractor.en.thesaurus",
+        )
+
+    def test_unknown_edition(self):
+        self.assertEqual(
+            get_extractor("xx").page_module.__name__,
+            "wiktextract.extractor.en.page",
+        )
+
+    def test_is_panel_template(self):
+        extractor = get_extractor("en")
+        self.assertTrue(extractor.is_panel_template("RQ:Shakespeare Hamlet"))
+        self.assertTrue(extractor.is_panel_template("list:compass points/en"))
+        self.assertTrue(extractor.is_panel_template("CJKV"))
+        self.assertFalse(extractor.is_panel_template("l"))
@@ -558,3 +558,32 @@ class InflTests(unittest.TestCase):
                                   base_tags=["indicative"],)
         expected = [("positive",)]
         self.assertEqual(expected, ret)
+
+    def test_memo_base_tags(self):
+        # Memoized results must still depend on the tags tested in "if"
+        infl_map = {
+            "foo": {
+                "if": "indicative",
+                "then": "positive",
+                "else": "negative",
+            },
+        }
+        for base_tags, expected in ((["indicative", "plural"], "positive"),
+                                    (["plural"], "negative"),
+                                    (["indicative"], "positive")):
+            ret = self.xexpand_header("foo", infl_map, base_tags=base_tags)
+            self.assertEqual([(expected,)], ret)
+
+    def test_memo_debug_repeated(self):
+        # Results that produce debug messages are not memoized
+        infl_map = {
+            "foo": {
+                "lang": "Finnish",
+                "then": "positive",
+            },
+        }
+        for i in range(2):
+            self.wxr.wtp.debugs = []
+            ret = self.xexpand_header("foo", infl_map)
+            self.assertEqual([("error-unrecognized-form",)], ret)
+            self.assertEqual(len(self.wxr.wtp.debugs), 1)
@@ -7,7 +7,9 @@ import unittest
 
 from wikitextprocessor import Wtp
 from wiktextract.config import WiktionaryConfig
-from wiktextract.inflection import or_tagsets, and_tagsets
+from wiktextract.inflection import (or_tagsets, and_tagsets, HdrSpan,
+                                     compute_coltags, coltags_cache,
+                                     cached_compute_coltags)
 from wiktextract.thesaurus import close_thesaurus_db
 from wiktextract.wxr_context import WiktextractContext
 
@@ -112,3 +114,21 @@ class InflTests(unittest.TestCase):
     def test_and6(self):
         self.xop(and_tagsets, [["singular", "plural"]], [["third-person"]],
                  [["third-person"]], lang="Finnish")
+
+    def test_cached_coltags(self):
+        coltags_cache.clear()
+        hdrspans = [HdrSpan(1, 2, 1, 0, [("singular",)], "singular", True),
+                    HdrSpan(1, 1, 1, 1, [("nominative",)], "nominative",
+                            True)]
+        for i in range(2):
+            ret = cached_compute_coltags(self.wxr, "Finnish", "noun",
+                                         hdrspans, 1, 1, "talo")
+            self.assertEqual(ret, compute_coltags("Finnish", "noun", hdrspans,
+                                                  1, 1, "talo"))
+        counts = self.wxr.config.cache_counts
+        self.assertEqual(counts[("table layout", True)], 1)
+        # Changing a header span changes the layout
+        hdrspans[1].expanded = True
+        cached_compute_coltags(self.wxr, "Finnish", "noun", hdrspans, 1, 1,
+                               "talo")
+        self.assertEqual(counts[("table layout", False)], 2)
@@ -0,0 +1,46 @@
+import unittest
+
+from wiktextract.lang_specific_configs import (
+    check_lang_specific,
+    get_lang_conf,
+    lang_conf,
+    lang_specific,
+    lang_specific_tags,
+)
+
+
+class LangSpecificConfigsTests(unittest.TestCase):
+    def test_check_lang_specific(self):
+        check_lang_specific()
+
+    def test_default(self):
+        self.assertEqual(
+            get_lang_conf("Nonexistent", "numbers"),
+            lang_specific["default"]["numbers"],
+        )
+
+    def test_inherited(self):
+        # Fields not set for a language come from its "next" chain
+        for lang, conf in lang_specific.items():
+            if "next" in conf and "numbers" not in conf:
+                self.assertEqual(
+                    get_lang_conf(lang, "numbers"),
+                    get_lang_conf(conf["next"], "numbers"),
+                )
+
+    def test_invalid_field(self):
+        with self.assertRaises(RuntimeError):
+            get_lang_conf("Finnish", "nonexistent-field")
+
+    def test_read_only(self):
+        with self.assertRaises(TypeError):
+            lang_conf("Finnish")["numbers"] = []
+
+    def test_lang_specific_tags(self):
+        self.assertEqual(
+            lang_specific_tags("German", "verb", "ich habe"),
+            ("habe", ["first-person", "singular"]),
+        )
+        self.assertEqual(
+            lang_specific_tags("German", "noun", "ich habe"), ("ich habe", [])
+        )
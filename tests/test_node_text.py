@@ -0,0 +1,68 @@
+import unittest
+
+from wikitextprocessor import Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.node_text import node_to_plain_text
+from wiktextract.page import clean_node, clean_node_html
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.wxr_context import WiktextractContext
+
+
+class NodeTextTests(unittest.TestCase):
+    def setUp(self):
+        self.wxr = WiktextractContext(Wtp(), WiktionaryConfig())
+        self.wxr.wtp.start_page("test")
+
+    def tearDown(self):
+        self.wxr.wtp.close_db_conn()
+        close_thesaurus_db(
+            self.wxr.thesaurus_db_path, self.wxr.thesaurus_db_conn
+        )
+
+    def assert_same_as_general(self, text):
+        root = self.wxr.wtp.parse(text)
+        self.assertIsNotNone(node_to_plain_text(self.wxr, root.children))
+        general_data = {}
+        fast_data = {}
+        general = clean_node_html(
+            self.wxr, general_data, root.children, collect_links=True
+        )
+        fast = clean_node(
+            self.wxr, fast_data, root.children, collect_links=True
+        )
+        self.assertEqual(fast, general)
+        self.assertEqual(fast_data, general_data)
+        return fast, fast_data
+
+    def test_plain_text(self):
+        self.assertEqual(
+            self.assert_same_as_general(" A  small​ cat. "),
+            ("A small cat.", {}),
+        )
+
+    def test_links(self):
+        self.assertEqual(
+            self.assert_same_as_general(
+                "A [[cat]] or [[dog|dogs]], ''[[mouse]]''"
+                "[[Category:Animals]]"
+            ),
+            (
+                "A cat or dogs, mouse",
+                {
+                    "categories": ["Animals"],
+                    "links": [
+                        ("cat", "cat"),
+                        ("dogs", "dog"),
+                        ("mouse", "mouse"),
+                    ],
+                },
+            ),
+        )
+
+    def test_unhandled(self):
+        root = self.wxr.wtp.parse("{{l|en|cat}} [[w:cat]] <b>cat</b>")
+        for node in root.children:
+            if not isinstance(node, str):
+                self.assertIsNone(node_to_plain_text(self.wxr, node))
+        self.assertIsNone(node_to_plain_text(self.wxr, "a & b"))
@@ -9,6 +9,7 @@ from unittest.mock import patch
 from wikitextprocessor import Page, Wtp
 
 from wiktextract.config import WiktionaryConfig
+from wiktextract.extractor.en.page import merge_base
 from wiktextract.page import parse_page
 from wiktextract.thesaurus import close_thesaurus_db
 from wiktextract.wxr_context import WiktextractContext
@@ -101,6 +102,51 @@ testpage f
             ],
         )
 
+    def test_uncaptured_languages_removed(self):
+        self.wxr.config.capture_language_codes = ["sv"]
+        lst = parse_page(
+            self.wxr,
+            "testpage",
+            """
+==English==
+===Noun===
+testpage
+
+# English sense
+
+==Swedish==
+===Noun===
+testpage f
+
+# sense 1
+
+==Finnish==
+===Noun===
+testpage
+
+# Finnish sense
+""",
+        )
+        self.assertEqual(
+            [(data["lang_code"], data["senses"][0]["glosses"]) for data in lst],
+            [("sv", ["sense 1"])],
+        )
+
+    def test_remove_uncaptured_languages(self):
+        from wiktextract.extractor.en.page import remove_uncaptured_languages
+
+        self.wxr.config.capture_language_codes = ["en"]
+        self.assertEqual(
+            remove_uncaptured_languages(
+                self.wxr,
+                "{{also|A}}\n==Finnish==\n===Noun===\nfoo\n"
+                "==[[English]]==\n===Noun===\nbar\n"
+                "====Translations====\n==Swedish==\nbaz\n",
+            ),
+            "{{also|A}}\n==[[English]]==\n===Noun===\nbar\n"
+            "====Translations====\n",
+        )
+
     def test_page3(self):
         lst = parse_page(
             self.wxr,
@@ -628,3 +674,28 @@ foo
                 }
             ],
         )
+
+    def test_merge_base(self):
+        base = {
+            "word": "foo",
+            "categories": ["bar"],
+            "sounds": [{"ipa": "/fu/", "pos": "noun"}, {"ipa": "/fʊ/"}],
+        }
+        data1 = {"pos": "noun", "categories": ["baz"]}
+        data2 = {"pos": "verb"}
+        merge_base(self.wxr, data1, base)
+        merge_base(self.wxr, data2, base)
+        self.assertEqual(
+            data1,
+            {
+                "word": "foo",
+                "pos": "noun",
+                "categories": ["baz", "bar"],
+                "sounds": [{"ipa": "/fu/"}, {"ipa": "/fʊ/"}],
+            },
+        )
+        self.assertEqual(data2["sounds"], [{"ipa": "/fu/"}, {"ipa": "/fʊ/"}])
+        # Lists are copied, but their items are shared and not modified
+        self.assertIsNot(data2["categories"], base["categories"])
+        self.assertIs(data2["sounds"][1], base["sounds"][1])
+        self.assertEqual(base["sounds"][0], {"ipa": "/fu/", "pos": "noun"})
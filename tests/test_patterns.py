@@ -0,0 +1,72 @@
+import unittest
+
+from wikitextprocessor import Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.page import process_categories
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.wxr_context import WiktextractContext
+
+
+class PatternsTests(unittest.TestCase):
+    def setUp(self):
+        self.wxr = WiktextractContext(Wtp(), WiktionaryConfig())
+        self.patterns = self.wxr.patterns
+
+    def tearDown(self):
+        self.wxr.wtp.close_db_conn()
+        close_thesaurus_db(
+            self.wxr.thesaurus_db_path, self.wxr.thesaurus_db_conn
+        )
+
+    def test_category_lang_name(self):
+        self.assertEqual(
+            self.patterns.category_lang_name("English nouns"), "English"
+        )
+        self.assertEqual(
+            self.patterns.category_lang_name("Rhymes:Finnish/ɑ"), "Finnish"
+        )
+        self.assertIsNone(self.patterns.category_lang_name("Nouns"))
+        self.assertEqual(self.patterns.category_lang_name("Finnish"), "Finnish")
+
+    def test_category_lang_name_whole_words(self):
+        # "E" is a language name too
+        self.assertIn("E", self.wxr.config.LANGUAGES_BY_NAME)
+        self.assertEqual(
+            self.patterns.category_lang_name("English lemmas"), "English"
+        )
+        self.assertIsNone(self.patterns.category_lang_name("Ewe-ish nouns"))
+
+    def test_english_categories_kept(self):
+        page_data = [
+            {
+                "lang": "English",
+                "lang_code": "en",
+                "word": "dog",
+                "categories": ["English nouns", "Finnish nouns", "Pets"],
+            }
+        ]
+        process_categories(self.wxr, page_data)
+        self.assertEqual(page_data[0]["categories"], ["English nouns", "Pets"])
+
+    def test_category_lang_name_first_listed(self):
+        # Like the regexp alternation this replaces, the name listed first
+        # in LANGUAGES_BY_NAME wins when several names match
+        names = list(self.wxr.config.LANGUAGES_BY_NAME)
+        first = names.index("Egyptian Arabic") < names.index("Egyptian")
+        self.assertEqual(
+            self.patterns.category_lang_name("Egyptian Arabic nouns"),
+            "Egyptian Arabic" if first else "Egyptian",
+        )
+
+    def test_ns_title_prefixes(self):
+        self.assertIn("Category:", self.patterns.ns_title_prefixes("Category"))
+        self.assertIn(
+            "category:", self.patterns.ns_title_prefixes("Category", True)
+        )
+        self.assertEqual(self.patterns.ns_title_prefixes("Nonexistent"), ())
+
+    def test_category_link_re(self):
+        self.assertEqual(
+            self.patterns.category_link_re.sub("", "a[[Category:foo]]b"), "ab"
+        )
@@ -0,0 +1,112 @@
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from wiktextract.shards import (
+    find_shards,
+    merge_shards,
+    remove_shards,
+    shard_path,
+    sort_key,
+    write_shard,
+)
+
+
+def jsonl(*entries):
+    return "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries)
+
+
+class ShardTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.out_dir = Path(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_merge_sorted(self):
+        write_shard(
+            self.out_dir,
+            0,
+            jsonl(
+                {"word": "b", "lang_code": "en", "pos": "noun"},
+                {"word": "a", "lang_code": "fi", "pos": "verb"},
+            ),
+        )
+        write_shard(
+            self.out_dir,
+            0,
+            jsonl({"word": "a", "lang_code": "en", "pos": "verb"}),
+        )
+        write_shard(
+            self.out_dir,
+            1,
+            jsonl(
+                {"word": "a", "lang_code": "en", "pos": "noun"},
+                {"title": "c", "redirect": "b"},
+            ),
+            compress=True,
+        )
+        self.assertEqual(
+            [p.name for p in find_shards(self.out_dir)],
+            ["wiktextract-0.jsonl", "wiktextract-1.jsonl.gz"],
+        )
+        out_f = io.StringIO()
+        # Small runs to exercise merging runs of the same shard
+        count = merge_shards(find_shards(self.out_dir), out_f, max_run_lines=2)
+        self.assertEqual(count, 5)
+        self.assertEqual(
+            [json.loads(line) for line in out_f.getvalue().splitlines()],
+            [
+                {"title": "c", "redirect": "b"},
+                {"word": "a", "lang_code": "en", "pos": "noun"},
+                {"word": "a", "lang_code": "en", "pos": "verb"},
+                {"word": "b", "lang_code": "en", "pos": "noun"},
+                {"word": "a", "lang_code": "fi", "pos": "verb"},
+            ],
+        )
+
+    def test_merge_deterministic(self):
+        entries = [
+            {"word": "a", "lang_code": "en", "pos": "noun", "senses": [i]}
+            for i in range(4)
+        ]
+        write_shard(self.out_dir, 0, jsonl(entries[3], entries[0]))
+        write_shard(self.out_dir, 1, jsonl(entries[2], entries[1]))
+        out_f1 = io.StringIO()
+        merge_shards(find_shards(self.out_dir), out_f1)
+        remove_shards(self.out_dir)
+        self.assertEqual(find_shards(self.out_dir), [])
+
+        write_shard(self.out_dir, 0, jsonl(*entries))
+        out_f2 = io.StringIO()
+        merge_shards(find_shards(self.out_dir), out_f2)
+        self.assertEqual(out_f1.getvalue(), out_f2.getvalue())
+
+    def test_merge_parses_lines_once(self):
+        entries = [
+            {"word": w, "lang_code": "en", "pos": "noun"}
+            for w in ("d", "a\tb", "a\nb", "c", "a")
+        ]
+        write_shard(self.out_dir, 0, jsonl(*entries[:3]))
+        write_shard(self.out_dir, 1, jsonl(*entries[3:]))
+        out_f = io.StringIO()
+        with patch("wiktextract.shards.sort_key", wraps=sort_key) as key_fn:
+            merge_shards(find_shards(self.out_dir), out_f, max_run_lines=2)
+        self.assertEqual(key_fn.call_count, 5)
+        self.assertEqual(
+            [
+                json.loads(line)["word"]
+                for line in out_f.getvalue().splitlines()
+            ],
+            ["a", "a\tb", "a\nb", "c", "d"],
+        )
+
+    def test_shard_path(self):
+        self.assertEqual(
+            shard_path(self.out_dir, "thesaurus", False).name,
+            "wiktextract-thesaurus.jsonl",
+        )
@@ -0,0 +1,35 @@
+import unittest
+
+from wiktextract.tag_bits import (
+    mask_categories,
+    mask_category_masks,
+    mask_tags,
+    tag_bit,
+    tags_mask,
+    tuple_mask,
+)
+
+
+class TagBitsTests(unittest.TestCase):
+    def test_tag_bit(self):
+        self.assertEqual(tag_bit("plural"), tag_bit("plural"))
+        self.assertNotEqual(tag_bit("plural"), tag_bit("singular"))
+
+    def test_roundtrip(self):
+        tags = ("feminine", "plural", "third-person")
+        self.assertEqual(mask_tags(tuple_mask(tags)), tags)
+        self.assertEqual(mask_tags(tags_mask(reversed(tags))), tags)
+        self.assertEqual(mask_tags(0), ())
+
+    def test_categories(self):
+        mask = tags_mask(["masculine", "feminine", "plural"])
+        self.assertEqual(set(mask_categories(mask)), {"gender", "number"})
+        self.assertEqual(
+            sorted(mask & cat_mask for cat_mask in mask_category_masks(mask)),
+            sorted([tags_mask(["masculine", "feminine"]), tag_bit("plural")]),
+        )
+
+    def test_unknown_tag(self):
+        mask = tags_mask(["plural", "not-a-valid-tag"])
+        self.assertEqual(mask_tags(mask), ("not-a-valid-tag", "plural"))
+        self.assertEqual(mask_categories(mask), ("number",))
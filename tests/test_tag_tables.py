@@ -0,0 +1,115 @@
+import contextlib
+import io
+import os
+import re
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from wiktextract import form_descriptions
+from wiktextract.form_descriptions import (
+    base_valid_tags,
+    build_valid_sequences,
+    get_valid_sequences,
+    valid_tree_from_data,
+    valid_tree_to_data,
+)
+from wiktextract.inflectiondata import check_v, infl_map, infl_start_map
+from wiktextract.table_cache import CACHE_DIR_ENV, cached_table, table_path
+from wiktextract.tags import uppercase_tags, valid_tags, xlat_head_map
+
+
+class TagTableTests(unittest.TestCase):
+    def setUp(self):
+        # get_valid_sequences() saves the tree in the cache directory
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = patch.dict(os.environ, {CACHE_DIR_ENV: self.tmpdir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_xlat_head_map(self):
+        invalid = []
+        for k, v in xlat_head_map.items():
+            for tag in v.removeprefix("?").split():
+                if tag not in valid_tags:
+                    invalid.append((k, tag))
+        self.assertEqual(invalid, [])
+
+    def test_uppercase_tags(self):
+        # Hyphenated uppercase tags are added to valid_tags as dialect tags
+        hyphenated = [re.sub(r"\s+", "-", tag) for tag in uppercase_tags]
+        self.assertEqual(set(hyphenated) & set(base_valid_tags), set())
+
+    def test_build_valid_sequences(self):
+        # Tags or topics mapped to unknown values are printed
+        with contextlib.redirect_stdout(io.StringIO()) as f:
+            build_valid_sequences()
+        self.assertEqual(f.getvalue(), "")
+
+    def test_infl_map(self):
+        with contextlib.redirect_stdout(io.StringIO()) as f:
+            for k, v in infl_map.items():
+                check_v(k, v)
+            for k, v in infl_start_map.items():
+                check_v(k, v)
+        self.assertEqual(f.getvalue(), "")
+
+    def test_valid_tree_data(self):
+        data = valid_tree_to_data(build_valid_sequences())
+        self.assertEqual(valid_tree_to_data(valid_tree_from_data(data)), data)
+        tree = valid_tree_from_data(data)
+        node = tree.children["first-person"]
+        self.assertTrue(node.end)
+        self.assertEqual(node.tags, ["first-person"])
+
+    def test_lazy_tables(self):
+        get_valid_sequences.cache_clear()
+        self.assertIs(form_descriptions.valid_sequences, get_valid_sequences())
+        with self.assertRaises(AttributeError):
+            form_descriptions.no_such_table
+
+
+class TableCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        patcher = patch.dict(os.environ, {CACHE_DIR_ENV: self.tmpdir.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_cached_table(self):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return ({"a": (1, 2)}, ["b"])
+
+        self.assertEqual(cached_table("test", ["tags.py"], build),
+                         ({"a": (1, 2)}, ["b"]))
+        self.assertEqual(cached_table("test", ["tags.py"], build),
+                         ({"a": (1, 2)}, ["b"]))
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(table_path("test", ["tags.py"]).is_file())
+
+    def test_stale_tables_removed(self):
+        cached_table("test", ["tags.py"], lambda: 1)
+        self.assertEqual(cached_table("test", ["topics.py"], lambda: 2), 2)
+        self.assertEqual(os.listdir(self.tmpdir.name),
+                         [table_path("test", ["topics.py"]).name])
+
+    def test_other_python_tables_kept(self):
+        other_path = os.path.join(self.tmpdir.name, "test-0123-2.7-2.marshal")
+        with open(other_path, "wb") as f:
+            f.write(b"")
+        cached_table("test", ["tags.py"], lambda: 1)
+        self.assertEqual(sorted(os.listdir(self.tmpdir.name)),
+                         sorted([os.path.basename(other_path),
+                                 table_path("test", ["tags.py"]).name]))
+
+    def test_unwritable_cache_dir(self):
+        path = os.path.join(self.tmpdir.name, "file")
+        with open(path, "w") as f:
+            f.write("")
+        with patch.dict(os.environ, {CACHE_DIR_ENV: path}):
+            self.assertEqual(cached_table("test", ["tags.py"], lambda: 3), 3)
@@ -315,6 +315,16 @@ class TagTests(unittest.TestCase):
         self.assertEqual(ret, [("feminine", "masculine",
                                 "nominative", "plural",)])
 
+    def test_long_sequence(self):
+        # Long qualifier strings share the paths they extend
+        ret, topics = decode_tags(" ".join(["first-person singular present"]
+                                           * 100))
+        self.assertEqual(ret, [("first-person", "present", "singular")])
+
+    def test_long_sequence_unknown(self):
+        ret, topics = decode_tags(" ".join(["plural foo"] * 50))
+        self.assertEqual(ret, [("error-unknown-tag", "plural")])
+
     def test_topics1(self):
         ret, topics = decode_tags("nautical")
         self.assertEqual(topics, ["nautical", "transport"])
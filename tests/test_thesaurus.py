@@ -0,0 +1,142 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from wikitextprocessor import Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.thesaurus import (
+    ThesaurusTerm,
+    close_thesaurus_db,
+    init_thesaurus_db,
+    insert_thesaurus_terms,
+    load_thesaurus_index,
+    lookup_thesaurus,
+    search_thesaurus,
+    thesaurus_linkage_number,
+)
+from wiktextract.wxr_context import WiktextractContext
+
+
+class ThesaurusTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.tmpdir.name) / "thesaurus.db"
+        self.conn = init_thesaurus_db(self.db_path)
+
+    def tearDown(self):
+        close_thesaurus_db(self.db_path, self.conn)
+        self.tmpdir.cleanup()
+
+    def test_insert_thesaurus_terms(self):
+        insert_thesaurus_terms(
+            self.conn,
+            [
+                [
+                    ThesaurusTerm("happy", "en", "adj", "synonyms", "glad"),
+                    ThesaurusTerm("happy", "en", "adj", "antonyms", "sad"),
+                ],
+                [
+                    # Duplicate term
+                    ThesaurusTerm("happy", "en", "adj", "synonyms", "glad"),
+                    ThesaurusTerm("happy", "fi", "adj", "synonyms", "iloinen"),
+                ],
+            ],
+        )
+        self.assertEqual(thesaurus_linkage_number(self.conn), 3)
+        self.assertEqual(
+            sorted(
+                (t.term, t.linkage)
+                for t in search_thesaurus(self.conn, "happy", "en", "adj")
+            ),
+            [("glad", "synonyms"), ("sad", "antonyms")],
+        )
+        # Entry ids continue from existing entries
+        insert_thesaurus_terms(
+            self.conn,
+            [[ThesaurusTerm("sad", "en", "adj", "synonyms", "unhappy")]],
+        )
+        self.assertEqual(
+            [t.term for t in search_thesaurus(self.conn, "sad", "en", "adj")],
+            ["unhappy"],
+        )
+        self.assertEqual(
+            self.conn.execute("SELECT count(*) FROM entries").fetchone(), (3,)
+        )
+
+    def test_insert_thesaurus_terms_null_pos(self):
+        # NULL is distinct in the unique index, so each term without a
+        # part of speech has its own entry and none of them is dropped
+        for _ in range(2):
+            insert_thesaurus_terms(
+                self.conn,
+                [
+                    [
+                        ThesaurusTerm("happy", "en", None, "synonyms", "glad"),
+                        ThesaurusTerm("happy", "en", "adj", "synonyms", "glad"),
+                    ],
+                    [ThesaurusTerm("happy", "en", None, "synonyms", "glad")],
+                ],
+            )
+        self.assertEqual(
+            self.conn.execute(
+                "SELECT count(*) FROM entries WHERE pos IS NULL"
+            ).fetchone(),
+            (4,),
+        )
+        self.assertEqual(
+            self.conn.execute(
+                "SELECT count(*) FROM entries WHERE pos = 'adj'"
+            ).fetchone(),
+            (1,),
+        )
+        self.assertEqual(thesaurus_linkage_number(self.conn), 5)
+
+    def test_load_thesaurus_index(self):
+        insert_thesaurus_terms(
+            self.conn,
+            [
+                [
+                    ThesaurusTerm("happy", "en", "adj", "synonyms", "glad"),
+                    ThesaurusTerm("happy", "fi", "adj", "synonyms", "iloinen"),
+                ]
+            ],
+        )
+        index = load_thesaurus_index(self.conn)
+        self.assertEqual(
+            sorted(index.keys()),
+            [("happy", "en", "adj"), ("happy", "fi", "adj")],
+        )
+        self.assertEqual(
+            [t.term for t in index[("happy", "en", "adj")]], ["glad"]
+        )
+        self.assertEqual(
+            index[("happy", "en", "adj")],
+            list(search_thesaurus(self.conn, "happy", "en", "adj")),
+        )
+
+    def test_lookup_thesaurus(self):
+        wxr = WiktextractContext(Wtp(), WiktionaryConfig())
+        self.addCleanup(wxr.wtp.close_db_conn)
+        self.addCleanup(
+            close_thesaurus_db, wxr.thesaurus_db_path, wxr.thesaurus_db_conn
+        )
+        insert_thesaurus_terms(
+            wxr.thesaurus_db_conn,
+            [[ThesaurusTerm("happy", "en", "adj", "synonyms", "glad")]],
+        )
+        self.assertEqual(
+            [t.term for t in lookup_thesaurus(wxr, "happy", "en", "adj")],
+            ["glad"],
+        )
+        wxr.thesaurus_index = load_thesaurus_index(wxr.thesaurus_db_conn)
+        self.assertEqual(
+            [t.term for t in lookup_thesaurus(wxr, "happy", "en", "adj")],
+            ["glad"],
+        )
+        self.assertEqual(
+            list(lookup_thesaurus(wxr, "happy", "en", "adj", "antonyms")), []
+        )
+        # Database queries avoided by the index
+        self.assertEqual(wxr.config.cache_counts[("thesaurus", True)], 2)
+        self.assertEqual(wxr.config.cache_counts[("thesaurus", False)], 1)
@@ -0,0 +1,40 @@
+import unittest
+
+from wikitextprocessor import Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.title_index import TitleIndex
+from wiktextract.wxr_context import WiktextractContext
+
+
+class TitleIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.wxr = WiktextractContext(Wtp(), WiktionaryConfig())
+
+    def tearDown(self):
+        self.wxr.wtp.close_db_conn()
+        close_thesaurus_db(
+            self.wxr.thesaurus_db_path, self.wxr.thesaurus_db_conn
+        )
+
+    def test_contains(self):
+        titles = ["foo", "bar", "föö", "a b", "Template:foo", "日本"]
+        index = TitleIndex(titles)
+        self.assertEqual(len(index), len(titles))
+        for title in titles:
+            self.assertIn(title, index)
+        for title in ["", "fo", "foo.", "Bar", "Template:bar", "日"]:
+            self.assertNotIn(title, index)
+
+    def test_empty(self):
+        self.assertNotIn("foo", TitleIndex([]))
+
+    def test_page_exists(self):
+        self.wxr.wtp.add_page("foo", 0, "body")
+        self.wxr.wtp.add_page("Template:bar", 10, "body")
+        self.wxr.wtp.db_conn.commit()
+        self.wxr.title_index = TitleIndex.from_wtp(self.wxr.wtp)
+        self.assertTrue(self.wxr.page_exists("foo"))
+        self.assertTrue(self.wxr.page_exists("Template:bar"))
+        self.assertFalse(self.wxr.page_exists("foo."))
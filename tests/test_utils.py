@@ -3,11 +3,12 @@
 # Copyright (c) 2021 Tatu Ylonen.  See file LICENSE and https://ylonen.org
 
 import unittest
+from collections import defaultdict
 
 from wikitextprocessor import Wtp
 
 from wiktextract.config import WiktionaryConfig
-from wiktextract.datautils import split_slashes
+from wiktextract.datautils import copy_base_data, split_slashes
 from wiktextract.extractor.share import create_audio_url_dict
 from wiktextract.thesaurus import close_thesaurus_db
 from wiktextract.wxr_context import WiktextractContext
@@ -84,3 +85,13 @@ class UtilsTests(unittest.TestCase):
                 "mp3_url": "https://upload.wikimedia.org/wikipedia/commons/transcoded/b/b9/Fr-BonjourF.oga/Fr-BonjourF.oga.mp3",
             },
         )
+
+    def test_copy_base_data(self):
+        base_data = defaultdict(
+            list, {"word": "foo", "categories": ["bar"]}
+        )
+        data = copy_base_data(base_data)
+        self.assertEqual(data, base_data)
+        data["categories"].append("baz")
+        data["tags"].append("qux")
+        self.assertEqual(base_data, {"word": "foo", "categories": ["bar"]})
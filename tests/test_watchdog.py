@@ -0,0 +1,147 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from wiktextract import watchdog
+from wiktextract.watchdog import (
+    PageWatchdog,
+    SupervisedPool,
+    watch_page,
+    worker_slot,
+)
+
+
+def process_pages(titles):
+    for title in titles:
+        if title.startswith("die-once:"):
+            # Kills the worker between pages the first time it is run
+            path = title.split(":", 1)[1]
+            if not os.path.exists(path):
+                open(path, "w").close()
+                os._exit(1)
+            continue
+        if title == "die-always":
+            os._exit(1)
+        with watch_page(title):
+            if title == "hang":
+                time.sleep(60)
+            elif title == "crash":
+                os._exit(1)
+    return titles
+
+
+def without_page(titles, title):
+    return [t for t in titles if t != title] or None
+
+
+class WatchdogTests(unittest.TestCase):
+    def setUp(self):
+        self.watchdog = PageWatchdog(2, threshold=10)
+        self.watchdog.attach(1)
+
+    def tearDown(self):
+        watchdog.worker_watchdog = None
+
+    def test_watch_page(self):
+        with watch_page("foo"):
+            self.assertEqual(self.watchdog.current_title(1), "foo")
+            self.assertGreaterEqual(self.watchdog.page_duration(1), 0)
+            self.assertNotEqual(self.watchdog.start_times[1], 0)
+        self.assertEqual(self.watchdog.start_times[1], 0)
+        self.assertEqual(self.watchdog.page_duration(1), 0)
+
+    def test_worker_slot(self):
+        self.assertEqual(worker_slot(), 1)
+        watchdog.worker_watchdog = None
+        self.assertEqual(worker_slot(), 0)
+
+    def test_long_title(self):
+        self.watchdog.start_page("ä" * 1000)
+        self.assertTrue(self.watchdog.current_title(1).startswith("ää"))
+
+    def test_check(self):
+        self.watchdog.start_page("foo")
+        self.watchdog.start_times[1] -= 20
+        reported = set()
+        with patch("os.kill") as kill, self.assertLogs(level="WARNING") as cm:
+            self.watchdog.check(reported)
+            self.watchdog.check(reported)
+        self.assertEqual(len(cm.output), 1)
+        self.assertIn("'foo'", cm.output[0])
+        kill.assert_called_once()
+        self.assertEqual(kill.call_args.args[0], os.getpid())
+
+
+class SupervisedPoolTests(unittest.TestCase):
+    def test_page_timeout(self):
+        tasks = [["a", "b"], ["c", "hang", "d"], ["e"]]
+        with patch("wiktextract.watchdog.CHECK_INTERVAL", 0.1):
+            with self.assertLogs(level="ERROR"):
+                with SupervisedPool(
+                    2, process_pages, page_timeout=0.5, retry_fn=without_page
+                ) as pool:
+                    results = list(pool.imap_unordered(tasks))
+        self.assertEqual(
+            sorted(title for titles in results for title in titles),
+            ["a", "b", "c", "d", "e"],
+        )
+        self.assertEqual([e["title"] for e in pool.skipped], ["hang"])
+
+    def test_no_timeout(self):
+        with SupervisedPool(2, process_pages) as pool:
+            results = list(pool.imap_unordered([["a"], ["b"], ["c"]]))
+        self.assertEqual(sorted(results), [["a"], ["b"], ["c"]])
+        self.assertEqual(pool.skipped, [])
+
+    def test_worker_died_in_page(self):
+        with self.assertLogs(level="ERROR"):
+            with SupervisedPool(
+                1, process_pages, retry_fn=without_page
+            ) as pool:
+                results = list(pool.imap_unordered([["a", "crash", "b"]]))
+        self.assertEqual(results, [["a", "b"]])
+        self.assertEqual([e["title"] for e in pool.skipped], ["crash"])
+
+    def test_worker_died_between_pages(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            task = ["a", "die-once:" + os.path.join(tmpdir, "died"), "b"]
+            with self.assertLogs(level="ERROR") as cm:
+                with SupervisedPool(
+                    1, process_pages, retry_fn=without_page
+                ) as pool:
+                    results = list(pool.imap_unordered([task]))
+        self.assertEqual(results, [task])
+        self.assertEqual(pool.skipped, [])
+        self.assertIn("task retried", cm.output[0])
+
+    def test_task_dropped(self):
+        with self.assertLogs(level="ERROR") as cm:
+            with SupervisedPool(
+                1, process_pages, retry_fn=without_page
+            ) as pool:
+                results = list(
+                    pool.imap_unordered([["a", "die-always"], ["b"]])
+                )
+        self.assertEqual(results, [["b"]])
+        self.assertEqual(len(cm.output), watchdog.MAX_TASK_RETRIES + 1)
+        self.assertIn("task dropped", cm.output[-1])
+
+    def test_timeout_after_page_finished(self):
+        # The page was finished after it was found to exceed the timeout
+        with SupervisedPool(1, process_pages, page_timeout=1) as pool:
+            with patch.object(
+                pool.watchdog,
+                "current_page",
+                return_value=("foo", time.time() - 10),
+            ), patch.object(pool, "replace_worker") as replace_worker:
+                pool.check_timeouts()
+        replace_worker.assert_not_called()
+
+    def test_current_page(self):
+        pw = PageWatchdog(1)
+        self.assertIsNone(pw.current_page(0))
+        pw.slot = 0
+        pw.start_page("foo")
+        self.assertEqual(pw.current_page(0), ("foo", pw.start_times[0]))
@@ -0,0 +1,15 @@
+import argparse
+import unittest
+
+from wiktextract.wiktwords import positive_int
+
+
+class WiktwordsTests(unittest.TestCase):
+    def test_positive_int(self):
+        self.assertEqual(positive_int("3"), 3)
+        for value in ("0", "-2"):
+            with self.subTest(value=value):
+                with self.assertRaises(argparse.ArgumentTypeError):
+                    positive_int(value)
+        with self.assertRaises(ValueError):
+            positive_int("x")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+#
+# Compares clean_node() with its general path (expanding to HTML and
+# cleaning with clean_value()) on the glosses of the pages in a database.
+# Checks that the direct renderer gives the same text, categories and links
+# for the glosses it handles, and prints the time taken by both.
+#
+# Usage: python tools/benchmark_clean_node.py [--db-path en.db]
+#
+# Without --db-path, the pages of the test dump in tests/ are used.
+#
+# Copyright (c) 2023 Tatu Ylonen.  See file LICENSE and https://ylonen.org
+
+import argparse
+import time
+from pathlib import Path
+
+from wikitextprocessor import NodeKind, WikiNode, Wtp
+from wikitextprocessor.dumpparser import process_dump
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.node_text import node_to_plain_text
+from wiktextract.page import clean_node, clean_node_html
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.wxr_context import WiktextractContext
+
+TEST_DUMP = Path(__file__).parent.parent / "tests/test-pages-articles.xml.bz2"
+
+
+def find_glosses(node, glosses):
+    if isinstance(node, (list, tuple)):
+        for x in node:
+            find_glosses(x, glosses)
+        return
+    if not isinstance(node, WikiNode):
+        return
+    if node.kind == NodeKind.LIST_ITEM and node.sarg.endswith("#"):
+        glosses.append(
+            [
+                x
+                for x in node.children
+                if not isinstance(x, WikiNode) or x.kind != NodeKind.LIST
+            ]
+        )
+    find_glosses(node.children, glosses)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark rendering glosses directly to text"
+    )
+    parser.add_argument("--db-path", type=str, default=None)
+    args = parser.parse_args()
+
+    conf = WiktionaryConfig()
+    wtp = Wtp(db_path=args.db_path, languages_by_code=conf.LANGUAGES_BY_CODE)
+    wxr = WiktextractContext(wtp, conf)
+    if args.db_path is None:
+        process_dump(wxr.wtp, TEST_DUMP, {0, 10, 828}, None, False, None)
+
+    pages = []
+    for page in wxr.wtp.get_all_pages([0], False, "wikitext"):
+        wxr.wtp.start_page(page.title)
+        glosses = []
+        find_glosses(wxr.wtp.parse(page.body), glosses)
+        pages.append((page.title, glosses))
+
+    num_glosses = num_handled = num_different = 0
+    general_t = fast_t = handled_general_t = handled_fast_t = 0.0
+    for title, glosses in pages:
+        wxr.wtp.start_page(title)
+        for gloss in glosses:
+            num_glosses += 1
+            general_data = {}
+            start_t = time.perf_counter()
+            general = clean_node_html(
+                wxr, general_data, gloss, None, None, True
+            )
+            gloss_general_t = time.perf_counter() - start_t
+            fast_data = {}
+            start_t = time.perf_counter()
+            clean_node(wxr, fast_data, gloss, collect_links=True)
+            gloss_fast_t = time.perf_counter() - start_t
+            general_t += gloss_general_t
+            fast_t += gloss_fast_t
+            rendered = node_to_plain_text(wxr, gloss)
+            if rendered is None:
+                continue
+            num_handled += 1
+            handled_general_t += gloss_general_t
+            handled_fast_t += gloss_fast_t
+            if rendered[0] != general or fast_data != general_data:
+                num_different += 1
+                print(f"DIFFERENT in {title}: {gloss!r}")
+                print(f"  general: {general!r} {general_data}")
+                print(f"  direct:  {rendered[0]!r} {fast_data}")
+
+    print(
+        f"{num_glosses} glosses, {num_handled} rendered directly, "
+        f"{num_different} different"
+    )
+    print(
+        f"all glosses:       general path {general_t:.3f}s, "
+        f"clean_node {fast_t:.3f}s"
+    )
+    print(
+        f"rendered directly: general path {handled_general_t:.3f}s, "
+        f"clean_node {handled_fast_t:.3f}s"
+    )
+
+    wxr.wtp.close_db_conn()
+    close_thesaurus_db(wxr.thesaurus_db_path, wxr.thesaurus_db_conn)
+
+
+if __name__ == "__main__":
+    main()
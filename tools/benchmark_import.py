@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+#
+# Measures how long `python -c "import wiktextract"` takes.  Each import is
+# run in a new Python process, and the minimum, median and maximum times
+# are printed.  The first run may also build the tables cached on disk by
+# wiktextract.table_cache; use --no-warmup to include it.
+#
+# Usage: python tools/benchmark_import.py [--runs 20] [--module wiktextract]
+#
+# Copyright (c) 2023 Tatu Ylonen.  See file LICENSE and https://ylonen.org
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+
+def time_import(module: str) -> float:
+    start_t = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], check=True)
+    return time.perf_counter() - start_t
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark importing wiktextract in a new process"
+    )
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--module", type=str, default="wiktextract")
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Do not import the module once before measuring",
+    )
+    args = parser.parse_args()
+
+    if not args.no_warmup:
+        time_import(args.module)
+    times = [time_import(args.module) for _ in range(args.runs)]
+    print(
+        "import {}: min {:.3f}s, median {:.3f}s, max {:.3f}s ({} runs)".format(
+            args.module,
+            min(times),
+            statistics.median(times),
+            max(times),
+            args.runs,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
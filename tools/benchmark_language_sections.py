@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+#
+# Measures how much time removing the sections of uncaptured languages
+# before parsing saves on English Wiktionary pages.  For each page this
+# prints the time of pre-expanding and parsing the whole page, the time of
+# doing the same for only the captured languages, and the time of the
+# whole parse_page() call for the captured languages.
+#
+# Usage: python tools/benchmark_language_sections.py --db-path en.db \
+#            --language en a do be
+#
+# Copyright (c) 2023 Tatu Ylonen.  See file LICENSE and https://ylonen.org
+
+import argparse
+import time
+
+from wikitextprocessor import Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.extractor.en.page import (
+    ADDITIONAL_EXPAND_TEMPLATES,
+    DO_NOT_PRE_EXPAND_TEMPLATES,
+    fix_subtitle_hierarchy,
+    parse_page,
+    remove_uncaptured_languages,
+)
+from wiktextract.template_override import template_override_fns
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.wxr_context import WiktextractContext
+
+
+def time_pre_expand(wxr: WiktextractContext, title: str, text: str) -> float:
+    start_t = time.time()
+    wxr.wtp.start_page(title)
+    wxr.wtp.parse(
+        fix_subtitle_hierarchy(wxr, text),
+        pre_expand=True,
+        additional_expand=ADDITIONAL_EXPAND_TEMPLATES,
+        do_not_pre_expand=DO_NOT_PRE_EXPAND_TEMPLATES,
+    )
+    return time.time() - start_t
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark parsing pages for a few languages only"
+    )
+    parser.add_argument("titles", nargs="+", help="Page titles")
+    parser.add_argument("--db-path", type=str, required=True)
+    parser.add_argument(
+        "--language",
+        type=str,
+        action="append",
+        default=[],
+        help="Language code to capture (default: en)",
+    )
+    args = parser.parse_args()
+
+    conf = WiktionaryConfig(capture_language_codes=args.language or ["en"])
+    wtp = Wtp(
+        db_path=args.db_path,
+        languages_by_code=conf.LANGUAGES_BY_CODE,
+        template_override_funcs=template_override_fns,
+    )
+    wxr = WiktextractContext(wtp, conf)
+
+    print("{:>9} {:>9} {:>9}  {}".format("full", "sliced", "page", "title"))
+    totals = [0.0, 0.0, 0.0]
+    for title in args.titles:
+        text = wxr.wtp.read_by_title(title)
+        if text is None:
+            print(f"Can't find page '{title}' in the database.")
+            continue
+        full_t = time_pre_expand(wxr, title, text)
+        sliced_t = time_pre_expand(
+            wxr, title, remove_uncaptured_languages(wxr, text)
+        )
+        start_t = time.time()
+        parse_page(wxr, title, text)
+        page_t = time.time() - start_t
+        for i, t in enumerate((full_t, sliced_t, page_t)):
+            totals[i] += t
+        print(
+            "{:8.3f}s {:8.3f}s {:8.3f}s  {}".format(
+                full_t, sliced_t, page_t, title
+            )
+        )
+    print("{:8.3f}s {:8.3f}s {:8.3f}s  TOTAL".format(*totals))
+
+    wxr.wtp.close_db_conn()
+    close_thesaurus_db(wxr.thesaurus_db_path, wxr.thesaurus_db_conn)
+
+
+if __name__ == "__main__":
+    main()
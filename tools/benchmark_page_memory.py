@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+#
+# Measures the time and the peak memory allocated by Python while parsing
+# pages, and the size of the extracted data.  Heavy pages with many
+# etymologies and parts-of-speech, such as "a" or "set", show the cost of
+# merging the etymology and language level data into each entry.  Memory is
+# traced with tracemalloc, which slows parsing down, so the time is measured
+# in a separate run without tracing.
+#
+# Usage: python tools/benchmark_page_memory.py --db-path en.db \
+#            --language en a set do
+#
+# Copyright (c) 2023 Tatu Ylonen.  See file LICENSE and https://ylonen.org
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from wikitextprocessor import Wtp
+
+from wiktextract.config import WiktionaryConfig
+from wiktextract.page import parse_page
+from wiktextract.template_override import template_override_fns
+from wiktextract.thesaurus import close_thesaurus_db
+from wiktextract.wxr_context import WiktextractContext
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the time and memory used by parsing pages"
+    )
+    parser.add_argument("titles", nargs="+", help="Page titles")
+    parser.add_argument("--db-path", type=str, required=True)
+    parser.add_argument(
+        "--language",
+        type=str,
+        action="append",
+        default=[],
+        help="Language code to capture (default: en)",
+    )
+    args = parser.parse_args()
+
+    conf = WiktionaryConfig(capture_language_codes=args.language or ["en"])
+    wtp = Wtp(
+        db_path=args.db_path,
+        languages_by_code=conf.LANGUAGES_BY_CODE,
+        template_override_funcs=template_override_fns,
+    )
+    wxr = WiktextractContext(wtp, conf)
+
+    print(
+        "{:>9} {:>10} {:>10} {:>8}  {}".format(
+            "time", "peak", "output", "entries", "title"
+        )
+    )
+    for title in args.titles:
+        text = wxr.wtp.read_by_title(title)
+        if text is None:
+            print(f"Can't find page '{title}' in the database.")
+            continue
+        # The first run also loads templates and modules
+        parse_page(wxr, title, text)
+        start_t = time.time()
+        parse_page(wxr, title, text)
+        page_t = time.time() - start_t
+        tracemalloc.start()
+        page_data = parse_page(wxr, title, text)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        output_size = len(json.dumps(page_data, ensure_ascii=False))
+        print(
+            "{:8.3f}s {:9.1f}M {:9.1f}M {:8}  {}".format(
+                page_t,
+                peak / 1e6,
+                output_size / 1e6,
+                len(page_data),
+                title,
+            )
+        )
+
+    wxr.wtp.close_db_conn()
+    close_thesaurus_db(wxr.thesaurus_db_path, wxr.thesaurus_db_conn)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+#
+# Compares the tokenizer used by classify_desc() with nltk's TweetTokenizer,
+# which it replaces.  The texts are the string values in a JSON lines file
+# extracted by wiktextract, or the lines of a text file.  Prints the time
+# taken by both tokenizers and the texts they tokenize differently.
+#
+# Usage: python tools/benchmark_tokenizer.py [--max-diffs 20] data.jsonl
+#
+# Copyright (c) 2023 Tatu Ylonen.  See file LICENSE and https://ylonen.org
+
+import argparse
+import json
+import re
+import time
+
+from nltk import TweetTokenizer
+
+from wiktextract.english_classifier import get_token_re, tokenize
+from wiktextract.form_descriptions import (
+    tokenizer_fixup_map,
+    tokenizer_fixup_re,
+)
+
+
+def collect_strings(data, texts):
+    if isinstance(data, str):
+        texts.add(data)
+    elif isinstance(data, dict):
+        for v in data.values():
+            collect_strings(v, texts)
+    elif isinstance(data, list):
+        for v in data:
+            collect_strings(v, texts)
+
+
+def read_texts(path: str) -> list:
+    texts = set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line:
+                continue
+            if path.endswith((".json", ".jsonl")):
+                collect_strings(json.loads(line), texts)
+            else:
+                texts.add(line)
+    # Like classify_desc() does before tokenizing
+    return sorted(
+        re.sub(tokenizer_fixup_re, lambda m: tokenizer_fixup_map[m.group(0)], t)
+        for t in texts
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the description tokenizer against nltk"
+    )
+    parser.add_argument("path", help="JSON lines or text file")
+    parser.add_argument(
+        "--max-diffs",
+        type=int,
+        default=20,
+        help="Maximum number of differences to print",
+    )
+    args = parser.parse_args()
+
+    texts = read_texts(args.path)
+    tweet_tokenizer = TweetTokenizer()
+    start_t = time.perf_counter()
+    get_token_re()
+    print("compiling: {:.3f}s".format(time.perf_counter() - start_t))
+
+    results = []
+    for name, fn in (("nltk", tweet_tokenizer.tokenize), ("new", tokenize)):
+        start_t = time.perf_counter()
+        results.append([fn(text) for text in texts])
+        print(
+            "{}: {:.3f}s for {} texts".format(
+                name, time.perf_counter() - start_t, len(texts)
+            )
+        )
+
+    diffs = 0
+    for text, old, new in zip(texts, *results):
+        if old == new:
+            continue
+        diffs += 1
+        if diffs <= args.max_diffs:
+            print(f"{text!r}\n  nltk: {old}\n  new:  {new}")
+    print(f"{diffs} of {len(texts)} texts tokenized differently")
+
+
+if __name__ == "__main__":
+    main()
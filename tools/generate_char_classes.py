@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+#
+# Generates src/wiktextract/data/unicode/char_classes.json, the classes of
+# all Unicode codepoints used by wiktextract.char_classes.  Run this after
+# changing the character lists in char_classes.py or when moving to a Python
+# version with a newer Unicode database.
+#
+# Usage: python tools/generate_char_classes.py
+
+import json
+from pathlib import Path
+
+from wiktextract.char_classes import compute_char_classes
+
+OUTPUT_PATH = (
+    Path(__file__).parent.parent
+    / "src/wiktextract/data/unicode/char_classes.json"
+)
+
+
+def main():
+    data = compute_char_classes()
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with OUTPUT_PATH.open("w", encoding="utf-8") as f:
+        f.write('{"unidata_version": ')
+        f.write(json.dumps(data["unidata_version"]))
+        f.write(',\n "runs": [\n')
+        f.write(",\n".join(json.dumps(run) for run in data["runs"]))
+        f.write("\n]}\n")
+    print(
+        "Wrote {} runs of Unicode {} to {}".format(
+            len(data["runs"]), data["unidata_version"], OUTPUT_PATH
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+#
+# Generates src/wiktextract/data/english/brown_words.txt, the words of the
+# nltk Brown corpus used by wiktextract.english_words, so that nltk and the
+# corpus are not needed for loading the vocabulary.  The corpus is
+# downloaded if it has not been downloaded already.
+#
+# Usage: python tools/generate_english_words.py
+
+from pathlib import Path
+
+import nltk
+from nltk.corpus import brown
+
+OUTPUT_PATH = (
+    Path(__file__).parent.parent
+    / "src/wiktextract/data/english/brown_words.txt"
+)
+
+
+def main():
+    try:
+        nltk.data.find("corpora/brown.zip")
+    except LookupError:
+        nltk.download("brown", quiet=True)
+    words = sorted(set(brown.words()))
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with OUTPUT_PATH.open("w", encoding="utf-8") as f:
+        for word in words:
+            f.write(word + "\n")
+    print("Wrote {} words to {}".format(len(words), OUTPUT_PATH))
+
+
+if __name__ == "__main__":
+    main()